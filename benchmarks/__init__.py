@@ -0,0 +1,7 @@
+# benchmarks/__init__.py
+"""
+Benchmarks de escala do pyramid_score: gerador sintético de transações e casos que medem
+tempo e pico de memória por classe e por etapa dos pipelines.
+
+Uso: python -m benchmarks.run --sizes 10k 1m --output report.json
+"""
@@ -0,0 +1,86 @@
+# benchmarks/parallel.py
+
+import argparse
+import json
+import os
+import platform
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from pyramid_score.parallel import parallel_rfm_state
+from pyramid_score.rfv import prepare_transactions
+from .run import COLUMNS, measure
+from .synthetic import generate_transactions, parse_size
+
+CASES = {'PyramidScoreAnalysis': None, 'RFV[vectorized]': prepare_transactions}
+
+
+def run_parallel_benchmarks(sizes, workers=(1, 2, 4), seed=0):
+    """
+    Mede o ingest paralelo (`parallel_rfm_state`) para cada quantidade de processos e calcula o
+    ganho em relação a `workers=1`, que é sempre incluído como referência.
+
+    Parameters
+    ----------
+    sizes : list
+        Tamanhos em linhas ou nomeados ('10k', '1m', '10m').
+    workers : iterable of int, optional
+        Quantidades de processos medidas.
+    seed : int, optional
+        Semente do gerador sintético.
+
+    Returns
+    -------
+    dict
+        Relatório com metadados do ambiente e uma lista de resultados por caso e quantidade de processos.
+    """
+    workers = sorted(set(workers) | {1})
+    results = []
+    for size in sizes:
+        n_rows = parse_size(size)
+        transactions = generate_transactions(n_rows, seed=seed)[list(COLUMNS)]
+
+        for case, prepare in CASES.items():
+            baseline = None
+            for n_jobs in workers:
+                state, seconds, _ = measure(lambda: parallel_rfm_state(transactions, *COLUMNS, n_jobs=n_jobs,
+                                                                       prepare=prepare), track_memory=False)
+                if baseline is None:
+                    baseline = (state, seconds)
+                # Confere se o resultado paralelo é o mesmo do processo único
+                matches = (state.index.equals(baseline[0].index)
+                           and state['frequency'].equals(baseline[0]['frequency'])
+                           and np.allclose(state['monetary_value'], baseline[0]['monetary_value']))
+                results.append({'case': case, 'rows': n_rows, 'workers': n_jobs, 'rows_out': len(state),
+                                'seconds': seconds, 'speedup': baseline[1] / seconds, 'matches': bool(matches)})
+
+    return {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'seed': seed,
+        'environment': {'python': platform.python_version(), 'pandas': pd.__version__,
+                        'numpy': np.__version__, 'machine': platform.machine(), 'cpu_count': os.cpu_count()},
+        'results': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Ganho do ingest paralelo do pyramid_score em relação a workers=1.')
+    parser.add_argument('--sizes', nargs='+', default=['1m'], help="tamanhos, ex.: 1m 10m")
+    parser.add_argument('--workers', nargs='+', type=int, default=[1, 2, 4], help='quantidades de processos')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='arquivo JSON do relatório (padrão: saída padrão)')
+    args = parser.parse_args(argv)
+
+    report = run_parallel_benchmarks(args.sizes, workers=args.workers, seed=args.seed)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(output)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
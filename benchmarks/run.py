@@ -0,0 +1,183 @@
+# benchmarks/run.py
+
+import argparse
+import json
+import platform
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from pyramid_score import (ChurnPrediction, GroupPriceCorridor, PriceCorridor, PriceElasticity,
+                           PyramidScoreAnalysis, RFV, RFV10)
+from .synthetic import generate_churn_features, generate_transactions, parse_size
+
+COLUMNS = ('customer_id', 'transaction_date', 'amount')
+
+
+def measure(func, setup=None, track_memory=True):
+    """
+    Executa `func` e mede o tempo de parede e, opcionalmente, o pico de memória alocada
+    (tracemalloc, em uma segunda execução para não distorcer o tempo).
+
+    Parameters
+    ----------
+    func : callable
+        Função medida.
+    setup : callable, optional
+        Retorna os argumentos de `func`; é chamada fora da medição antes de cada execução.
+    track_memory : bool, optional
+        Mede também o pico de memória.
+
+    Returns
+    -------
+    tuple
+        (resultado, segundos, pico de memória em MB ou None)
+    """
+    args = setup() if setup is not None else ()
+    start = time.perf_counter()
+    result = func(*args)
+    seconds = time.perf_counter() - start
+
+    peak_mb = None
+    if track_memory:
+        args = setup() if setup is not None else ()
+        tracemalloc.start()
+        func(*args)
+        peak_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+    return result, seconds, peak_mb
+
+
+def pipeline_cases():
+    """
+    Etapas dos pipelines de RFM por caso: {caso: [(etapa, função), ...]}.
+    """
+    psa = PyramidScoreAnalysis(None, *COLUMNS, automated=False)
+    rfv = RFV(None, *COLUMNS, automated=False)
+    rfv_vectorized = RFV(None, *COLUMNS, automated=False, vectorized=True)
+    rfv10 = RFV10(None, *COLUMNS, automated=False)
+    return {
+        'PyramidScoreAnalysis': [
+            ('ingest', psa._produce_pyramid_score_dataset),
+            ('score', psa._calculate_pyramid_score),
+            ('segment', psa._assign_segments),
+            ('distribution', psa._get_segment_distribution),
+        ],
+        'RFV': [
+            ('ingest', rfv.produce_rfm_dateset),
+            ('score', rfv.calculate_rfm_score),
+            ('segment', rfv.find_segments),
+            ('distribution', rfv.find_segment_df),
+        ],
+        'RFV[vectorized]': [
+            ('ingest', rfv_vectorized.produce_rfm_dataset_vectorized),
+            ('score', rfv_vectorized.calculate_rfm_score),
+            ('segment', rfv_vectorized.find_segments),
+            ('distribution', rfv_vectorized.find_segment_df),
+        ],
+        'RFV10': [
+            ('ingest', rfv10.produce_rfv_dataset),
+            ('score', rfv10.calculate_rfv_score_percentiles),
+            ('segment', rfv10.assign_uniform_class),
+        ],
+    }
+
+
+def class_cases(transactions):
+    """
+    Casos de ponta a ponta das classes de preço e churn: (caso, função sem argumentos).
+    """
+    features = generate_churn_features(transactions)
+    feature_columns = ['recency', 'frequency', 'monetary_value']
+
+    def churn():
+        model = ChurnPrediction(features, 'churn')
+        model.train_model(feature_columns)
+        return model.predict_churn_many(features)
+
+    return [
+        ('PriceCorridor.get_all_corridors',
+         lambda: PriceCorridor(transactions, 'customer_id', 'price').get_all_corridors()),
+        ('GroupPriceCorridor.get_all_price_corridors',
+         lambda: GroupPriceCorridor(transactions, 'segment', 'price').get_all_price_corridors()),
+        ('PriceElasticity.calculate_all_elasticities',
+         lambda: PriceElasticity(transactions, 'customer_id', 'price', 'quantity').calculate_all_elasticities()),
+        ('ChurnPrediction.train_and_predict', churn),
+    ]
+
+
+def run_benchmarks(sizes, seed=0, track_memory=True, skip=()):
+    """
+    Executa todos os casos para cada tamanho e retorna o relatório.
+
+    Parameters
+    ----------
+    sizes : list
+        Tamanhos em linhas ou nomeados ('10k', '1m', '10m').
+    seed : int, optional
+        Semente do gerador sintético.
+    track_memory : bool, optional
+        Mede o pico de memória de cada caso (uma execução extra por caso).
+    skip : iterable of str, optional
+        Casos a ignorar (ex.: 'RFV', lento em tamanhos grandes).
+
+    Returns
+    -------
+    dict
+        Relatório com metadados do ambiente e uma lista de resultados por caso e etapa.
+    """
+    results = []
+    for size in sizes:
+        n_rows = parse_size(size)
+        transactions = generate_transactions(n_rows, seed=seed)
+
+        for case, stages in pipeline_cases().items():
+            if case in skip:
+                continue
+            data = transactions
+            for stage, func in stages:
+                # As etapas modificam a entrada; cada execução recebe sua própria cópia
+                result, seconds, peak_mb = measure(func, lambda d=data: (d.copy(),), track_memory=track_memory)
+                results.append({'case': case, 'stage': stage, 'rows': n_rows, 'rows_in': len(data),
+                                'rows_out': len(result), 'seconds': seconds, 'peak_mb': peak_mb})
+                data = result
+
+        for case, func in class_cases(transactions):
+            if case in skip or case.split('.')[0] in skip:
+                continue
+            result, seconds, peak_mb = measure(func, track_memory=track_memory)
+            results.append({'case': case, 'stage': 'total', 'rows': n_rows, 'rows_in': n_rows,
+                            'rows_out': len(result), 'seconds': seconds, 'peak_mb': peak_mb})
+
+    return {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'seed': seed,
+        'environment': {'python': platform.python_version(), 'pandas': pd.__version__,
+                        'numpy': np.__version__, 'machine': platform.machine()},
+        'results': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks de escala do pyramid_score.')
+    parser.add_argument('--sizes', nargs='+', default=['10k'], help="tamanhos, ex.: 10k 1m 10m")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='arquivo JSON do relatório (padrão: saída padrão)')
+    parser.add_argument('--no-memory', action='store_true', help='não mede o pico de memória')
+    parser.add_argument('--skip', nargs='*', default=[], help='casos a ignorar, ex.: RFV RFV10')
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.sizes, seed=args.seed, track_memory=not args.no_memory, skip=args.skip)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(output)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+# benchmarks/synthetic.py
+
+import numpy as np
+import pandas as pd
+
+SIZES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000, '10m': 10_000_000}
+
+
+def parse_size(size) -> int:
+    """
+    Converte um tamanho nomeado ('10k', '1m', '10m') ou numérico na quantidade de linhas.
+    """
+    if isinstance(size, str):
+        return SIZES[size.lower()] if size.lower() in SIZES else int(size)
+    return int(size)
+
+
+def generate_transactions(n_rows: int, n_customers: int = None, n_segments: int = 50, days: int = 730,
+                          start: str = '2022-01-01', seed: int = 0) -> pd.DataFrame:
+    """
+    Gera um histórico sintético de transações com distribuição assimétrica: poucos clientes
+    concentram muitas compras, os valores seguem uma log-normal e a quantidade cai com o preço.
+
+    Parameters
+    ----------
+    n_rows : int
+        Quantidade de transações.
+    n_customers : int, optional
+        Quantidade de clientes. Por padrão, uma transação em cada dez.
+    n_segments : int, optional
+        Quantidade de segmentos de clientes.
+    days : int, optional
+        Janela do histórico, em dias.
+    start : str, optional
+        Data da primeira transação possível.
+    seed : int, optional
+        Semente do gerador; a mesma semente gera o mesmo histórico.
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame com as colunas 'customer_id', 'transaction_date', 'amount', 'price', 'quantity' e 'segment'.
+    """
+    rng = np.random.default_rng(seed)
+    n_customers = n_customers or max(n_rows // 10, 1)
+
+    # Atividade por cliente com cauda longa (Pareto) e clientes que param de comprar em datas diferentes
+    activity = rng.pareto(1.5, n_customers) + 1
+    customers = rng.choice(n_customers, size=n_rows, p=activity / activity.sum())
+    last_active = rng.integers(days // 4, days + 1, n_customers)
+    day = (rng.power(3, n_rows) * last_active[customers]).astype(np.int64)
+
+    customer_segment = rng.integers(0, n_segments, n_customers)
+    segment_price = rng.lognormal(3, 0.5, n_segments)
+    price = np.round(segment_price[customer_segment[customers]] * rng.lognormal(0, 0.2, n_rows), 2)
+    quantity = np.maximum(1, rng.poisson(20 * (segment_price[customer_segment[customers]] / price) ** 1.5))
+
+    customer_ids = np.array([f'C{i:08d}' for i in range(n_customers)], dtype=object)
+    segment_ids = np.array([f'S{i:03d}' for i in range(n_segments)], dtype=object)
+    return pd.DataFrame({
+        'customer_id': customer_ids[customers],
+        'transaction_date': pd.Timestamp(start) + pd.to_timedelta(day, unit='D'),
+        'amount': np.round(price * quantity, 2),
+        'price': price,
+        'quantity': quantity,
+        'segment': segment_ids[customer_segment[customers]],
+    })
+
+
+def generate_churn_features(transactions: pd.DataFrame, churn_days: int = 365) -> pd.DataFrame:
+    """
+    Deriva uma tabela de variáveis de churn por cliente (recência, frequência, valor monetário e
+    churn = recência acima de `churn_days`) a partir de `generate_transactions`.
+
+    Parameters
+    ----------
+    transactions : pd.DataFrame
+        Transações geradas por `generate_transactions`.
+    churn_days : int, optional
+        Dias sem compras a partir dos quais o cliente é considerado churn.
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame com as colunas 'customer_id', 'recency', 'frequency', 'monetary_value' e 'churn'.
+    """
+    grouped = transactions.groupby('customer_id')
+    features = pd.DataFrame({
+        'recency': (transactions['transaction_date'].max() - grouped['transaction_date'].max()).dt.days,
+        'frequency': grouped.size(),
+        'monetary_value': grouped['amount'].sum(),
+    }).reset_index()
+    features['churn'] = (features['recency'] > churn_days).astype(int)
+    return features
@@ -1,8 +1,36 @@
 # pyramid_score/__init__.py
-import pandas as pd
-from .pyramid_score import PyramidScoreAnalysis
-from .price_elasticity import PriceElasticity
-from .price_corridor import PriceCorridor
-from .group_price_corridor import GroupPriceCorridor
-from .churn_prediction import ChurnPrediction
-from .pyramid_score import PyramidScoreAnalysis
+import importlib
+
+# Cada classe (e suas dependências pesadas, como scikit-learn) é importada apenas no primeiro acesso
+_LAZY_ATTRIBUTES = {
+    'PyramidScoreAnalysis': '.pyramid_score',
+    'PriceElasticity': '.price_elasticity',
+    'PriceCorridor': '.price_corridor',
+    'GroupPriceCorridor': '.group_price_corridor',
+    'ChurnPrediction': '.churn_prediction',
+    'RFV': '.rfv',
+    'RFV10': '.rfv10',
+    'StreamingRFMAggregator': '.streaming',
+    'PipelineInstrumentation': '.instrumentation',
+    'RFMSnapshots': '.snapshots',
+    'SegmentMigration': '.migration',
+    'ResultCache': '.cache',
+    'CustomerSnapshot': '.service',
+    'ScoringService': '.service',
+    'SharedTables': '.shared',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,206 @@
+# pyramid_score/cache.py
+
+import hashlib
+import json
+import os
+import shutil
+import uuid
+
+import numpy as np
+import pandas as pd
+from .columnar import _require_pyarrow
+
+_CATEGORICALS_METADATA = b'pyramid_score.categoricals'
+
+
+def _write_parquet(table: pd.DataFrame, path: str):
+    # O Parquet não preserva categorias não textuais (ex.: scores 10..1 do RFV10); elas são gravadas
+    # como códigos e as categorias vão nos metadados do schema
+    pyarrow = _require_pyarrow()
+    categoricals, codes = {}, {}
+    for column in table.columns:
+        dtype = table[column].dtype
+        if isinstance(dtype, pd.CategoricalDtype) and dtype.categories.dtype != object:
+            categoricals[column] = {'categories': dtype.categories.tolist(), 'ordered': bool(dtype.ordered)}
+            codes[column] = table[column].cat.codes
+    arrow = pyarrow.Table.from_pandas(table.assign(**codes))
+    metadata = dict(arrow.schema.metadata or {})
+    metadata[_CATEGORICALS_METADATA] = json.dumps(categoricals).encode()
+    pyarrow.parquet.write_table(arrow.replace_schema_metadata(metadata), path)
+
+
+def _read_parquet(path: str) -> pd.DataFrame:
+    pyarrow = _require_pyarrow()
+    arrow = pyarrow.parquet.read_table(path)
+    categoricals = json.loads((arrow.schema.metadata or {}).get(_CATEGORICALS_METADATA, b'{}'))
+    table = arrow.to_pandas()
+    for column, dtype in categoricals.items():
+        table[column] = pd.Categorical.from_codes(table[column], categories=dtype['categories'], ordered=dtype['ordered'])
+    return table
+
+
+class ResultCache:
+    """
+    Cache em disco dos resultados das análises (`PyramidScoreAnalysis`, `RFV`, `RFV10`), endereçado
+    pelo conteúdo: a chave combina uma impressão digital das colunas de entrada e os parâmetros da
+    análise, e cada entrada guarda as tabelas de resultado em Parquet. Requer o pacote pyarrow.
+
+    O tamanho total é limitado por `max_bytes`; ao passar do limite, as entradas usadas há mais
+    tempo são removidas (LRU pela data de modificação, atualizada a cada leitura).
+
+    Parameters
+    ----------
+    directory : str
+        Diretório do cache (criado se não existir).
+    max_bytes : int, optional
+        Tamanho máximo do cache em bytes (padrão 1 GiB).
+
+    Methods
+    -------
+    key(name, df, columns, params)
+        Calcula a chave de uma execução.
+    get(key)
+        Retorna as tabelas de uma entrada, ou None.
+    put(key, tables)
+        Grava as tabelas de uma entrada e aplica o limite de tamanho.
+    clear()
+        Remove todas as entradas.
+    """
+
+    def __init__(self, directory, max_bytes: int = 2 ** 30):
+        _require_pyarrow()
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def key(name: str, df: pd.DataFrame, columns, params: dict) -> str:
+        """
+        Calcula a chave de uma execução: hash por linha das colunas usadas (`pd.util.hash_pandas_object`)
+        combinado com os nomes e tipos das colunas e os parâmetros.
+
+        Parameters
+        ----------
+        name : str
+            Nome da análise (ex.: 'RFV').
+        df : pd.DataFrame
+            DataFrame de entrada.
+        columns : list
+            Colunas de `df` usadas pela análise.
+        params : dict
+            Parâmetros que alteram o resultado.
+
+        Returns
+        -------
+        str
+        """
+        columns = list(dict.fromkeys(columns))
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(repr((name, columns, [str(df[column].dtype) for column in columns], len(df),
+                            sorted(params.items()))).encode())
+        row_hashes = pd.util.hash_pandas_object(df[columns], index=False).to_numpy()
+        digest.update(np.ascontiguousarray(row_hashes).view(np.uint8))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def get(self, key: str) -> dict:
+        """
+        Retorna as tabelas gravadas na entrada `key`, ou None se a entrada não existir.
+
+        Returns
+        -------
+        dict or None
+            Tabelas por nome.
+        """
+        path = self._path(key)
+        try:
+            names = [name for name in os.listdir(path) if name.endswith('.parquet')]
+            tables = {name[:-len('.parquet')]: _read_parquet(os.path.join(path, name)) for name in names}
+            os.utime(path)
+        except FileNotFoundError:
+            # Entrada ausente ou removida por outro processo durante a leitura
+            return None
+        return tables
+
+    def put(self, key: str, tables: dict):
+        """
+        Grava as tabelas na entrada `key` (de forma atômica) e remove as entradas menos usadas
+        se o cache passar de `max_bytes`.
+
+        Parameters
+        ----------
+        key : str
+            Chave da entrada.
+        tables : dict
+            Tabelas por nome.
+        """
+        staging = self._path(f'.{key}.{uuid.uuid4().hex}.tmp')
+        os.makedirs(staging)
+        for name, table in tables.items():
+            _write_parquet(table, os.path.join(staging, f'{name}.parquet'))
+        try:
+            os.replace(staging, self._path(key))
+        except OSError:
+            # Outro processo gravou a mesma entrada primeiro
+            shutil.rmtree(staging, ignore_errors=True)
+        self._evict()
+
+    def _entries(self) -> list:
+        entries = []
+        for key in os.listdir(self.directory):
+            path = self._path(key)
+            if key.startswith('.') or not os.path.isdir(path):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+            entries.append((os.stat(path).st_mtime, size, path))
+        return entries
+
+    def _evict(self):
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+    @property
+    def size(self) -> int:
+        """Tamanho total das entradas em bytes."""
+        return sum(size for _, size, _ in self._entries())
+
+    def clear(self):
+        """
+        Remove todas as entradas do cache.
+        """
+        for _, _, path in self._entries():
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def run_cached(cache: ResultCache, analysis, params: dict, attributes, compute, columns=None):
+    """
+    Executa `compute()` e grava os atributos `attributes` da análise no cache; se a mesma execução
+    (colunas de entrada e parâmetros) já estiver no cache, apenas lê as tabelas. Sem cache, apenas
+    executa `compute()`.
+
+    `columns` são as colunas de `analysis.df` lidas por `compute()` e incluídas na impressão digital;
+    por padrão, as colunas de `_column_arguments`. Análises cujo ingest lê outras colunas (ex.:
+    `drop_duplicates` sobre todas as colunas) devem informar todas elas.
+    """
+    if cache is None:
+        compute()
+        return
+
+    if columns is None:
+        columns = [getattr(analysis, name) for name in analysis._column_arguments]
+    key = cache.key(type(analysis).__name__, analysis.df, columns, params)
+    tables = cache.get(key)
+    if tables is not None and set(tables) == set(attributes):
+        for name, table in tables.items():
+            setattr(analysis, name, table)
+        return
+
+    compute()
+    cache.put(key, {name: getattr(analysis, name) for name in attributes})
@@ -1,12 +1,62 @@
 # pyramid_score/churn_prediction.py
 
+import os
+
 import pandas as pd
 import numpy as np
+import joblib
 from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.metrics import accuracy_score, classification_report
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from .columnar import ColumnarLoaderMixin
+
+
+def iter_parquet_chunks(path, columns: list, batch_size: int = 1_000_000):
+    """
+    Lê um arquivo ou diretório Parquet em lotes de até `batch_size` linhas, apenas com as colunas
+    informadas, devolvendo um DataFrame por lote. Requer o pacote pyarrow.
+    """
+    try:
+        import pyarrow.dataset as ds
+    except ImportError as exc:
+        raise ImportError("A leitura de arquivos Parquet requer o pacote pyarrow.") from exc
+
+    for batch in ds.dataset(path, format='parquet').to_batches(columns=list(columns), batch_size=batch_size):
+        yield batch.to_pandas()
+
+
+def _holdout_mask(data: np.ndarray, holdout_fraction: float, random_state: int) -> np.ndarray:
+    # Sorteio pelo conteúdo da linha (hash das variáveis e do alvo), e não pela posição: o holdout não
+    # muda com o tamanho dos chunks ou lotes nem entre épocas; linhas idênticas ficam do mesmo lado
+    hash_key = f'{random_state % 10 ** 16:016d}'
+    hashes = pd.util.hash_pandas_object(pd.DataFrame(data), index=False, hash_key=hash_key).to_numpy()
+    return hashes / 2.0 ** 64 < holdout_fraction
 
-class ChurnPrediction:
+
+class _HoldoutReservoir:
+    # Amostra uniforme (reservoir sampling) de tamanho fixo das linhas de holdout
+    def __init__(self, capacity: int, n_columns: int, seed):
+        self.capacity = capacity
+        self.rows = np.empty((capacity, n_columns))
+        self.seen = 0
+        self._rng = np.random.default_rng(seed)
+
+    def add(self, rows: np.ndarray):
+        free = min(self.capacity - min(self.seen, self.capacity), len(rows))
+        self.rows[self.seen:self.seen + free] = rows[:free]
+        rest = rows[free:]
+        if len(rest):
+            positions = self._rng.integers(0, self.seen + free + np.arange(1, len(rest) + 1))
+            keep = positions < self.capacity
+            self.rows[positions[keep]] = rest[keep]
+        self.seen += len(rows)
+
+    def sample(self) -> np.ndarray:
+        return self.rows[:min(self.seen, self.capacity)]
+
+class ChurnPrediction(ColumnarLoaderMixin):
     """
     Classe para calcular a probabilidade de churn (cancelamento) usando um modelo preditivo.
 
@@ -21,18 +71,33 @@ class ChurnPrediction:
     -------
     train_model(features)
         Treina o modelo preditivo de churn usando os comportamentos dos clientes.
+
+    train_model_streaming(chunks, features)
+        Treina um modelo linear incremental consumindo os dados em chunks, com memória limitada.
     
     predict_churn(customer_data)
         Calcula a probabilidade de churn para um cliente específico.
+
+    predict_churn_many(df, chunk_size)
+        Calcula a probabilidade de churn para todas as linhas de um DataFrame.
+
+    save_model(path) / load_model(path)
+        Persiste e carrega o modelo treinado e a lista de variáveis preditoras.
     
     identify_churn_signs(customer_data)
         Identifica os sinais de churn com base em quedas na frequência de compra e valores gastos.
+
+    from_parquet(path, target, columns=features) / from_arrow(table, target, columns=features)
+        Cria a instância lendo apenas o alvo e as variáveis preditoras.
     """
 
+    _column_arguments = ('target',)
+
     def __init__(self, df: pd.DataFrame, target: str):
         self.df = df
         self.target = target
         self.model = None
+        self.features = None
 
     def train_model(self, features: list):
         """
@@ -50,6 +115,7 @@ class ChurnPrediction:
         """
         X = self.df[features]
         y = self.df[self.target]
+        self.features = list(features)
 
         # Dividindo o conjunto de dados em treino e teste
         X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.3, random_state=42)
@@ -67,6 +133,89 @@ class ChurnPrediction:
 
         return {"accuracy": accuracy, "report": report}
 
+    def train_model_streaming(self, chunks, features: list, holdout_fraction: float = 0.3, epochs: int = 1,
+                              holdout_size: int = 100_000, batch_size: int = 1_000_000, random_state: int = 42) -> dict:
+        """
+        Treina um modelo de churn sem carregar todos os dados em memória.
+
+        Cada linha vai para treino ou holdout por um hash do seu conteúdo, de modo que a divisão é
+        a mesma em todas as épocas e não depende de como os dados são divididos em chunks.
+        As linhas de treino atualizam um `StandardScaler` e um `SGDClassifier(loss='log_loss')`
+        (regressão logística) com `partial_fit`; as de holdout nunca são usadas no treino e uma
+        amostra uniforme de até `holdout_size` linhas é guardada para avaliar o modelo final.
+        A memória depende do tamanho do chunk e de `holdout_size`, não do tamanho dos dados.
+
+        Parameters
+        ----------
+        chunks : iterable of pd.DataFrame, callable, str or os.PathLike
+            Chunks com as variáveis preditoras e o alvo: um iterável, uma função sem argumentos que
+            devolve um novo iterável (necessária para `epochs` > 1) ou o caminho de um arquivo ou
+            diretório Parquet.
+        features : list
+            Lista de colunas com as variáveis preditoras.
+        holdout_fraction : float, optional
+            Fração das linhas reservada para avaliação (padrão 0.3, como em `train_model`).
+        epochs : int, optional
+            Quantidade de passagens pelos dados (padrão 1).
+        holdout_size : int, optional
+            Quantidade máxima de linhas de holdout guardadas para a avaliação.
+        batch_size : int, optional
+            Linhas por lote na leitura de Parquet.
+        random_state : int, optional
+            Semente do sorteio do holdout e do modelo. Quando há mais linhas de holdout que
+            `holdout_size`, a amostra avaliada também depende da ordem e do tamanho dos chunks.
+
+        Returns
+        -------
+        dict
+            Resultados de avaliação no holdout ("accuracy" e "report") e as quantidades de linhas
+            de treino ("n_train", por época) e de holdout ("n_holdout" e "n_evaluated").
+        """
+        features = list(features)
+        columns = features + [self.target]
+        if isinstance(chunks, (str, os.PathLike)):
+            path = os.fspath(chunks)
+            chunks = lambda: iter_parquet_chunks(path, columns, batch_size)
+        if not callable(chunks):
+            if epochs > 1 and iter(chunks) is chunks:
+                raise ValueError("Para mais de uma época, informe uma função que devolva os chunks ou um caminho Parquet.")
+            source = chunks
+            chunks = lambda: source
+
+        scaler = StandardScaler()
+        model = SGDClassifier(loss='log_loss', random_state=random_state)
+        classes = np.array([0, 1])
+        reservoir = _HoldoutReservoir(holdout_size, len(columns), random_state)
+        n_train = 0
+
+        for epoch in range(epochs):
+            n_train = 0
+            for chunk in chunks():
+                data = chunk[columns].dropna().to_numpy(dtype=float)
+                holdout = _holdout_mask(data, holdout_fraction, random_state)
+                train = data[~holdout]
+                if epoch == 0:
+                    reservoir.add(data[holdout])
+                if len(train):
+                    X = pd.DataFrame(train[:, :-1], columns=features)
+                    scaler.partial_fit(X)
+                    model.partial_fit(scaler.transform(X), train[:, -1].astype(int), classes=classes)
+                    n_train += len(train)
+
+        if not n_train:
+            raise ValueError("Nenhuma linha de treino foi consumida.")
+        self.model = Pipeline([('scaler', scaler), ('model', model)])
+        self.features = features
+
+        sample = reservoir.sample()
+        results = {"n_train": n_train, "n_holdout": reservoir.seen, "n_evaluated": len(sample)}
+        if len(sample):
+            y_pred = self.model.predict(pd.DataFrame(sample[:, :-1], columns=features))
+            y_true = sample[:, -1].astype(int)
+            results["accuracy"] = accuracy_score(y_true, y_pred)
+            results["report"] = classification_report(y_true, y_pred, zero_division=0)
+        return results
+
     def predict_churn(self, customer_data: pd.DataFrame) -> float:
         """
         Calcula a probabilidade de churn para um cliente específico.
@@ -87,6 +236,73 @@ class ChurnPrediction:
         churn_prob = self.model.predict_proba(customer_data)[:, 1]
         return churn_prob[0]
 
+    def predict_churn_many(self, df: pd.DataFrame, chunk_size: int = None) -> pd.Series:
+        """
+        Calcula a probabilidade de churn para todas as linhas de um DataFrame.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Dados dos clientes. Se o modelo conhece suas variáveis preditoras, apenas elas são usadas.
+        chunk_size : int, optional
+            Quantidade máxima de linhas por chamada ao modelo, para limitar o uso de memória.
+            Por padrão, todas as linhas são avaliadas de uma vez.
+
+        Returns
+        -------
+        pd.Series
+            Probabilidades de churn (0 a 1), com o mesmo índice de `df`.
+        """
+        if self.model is None:
+            raise ValueError("O modelo de churn não foi treinado. Treine o modelo antes de fazer previsões.")
+
+        X = df[self.features] if self.features is not None else df
+        if chunk_size is None:
+            churn_prob = self.model.predict_proba(X)[:, 1]
+        else:
+            churn_prob = np.empty(len(X))
+            for start in range(0, len(X), chunk_size):
+                churn_prob[start:start + chunk_size] = self.model.predict_proba(X.iloc[start:start + chunk_size])[:, 1]
+
+        return pd.Series(churn_prob, index=df.index, name="churn_probability")
+
+    def save_model(self, path: str):
+        """
+        Salva o modelo treinado, a lista de variáveis preditoras e o nome do alvo com joblib.
+
+        Parameters
+        ----------
+        path : str
+            Caminho do arquivo a ser gravado.
+        """
+        if self.model is None:
+            raise ValueError("O modelo de churn não foi treinado. Treine o modelo antes de salvá-lo.")
+
+        joblib.dump({"model": self.model, "features": self.features, "target": self.target}, path)
+
+    @classmethod
+    def load_model(cls, path: str, df: pd.DataFrame = None) -> 'ChurnPrediction':
+        """
+        Carrega um modelo salvo por `save_model`, sem necessidade de retreinar.
+
+        Parameters
+        ----------
+        path : str
+            Caminho do arquivo salvo.
+        df : pd.DataFrame, optional
+            DataFrame de treino, caso se deseje retreinar o modelo posteriormente.
+
+        Returns
+        -------
+        ChurnPrediction
+            Instância pronta para `predict_churn` e `predict_churn_many`.
+        """
+        artifact = joblib.load(path)
+        churn = cls(df, artifact["target"])
+        churn.model = artifact["model"]
+        churn.features = artifact["features"]
+        return churn
+
     def identify_churn_signs(self, customer_data: pd.DataFrame) -> dict:
         """
         Identifica sinais de churn, como quedas na frequência de compra e valores gastos.
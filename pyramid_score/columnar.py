@@ -0,0 +1,162 @@
+# pyramid_score/columnar.py
+
+import inspect
+
+import pandas as pd
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.parquet
+    except ImportError as exc:
+        raise ImportError("A leitura de arquivos Parquet/Arrow requer o pacote pyarrow.") from exc
+    return pyarrow
+
+
+def _date_filters(date_column, start_date, end_date) -> list:
+    filters = []
+    if start_date is not None:
+        filters.append((date_column, '>=', pd.Timestamp(start_date)))
+    if end_date is not None:
+        end_date = pd.Timestamp(end_date)
+        if end_date == end_date.normalize():
+            # Data sem horário: inclui o dia inteiro (transações com horário depois da meia-noite)
+            filters.append((date_column, '<', end_date + pd.Timedelta(days=1)))
+        else:
+            filters.append((date_column, '<=', end_date))
+    return filters
+
+
+def read_parquet_columns(path, columns: list, date_column: str = None, start_date=None, end_date=None,
+                         memory_map: bool = True) -> pd.DataFrame:
+    """
+    Lê apenas as colunas informadas de um arquivo ou diretório Parquet, aplicando o filtro de datas
+    na leitura (row groups fora do intervalo não são lidos).
+
+    Parameters
+    ----------
+    path : str
+        Caminho do arquivo ou diretório Parquet.
+    columns : list or None
+        Colunas a serem lidas (None lê todas).
+    date_column : str, optional
+        Coluna de datas (tipo timestamp) usada em `start_date` e `end_date`.
+    start_date, end_date : datetime-like, optional
+        Limites inclusivos do intervalo de datas. Um `end_date` sem horário (meia-noite) inclui o
+        dia inteiro.
+    memory_map : bool, optional
+        Se True (padrão), mapeia o arquivo em memória em vez de lê-lo para buffers próprios.
+
+    Returns
+    -------
+    pd.DataFrame
+    """
+    pyarrow = _require_pyarrow()
+    filters = _date_filters(date_column, start_date, end_date)
+    columns = None if columns is None else list(columns)
+    table = pyarrow.parquet.read_table(path, columns=columns, filters=filters or None, memory_map=memory_map)
+    return table.to_pandas()
+
+
+def arrow_to_pandas(table, columns: list, date_column: str = None, start_date=None, end_date=None) -> pd.DataFrame:
+    """
+    Seleciona as colunas informadas de uma tabela Arrow e filtra o intervalo de datas antes da conversão
+    para pandas, de modo que apenas o necessário seja materializado.
+
+    Parameters
+    ----------
+    table : pyarrow.Table
+        Tabela de transações.
+    columns : list or None
+        Colunas a serem convertidas (None converte todas).
+    date_column : str, optional
+        Coluna de datas usada em `start_date` e `end_date`.
+    start_date, end_date : datetime-like, optional
+        Limites inclusivos do intervalo de datas. Um `end_date` sem horário (meia-noite) inclui o
+        dia inteiro.
+
+    Returns
+    -------
+    pd.DataFrame
+    """
+    pyarrow = _require_pyarrow()
+    if columns is not None:
+        table = table.select(list(columns))
+    comparisons = {'>=': pyarrow.compute.greater_equal, '<=': pyarrow.compute.less_equal, '<': pyarrow.compute.less}
+    for column, operator, value in _date_filters(date_column, start_date, end_date):
+        compare = comparisons[operator]
+        scalar = pyarrow.scalar(value, type=table.schema.field(column).type)
+        table = table.filter(compare(table[column], scalar))
+    return table.to_pandas()
+
+
+class ColumnarLoaderMixin:
+    """
+    Construtores `from_parquet` e `from_arrow` para as classes de análise. Apenas as colunas
+    usadas pela classe são lidas; as classes declaram quais parâmetros do construtor são nomes de
+    colunas em `_column_arguments` e qual deles é a coluna de datas em `_date_argument`. Classes
+    cujo ingest remove linhas duplicadas considerando todas as colunas (`RFV`, `RFV10`) declaram
+    `_reads_all_columns = True` e leem todas as colunas, para o mesmo resultado da leitura completa.
+    """
+
+    _column_arguments = ()
+    _date_argument = None
+    _reads_all_columns = False
+
+    @classmethod
+    def _projection(cls, args, kwargs, columns, filtered):
+        arguments = inspect.signature(cls.__init__).bind_partial(None, None, *args, **kwargs).arguments
+        projected = [arguments[name] for name in cls._column_arguments if arguments.get(name) is not None]
+        projected = list(dict.fromkeys(projected + list(columns or [])))
+
+        date_column = arguments.get(cls._date_argument) if cls._date_argument else None
+        if filtered and date_column is None:
+            raise ValueError(f"{cls.__name__} não possui coluna de datas para filtrar por start_date/end_date.")
+        return (None if cls._reads_all_columns else projected), date_column
+
+    @classmethod
+    def from_parquet(cls, path, *args, columns: list = None, start_date=None, end_date=None,
+                     memory_map: bool = True, **kwargs):
+        """
+        Cria a análise a partir de um arquivo ou diretório Parquet, lendo apenas as colunas usadas.
+
+        Parameters
+        ----------
+        path : str
+            Caminho do arquivo ou diretório Parquet.
+        *args, **kwargs
+            Demais argumentos do construtor da classe (nomes de colunas e opções), sem o DataFrame.
+        columns : list, optional
+            Colunas adicionais a serem lidas (ex.: variáveis preditoras de `ChurnPrediction`).
+        start_date, end_date : datetime-like, optional
+            Limites inclusivos de datas, aplicados na leitura (`end_date` sem horário inclui o dia inteiro).
+        memory_map : bool, optional
+            Se True (padrão), mapeia o arquivo em memória.
+        """
+        filtered = start_date is not None or end_date is not None
+        projected, date_column = cls._projection(args, kwargs, columns, filtered)
+        df = read_parquet_columns(path, projected, date_column, start_date, end_date, memory_map)
+        return cls(df, *args, **kwargs)
+
+    @classmethod
+    def from_arrow(cls, table, *args, columns: list = None, start_date=None, end_date=None, **kwargs):
+        """
+        Cria a análise a partir de uma tabela Arrow, convertendo para pandas apenas as colunas usadas.
+
+        Parameters
+        ----------
+        table : pyarrow.Table
+            Tabela de transações.
+        *args, **kwargs
+            Demais argumentos do construtor da classe (nomes de colunas e opções), sem o DataFrame.
+        columns : list, optional
+            Colunas adicionais a serem convertidas.
+        start_date, end_date : datetime-like, optional
+            Limites inclusivos de datas, aplicados antes da conversão (`end_date` sem horário inclui o dia inteiro).
+        """
+        filtered = start_date is not None or end_date is not None
+        projected, date_column = cls._projection(args, kwargs, columns, filtered)
+        df = arrow_to_pandas(table, projected, date_column, start_date, end_date)
+        return cls(df, *args, **kwargs)
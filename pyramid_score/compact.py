@@ -0,0 +1,51 @@
+# pyramid_score/compact.py
+
+import numpy as np
+import pandas as pd
+
+
+def compact_rfm_dataset(df: pd.DataFrame, customer_id: str) -> pd.DataFrame:
+    """
+    Converte a tabela de recência, frequência e valor monetário para tipos compactos:
+    clientes como categoria (dicionário), recência e frequência em int32 e valor monetário em float32.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        DataFrame com as colunas customer_id, 'recency', 'frequency' e 'monetary_value'.
+    customer_id : str
+        Nome da coluna que identifica os clientes.
+
+    Returns
+    -------
+    pd.DataFrame
+        Cópia do DataFrame com os tipos compactos.
+    """
+    return df.assign(**{
+        customer_id: df[customer_id].astype('category'),
+        'recency': df['recency'].astype(np.int32),
+        'frequency': df['frequency'].astype(np.int32),
+        'monetary_value': df['monetary_value'].astype(np.float32),
+    })
+
+
+def rfm_score_code(r, f, m) -> np.ndarray:
+    """
+    Codifica os scores r, f e m (de 1 a 9) como um inteiro pequeno que se lê como o rfm_score
+    em texto (ex.: 5, 4, 3 -> 543). O texto é gerado sob demanda por `rfv.render_rfm_score`.
+
+    Parameters
+    ----------
+    r, f, m : array-like
+        Scores de recência, frequência e valor monetário.
+
+    Returns
+    -------
+    np.ndarray
+        Códigos em int16.
+    """
+    r, f, m = (np.asarray(score, dtype=np.int16) for score in (r, f, m))
+    if len(r) and max(r.max(), f.max(), m.max()) > 9:
+        raise ValueError("O modo compacto suporta no máximo 9 bins por score.")
+    return r * 100 + f * 10 + m
+
@@ -2,8 +2,10 @@
 
 import pandas as pd
 import numpy as np
+from .columnar import ColumnarLoaderMixin
+from .sketches import KLLSketch
 
-class GroupPriceCorridor:
+class GroupPriceCorridor(ColumnarLoaderMixin):
     """
     Classe para calcular o corredor de preços (preço mínimo e máximo) de um grupo de clientes comparáveis,
     removendo outliers superiores e inferiores com base no IQR.
@@ -16,17 +18,45 @@ class GroupPriceCorridor:
         Nome da coluna que identifica os segmentos dos clientes.
     price : str
         Nome da coluna que contém os preços.
+    approximate : bool, optional
+        Se True, Q1 e Q3 de cada segmento vêm de sketches KLL (erro de rank ~ `epsilon`) construídos
+        em chunks e combinados, em vez de quantis exatos sobre cada segmento.
+    epsilon : float, optional
+        Erro de rank normalizado dos sketches (padrão 0.01).
+    sketches : dict, optional
+        Sketches por segmento já construídos (ex.: por outros workers e combinados com `merge`),
+        usados no lugar dos calculados sobre `df`.
+
+    Attributes
+    ----------
+    sketches : dict
+        Sketch de preços de cada segmento (preenchido no modo aproximado). Os sketches calculados
+        sobre `df` são refeitos a cada chamada de `build_sketches`.
 
     Methods
     -------
     get_price_corridor(segment)
         Retorna o preço mínimo e máximo aceito por clientes comparáveis dentro do mesmo segmento, removendo outliers.
+    get_all_price_corridors()
+        Retorna os limites do IQR e o corredor de preços de todos os segmentos.
+    build_sketches(chunk_size)
+        Constrói os sketches de preços por segmento, chunk a chunk.
+    from_parquet(path, ...) / from_arrow(table, ...)
+        Cria a instância lendo apenas as colunas usadas pela classe.
     """
 
-    def __init__(self, df: pd.DataFrame, segment: str, price: str):
+    _column_arguments = ('segment', 'price')
+
+    def __init__(self, df: pd.DataFrame, segment: str, price: str, approximate: bool = False,
+                 epsilon: float = 0.01, sketches: dict = None):
         self.df = df
         self.segment = segment
         self.price = price
+        self.approximate = approximate
+        self.epsilon = epsilon
+        self._provided_sketches = dict(sketches or {})
+        self.sketches = dict(self._provided_sketches)
+        self._corridors = None
 
     def _remove_outliers(self, df: pd.DataFrame, price_col: str) -> pd.DataFrame:
         """
@@ -56,6 +86,117 @@ class GroupPriceCorridor:
 
         return df_filtered
 
+    def _chunks(self, chunk_size: int):
+        # Preços e posições de cada segmento, chunk a chunk
+        for start in range(0, len(self.df), chunk_size):
+            chunk = self.df.iloc[start:start + chunk_size]
+            yield chunk[self.price].to_numpy(dtype=float), chunk.groupby(self.segment).indices
+
+    def build_sketches(self, chunk_size: int = 1_000_000) -> dict:
+        """
+        Constrói um sketch KLL de preços por segmento, percorrendo o DataFrame em chunks de linhas.
+        Os sketches de cada chunk são combinados, de modo que a memória dos quantis não depende
+        da quantidade de transações. Os sketches informados no construtor são mantidos; os demais
+        são construídos do zero.
+
+        Parameters
+        ----------
+        chunk_size : int, optional
+            Quantidade de linhas por chunk.
+
+        Returns
+        -------
+        dict
+            Sketch de cada segmento.
+        """
+        self.sketches = dict(self._provided_sketches)
+        for prices, groups in self._chunks(chunk_size):
+            for segment, positions in groups.items():
+                if segment in self._provided_sketches:
+                    continue
+                if segment not in self.sketches:
+                    self.sketches[segment] = KLLSketch(self.epsilon, seed=0)
+                self.sketches[segment].update(prices[positions])
+        return self.sketches
+
+    def _approximate_corridors(self, chunk_size: int = 1_000_000) -> pd.DataFrame:
+        """
+        Corredores do modo aproximado, sem agrupar o DataFrame inteiro: uma passada em chunks
+        alimenta os sketches (Q1 e Q3) e outra, com os mesmos chunks, mantém o mínimo e o máximo
+        dentro dos limites do IQR de cada segmento. A memória depende do chunk e da quantidade
+        de segmentos, não da quantidade de transações.
+        """
+        sketches = self.build_sketches(chunk_size)
+
+        # [q1, q3, lower_bound, upper_bound, min_price, max_price] de cada segmento encontrado
+        stats = {}
+        for prices, groups in self._chunks(chunk_size):
+            for segment, rows in groups.items():
+                if segment not in stats:
+                    q1, q3 = sketches[segment].quantiles([0.25, 0.75])
+                    stats[segment] = [q1, q3, q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1), np.nan, np.nan]
+                segment_stats = stats[segment]
+                values = prices[rows]
+                values = values[(values >= segment_stats[2]) & (values <= segment_stats[3])]
+                if len(values):
+                    segment_stats[4] = np.fmin(segment_stats[4], values.min())
+                    segment_stats[5] = np.fmax(segment_stats[5], values.max())
+
+        segments = sorted(stats)
+        values = np.array([stats[segment] for segment in segments], dtype=float).reshape(-1, 6)
+        corridors = pd.DataFrame({"q1": values[:, 0], "q3": values[:, 1]}, index=pd.Index(segments, name=self.segment))
+        corridors["iqr"] = corridors["q3"] - corridors["q1"]
+        corridors["lower_bound"] = values[:, 2]
+        corridors["upper_bound"] = values[:, 3]
+        corridors["min_price"] = values[:, 4]
+        corridors["max_price"] = values[:, 5]
+        return corridors
+
+    def get_all_price_corridors(self) -> pd.DataFrame:
+        """
+        Calcula Q1, Q3, limites do IQR e o preço mínimo e máximo sem outliers de todos os segmentos
+        em uma única passada agrupada. O resultado fica em cache na instância. No modo aproximado,
+        Q1 e Q3 vêm dos sketches por segmento e o DataFrame é percorrido em chunks.
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame indexado pelo segmento, com as colunas 'q1', 'q3', 'iqr', 'lower_bound',
+            'upper_bound', 'min_price' e 'max_price'.
+        """
+        if self._corridors is None and self.approximate:
+            corridors = self._approximate_corridors()
+            self._corridors = corridors
+            self._min_prices = corridors["min_price"].to_numpy()
+            self._max_prices = corridors["max_price"].to_numpy()
+        if self._corridors is None:
+            prices = self.df[self.price]
+            segments = self.df[self.segment]
+            grouped = prices.groupby(segments)
+
+            quartiles = grouped.quantile([0.25, 0.75]).unstack()
+            corridors = pd.DataFrame({"q1": quartiles[0.25], "q3": quartiles[0.75]})
+            corridors["iqr"] = corridors["q3"] - corridors["q1"]
+            corridors["lower_bound"] = corridors["q1"] - 1.5 * corridors["iqr"]
+            corridors["upper_bound"] = corridors["q3"] + 1.5 * corridors["iqr"]
+
+            # Leva os limites de cada segmento para as linhas e remove os outliers de uma só vez
+            codes = grouped.ngroup().to_numpy()
+            in_group = codes >= 0
+            lower = corridors["lower_bound"].to_numpy()[codes]
+            upper = corridors["upper_bound"].to_numpy()[codes]
+            values = prices.to_numpy()
+            mask = in_group & (values >= lower) & (values <= upper)
+
+            filtered = prices[mask].groupby(segments[mask])
+            corridors["min_price"] = filtered.min()
+            corridors["max_price"] = filtered.max()
+
+            self._corridors = corridors
+            self._min_prices = corridors["min_price"].to_numpy()
+            self._max_prices = corridors["max_price"].to_numpy()
+        return self._corridors
+
     def get_price_corridor(self, segment: str) -> dict:
         """
         Calcula o preço mínimo e máximo aceito pelos clientes de um segmento específico,
@@ -71,16 +212,11 @@ class GroupPriceCorridor:
         dict
             Dicionário contendo o preço mínimo e o preço máximo aceitos pelos clientes do segmento.
         """
-        df_segment = self.df[self.df[self.segment] == segment]
-        
-        if df_segment.empty:
+        # Os corredores de todos os segmentos são calculados uma vez e consultados pelo índice
+        corridors = self.get_all_price_corridors()
+        try:
+            position = corridors.index.get_loc(segment)
+        except KeyError:
             raise ValueError(f"Nenhum cliente encontrado no segmento '{segment}'.")
 
-        # Remove outliers de preços
-        df_filtered = self._remove_outliers(df_segment, self.price)
-
-        # Calcula o preço mínimo e máximo
-        min_price = df_filtered[self.price].min()
-        max_price = df_filtered[self.price].max()
-
-        return {"min_price": min_price, "max_price": max_price}
+        return {"min_price": self._min_prices[position], "max_price": self._max_prices[position]}
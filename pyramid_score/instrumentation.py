@@ -0,0 +1,139 @@
+# pyramid_score/instrumentation.py
+
+import logging
+import time
+import tracemalloc
+
+
+class StageStats:
+    """
+    Estatísticas de uma etapa de pipeline.
+
+    Attributes
+    ----------
+    pipeline : str
+        Nome da classe que executou a etapa (ex.: 'RFV').
+    stage : str
+        Nome da etapa ('ingest', 'score', 'segment', 'distribution').
+    seconds : float
+        Tempo de parede da etapa.
+    rows_in : int
+        Linhas da entrada da etapa.
+    rows_out : int
+        Linhas da saída da etapa.
+    peak_memory_mb : float or None
+        Pico de memória alocada durante a etapa, em MB (None se não medido).
+    """
+
+    __slots__ = ('pipeline', 'stage', 'seconds', 'rows_in', 'rows_out', 'peak_memory_mb')
+
+    def __init__(self, pipeline, stage, seconds, rows_in, rows_out, peak_memory_mb=None):
+        self.pipeline = pipeline
+        self.stage = stage
+        self.seconds = seconds
+        self.rows_in = rows_in
+        self.rows_out = rows_out
+        self.peak_memory_mb = peak_memory_mb
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return (f"StageStats(pipeline={self.pipeline!r}, stage={self.stage!r}, seconds={self.seconds:.4f}, "
+                f"rows_in={self.rows_in}, rows_out={self.rows_out}, peak_memory_mb={self.peak_memory_mb})")
+
+
+class PipelineInstrumentation:
+    """
+    Classe para instrumentar as etapas dos pipelines automatizados (`PyramidScoreAnalysis`, `RFV`, `RFV10`),
+    registrando tempo, linhas de entrada e saída e, opcionalmente, pico de memória de cada etapa.
+
+    Parameters
+    ----------
+    callback : callable, optional
+        Função chamada com o `StageStats` ao fim de cada etapa.
+    logger : logging.Logger, optional
+        Logger que recebe uma mensagem por etapa.
+    level : int, optional
+        Nível das mensagens de log (padrão logging.INFO).
+    track_memory : bool, optional
+        Se True, mede o pico de memória com tracemalloc, o que deixa as etapas bem mais lentas. Por
+        padrão (False), registra apenas tempo e linhas e `peak_memory_mb` fica None.
+
+    Attributes
+    ----------
+    stages : list of StageStats
+        Estatísticas de todas as etapas executadas.
+
+    Methods
+    -------
+    run(pipeline, stage, func, data)
+        Executa uma etapa e registra suas estatísticas.
+    to_records()
+        Retorna as estatísticas como lista de dicionários.
+    """
+
+    def __init__(self, callback=None, logger: logging.Logger = None, level: int = logging.INFO, track_memory: bool = False):
+        self.callback = callback
+        self.logger = logger
+        self.level = level
+        self.track_memory = track_memory
+        self.stages = []
+
+    def run(self, pipeline: str, stage: str, func, data):
+        """
+        Executa `func(data)` e registra as estatísticas da etapa.
+
+        Returns
+        -------
+        object
+            O resultado de `func(data)`.
+        """
+        started_tracing = False
+        if self.track_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+
+        peak_memory_mb = None
+        try:
+            start = time.perf_counter()
+            result = func(data)
+            seconds = time.perf_counter() - start
+            if self.track_memory:
+                peak_memory_mb = (tracemalloc.get_traced_memory()[1] - baseline) / 2 ** 20
+        finally:
+            # Uma etapa que falha não deixa o tracemalloc ligado para o resto do processo
+            if started_tracing:
+                tracemalloc.stop()
+
+        stats = StageStats(pipeline, stage, seconds, _rows(data), _rows(result), peak_memory_mb)
+        self.stages.append(stats)
+        if self.logger is not None:
+            self.logger.log(self.level, "%s.%s: %.3fs, %s -> %s linhas, pico %s MB", pipeline, stage, seconds,
+                            stats.rows_in, stats.rows_out,
+                            'n/a' if peak_memory_mb is None else f'{peak_memory_mb:.1f}')
+        if self.callback is not None:
+            self.callback(stats)
+        return result
+
+    def to_records(self) -> list:
+        """
+        Retorna as estatísticas de todas as etapas como lista de dicionários.
+        """
+        return [stats.to_dict() for stats in self.stages]
+
+
+def _rows(data):
+    return len(data) if hasattr(data, '__len__') else None
+
+
+def run_stage(instrumentation, pipeline: str, stage: str, func, data):
+    """
+    Executa uma etapa de pipeline, instrumentada apenas se `instrumentation` não for None.
+    """
+    if instrumentation is None:
+        return func(data)
+    return instrumentation.run(pipeline, stage, func, data)
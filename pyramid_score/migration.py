@@ -0,0 +1,140 @@
+# pyramid_score/migration.py
+
+import numpy as np
+import pandas as pd
+
+
+def _segment_table(result, column: str):
+    # Aceita a tabela de resultados ou a própria análise (PyramidScoreAnalysis, RFV, RFV10)
+    if isinstance(result, pd.DataFrame):
+        return result, column or 'segment'
+    return getattr(result, result._result_table), column or result._segment_column
+
+
+class SegmentMigration:
+    """
+    Classe para calcular a matriz de migração de clientes entre os segmentos de dois períodos.
+
+    Os clientes dos dois períodos são codificados em um único dicionário de IDs (`pd.factorize`)
+    e os segmentos em inteiros, de modo que o cruzamento e a contagem são operações sobre arrays
+    (`np.bincount` sobre o código da célula), sem `merge` sobre IDs em texto. Clientes presentes em
+    apenas um dos períodos (ou sem segmento) aparecem no rótulo `absent_label`.
+
+    Parameters
+    ----------
+    before : pd.DataFrame or análise
+        Tabela de resultados do período inicial, ou a análise (`PyramidScoreAnalysis`, `RFV`, `RFV10`).
+    after : pd.DataFrame or análise
+        Tabela de resultados do período final, ou a análise.
+    customer_id : str
+        Nome da coluna que identifica os clientes (cada cliente deve aparecer uma vez por tabela).
+    column : str, optional
+        Coluna de segmentos. Por padrão, a coluna de segmento da análise ou 'segment'.
+    labels : list, optional
+        Ordem dos segmentos na matriz. Por padrão, as categorias das colunas categóricas (ex.: modo
+        `compact`) seguidas dos demais segmentos encontrados, em ordem alfabética.
+    absent_label : str, optional
+        Rótulo dos clientes ausentes em um dos períodos (padrão 'Ausente').
+
+    Attributes
+    ----------
+    matrix : pd.DataFrame
+        Quantidade de clientes por célula (linhas: segmento inicial; colunas: segmento final).
+
+    Methods
+    -------
+    rates()
+        Matriz de migração normalizada por linha.
+    customers(from_segment, to_segment)
+        Clientes de uma célula da matriz.
+    to_frame()
+        Segmento inicial e final de cada cliente.
+    """
+
+    def __init__(self, before, after, customer_id: str, column: str = None, labels: list = None,
+                 absent_label: str = 'Ausente'):
+        self.customer_id = customer_id
+        before, before_column = _segment_table(before, column)
+        after, after_column = _segment_table(after, column)
+
+        # Dicionário de IDs compartilhado entre os dois períodos
+        codes, self._customers = pd.factorize(pd.concat([before[customer_id], after[customer_id]], ignore_index=True))
+        before_ids, after_ids = codes[:len(before)], codes[len(before):]
+
+        if labels is None:
+            labels = self._default_labels(before[before_column], after[after_column])
+        self.labels = list(labels) + [absent_label]
+        self._n_labels = len(self.labels)
+        absent = self._n_labels - 1
+
+        # Segmento (inteiro) de cada cliente em cada período; ausentes ficam com o código de `absent_label`
+        segments = []
+        for ids, values in ((before_ids, before[before_column]), (after_ids, after[after_column])):
+            segment_codes = pd.Categorical(values, categories=labels).codes.astype(np.int64)
+            by_customer = np.full(len(self._customers), absent, dtype=np.int64)
+            by_customer[ids] = np.where(segment_codes < 0, absent, segment_codes)
+            segments.append(by_customer)
+        self._before, self._after = segments
+
+        cells = self._before * self._n_labels + self._after
+        counts = np.bincount(cells, minlength=self._n_labels ** 2)
+        self._order = np.argsort(cells, kind='stable')
+        self._offsets = np.concatenate([[0], np.cumsum(counts)])
+
+        self.matrix = pd.DataFrame(counts.reshape(self._n_labels, self._n_labels),
+                                   index=pd.Index(self.labels, name='before'),
+                                   columns=pd.Index(self.labels, name='after'))
+
+    @staticmethod
+    def _default_labels(*columns) -> list:
+        # Categorias das colunas categóricas (na ordem delas), depois os demais segmentos em ordem alfabética
+        labels = [label for values in columns if isinstance(values.dtype, pd.CategoricalDtype)
+                  for label in values.cat.categories]
+        found = set(columns[0].dropna()) | set(columns[1].dropna())
+        return list(dict.fromkeys(labels)) + sorted(found.difference(labels))
+
+    def rates(self) -> pd.DataFrame:
+        """
+        Retorna a matriz de migração normalizada por linha (participação de cada segmento final
+        entre os clientes de cada segmento inicial).
+
+        Returns
+        -------
+        pd.DataFrame
+        """
+        totals = self.matrix.sum(axis=1).replace(0, np.nan)
+        return self.matrix.div(totals, axis=0).fillna(0.0)
+
+    def customers(self, from_segment: str, to_segment: str) -> pd.Index:
+        """
+        Retorna os clientes que migraram de `from_segment` para `to_segment`.
+
+        Parameters
+        ----------
+        from_segment : str
+            Segmento no período inicial (ou `absent_label` para clientes novos).
+        to_segment : str
+            Segmento no período final (ou `absent_label` para clientes perdidos).
+
+        Returns
+        -------
+        pd.Index
+            IDs dos clientes da célula.
+        """
+        cell = self.labels.index(from_segment) * self._n_labels + self.labels.index(to_segment)
+        return self._customers[self._order[self._offsets[cell]:self._offsets[cell + 1]]]
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Retorna o segmento inicial e final de cada cliente, com os segmentos como categoria.
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame com as colunas customer_id, 'before' e 'after'.
+        """
+        return pd.DataFrame({
+            self.customer_id: self._customers,
+            'before': pd.Categorical.from_codes(self._before, categories=self.labels),
+            'after': pd.Categorical.from_codes(self._after, categories=self.labels),
+        })
@@ -0,0 +1,173 @@
+# pyramid_score/parallel.py
+
+import itertools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from .streaming import aggregate_transactions, merge_states
+
+# DataFrames em processamento, herdados pelos workers criados com fork
+_FRAMES = {}
+_TOKENS = itertools.count()
+
+
+def resolve_n_jobs(n_jobs: int) -> int:
+    """
+    Converte `n_jobs` na quantidade de processos: -1 (ou None) usa todos os núcleos.
+    """
+    if n_jobs is None or n_jobs == -1:
+        return os.cpu_count() or 1
+    if n_jobs < 1:
+        raise ValueError("n_jobs deve ser um inteiro positivo ou -1.")
+    return n_jobs
+
+
+def partition_by_customer(df: pd.DataFrame, customer_id: str, n_shards: int, key=None) -> list:
+    """
+    Divide as transações em partições por hash do cliente, de modo que todas as transações
+    de um cliente fiquem na mesma partição.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        DataFrame contendo as transações.
+    customer_id : str
+        Nome da coluna que identifica os clientes.
+    n_shards : int
+        Quantidade de partições.
+    key : callable, optional
+        Função aplicada à coluna de clientes antes do hash (ex.: `rfv.normalize_customer_ids`), para
+        que IDs que representam o mesmo cliente (ex.: 1 e '1.0') fiquem na mesma partição.
+
+    Returns
+    -------
+    list of pd.DataFrame
+        Partições não vazias.
+    """
+    customers = df[customer_id] if key is None else pd.Series(key(df[customer_id]), index=df.index)
+    shard_ids = pd.util.hash_pandas_object(customers, index=False).to_numpy() % n_shards
+    return [shard for _, shard in df.groupby(shard_ids, sort=False)]
+
+
+def row_ranges(n_rows: int, n_ranges: int) -> list:
+    """
+    Divide `n_rows` linhas em até `n_ranges` intervalos contíguos [início, fim) de tamanhos próximos.
+    """
+    bounds = np.linspace(0, n_rows, max(n_ranges, 1) + 1).astype(np.int64)
+    return [(int(start), int(stop)) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+
+
+def _fork_context():
+    # Com fork, os workers herdam o DataFrame do processo pai e recebem apenas os intervalos de linhas
+    try:
+        return multiprocessing.get_context('fork')
+    except ValueError:
+        return None
+
+
+def _range_state(start: int, stop: int, customer_id: str, transaction_date: str, amount: str, prepare,
+                 token: int = None, frame: pd.DataFrame = None) -> tuple:
+    frame = _FRAMES[token] if frame is None else frame
+    columns = [customer_id, transaction_date, amount]
+    if prepare is None:
+        return aggregate_transactions(frame.iloc[start:stop][columns], *columns), None, None
+
+    chunk = frame.iloc[start:stop]
+    chunk.index = pd.RangeIndex(start, stop)
+    chunk = prepare(chunk, *columns)
+    # Chave de cada linha preparada: duplicatas em intervalos diferentes têm a mesma chave
+    keys = pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+    return aggregate_transactions(chunk, *columns), keys, chunk.index.to_numpy()
+
+
+def _drop_cross_range_duplicates(state: pd.DataFrame, frame: pd.DataFrame, results: list, customer_id: str,
+                                 transaction_date: str, amount: str, prepare) -> pd.DataFrame:
+    # Só as chaves presentes em mais de um intervalo são verificadas; a deduplicação exata é refeita
+    # sobre essas linhas e a diferença é descontada do estado combinado
+    unique_keys = pd.Series(np.concatenate([pd.unique(keys) for _, keys, _ in results]))
+    shared = unique_keys[unique_keys.duplicated()].unique()
+    if not len(shared):
+        return state
+
+    columns = [customer_id, transaction_date, amount]
+    candidates = [positions[np.isin(keys, shared)] for _, keys, positions in results]
+    counted = merge_states(*[aggregate_transactions(prepare(frame.iloc[positions], *columns), *columns)
+                             for positions in candidates])
+    kept = aggregate_transactions(prepare(frame.iloc[np.sort(np.concatenate(candidates))], *columns), *columns)
+
+    excess = counted[['frequency', 'monetary_value']].sub(kept[['frequency', 'monetary_value']], fill_value=0)
+    excess = excess[excess['frequency'] > 0]
+    state = state.copy()
+    state.loc[excess.index, 'frequency'] -= excess['frequency'].astype(state['frequency'].dtype)
+    state.loc[excess.index, 'monetary_value'] -= excess['monetary_value']
+    return state
+
+
+def parallel_rfm_state(df: pd.DataFrame, customer_id: str, transaction_date: str, amount: str,
+                       n_jobs: int = -1, prepare=None) -> pd.DataFrame:
+    """
+    Calcula o estado por cliente (última data, quantidade e soma) em um pool de processos.
+
+    Cada processo recebe um intervalo contíguo de linhas e o reduz ao estado agregável por cliente;
+    o processo pai apenas combina os estados com `merge_states`. Com o método `fork`, os processos
+    herdam `df` e nada além dos limites dos intervalos é serializado. Os passos que dependem de toda
+    a população (ranking, qcut, faixas) continuam sendo executados sobre o estado combinado.
+
+    Com `prepare`, a deduplicação de linhas feita em cada intervalo é completada no processo pai:
+    cada processo devolve o hash das linhas já deduplicadas e apenas as chaves presentes em mais de
+    um intervalo são verificadas e descontadas do estado.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        DataFrame contendo as transações.
+    customer_id, transaction_date, amount : str
+        Nomes das colunas de cliente, data e valor.
+    n_jobs : int, optional
+        Quantidade de processos. -1 (padrão) usa todos os núcleos.
+    prepare : callable, optional
+        Função de nível de módulo `prepare(df, customer_id, transaction_date, amount)` aplicada
+        a cada intervalo antes da agregação (ex.: `rfv.prepare_transactions`), que remove linhas
+        duplicadas com `drop_duplicates`. Sem ela, apenas as colunas de cliente, data e valor são lidas.
+
+    Returns
+    -------
+    pd.DataFrame
+        Estado por cliente, no formato de `aggregate_transactions`.
+    """
+    n_jobs = resolve_n_jobs(n_jobs)
+    columns = [customer_id, transaction_date, amount]
+    ranges = row_ranges(len(df), n_jobs)
+    if len(ranges) <= 1:
+        if prepare is not None:
+            df = prepare(df, *columns)
+        return aggregate_transactions(df, *columns)
+
+    context = _fork_context()
+    token = next(_TOKENS)
+    if context is not None:
+        _FRAMES[token] = df
+    try:
+        with ProcessPoolExecutor(max_workers=len(ranges), mp_context=context) as executor:
+            if context is not None:
+                futures = [executor.submit(_range_state, start, stop, *columns, prepare, token)
+                           for start, stop in ranges]
+            else:
+                futures = [executor.submit(_range_state, 0, stop - start, *columns, prepare,
+                                           frame=df.iloc[start:stop] if prepare is not None else df.iloc[start:stop][columns])
+                           for start, stop in ranges]
+            results = [future.result() for future in futures]
+    finally:
+        _FRAMES.pop(token, None)
+
+    if context is None and prepare is not None:
+        # Sem fork, as posições devolvidas são relativas a cada intervalo
+        results = [(state, keys, positions + start) for (state, keys, positions), (start, _) in zip(results, ranges)]
+
+    state = merge_states(*[state for state, _, _ in results])
+    if prepare is not None:
+        state = _drop_cross_range_duplicates(state, df, results, *columns, prepare)
+    return state
@@ -1,8 +1,9 @@
 # pyramid_score/price_corridor.py
 
 import pandas as pd
+from .columnar import ColumnarLoaderMixin
 
-class PriceCorridor:
+class PriceCorridor(ColumnarLoaderMixin):
     """
     Classe para calcular o corredor de preços (preço mínimo e máximo) das transações de um cliente.
 
@@ -19,17 +20,46 @@ class PriceCorridor:
     -------
     get_price_corridor(customer_id)
         Retorna o preço mínimo e máximo aceito por um cliente específico.
+    get_all_corridors()
+        Retorna o preço mínimo e máximo de todos os clientes.
+    from_parquet(path, ...) / from_arrow(table, ...)
+        Cria a instância lendo apenas as colunas usadas pela classe.
     """
 
+    _column_arguments = ('customer_id', 'price')
+
     def __init__(self, df: pd.DataFrame, customer_id: str, price: str):
         self.df = df
         self.customer_id = customer_id
         self.price = price
+        self._corridors = None
+
+    def get_all_corridors(self) -> pd.DataFrame:
+        """
+        Calcula o preço mínimo e máximo de todos os clientes em uma única passada agrupada.
+
+        O resultado fica em cache na instância e serve de índice por cliente para
+        `get_price_corridor`.
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame indexado pelo cliente, com as colunas 'min_price' e 'max_price'.
+        """
+        if self._corridors is None:
+            grouped = self.df.groupby(self.customer_id)[self.price]
+            self._corridors = pd.DataFrame({"min_price": grouped.min(), "max_price": grouped.max()})
+            self._min_prices = self._corridors["min_price"].to_numpy()
+            self._max_prices = self._corridors["max_price"].to_numpy()
+        return self._corridors
 
     def get_price_corridor(self, customer_id: str) -> dict:
         """
         Calcula o preço mínimo e máximo que o cliente pagou.
 
+        Na primeira chamada, os corredores de todos os clientes são calculados e indexados;
+        as chamadas seguintes são buscas O(1) nesse índice.
+
         Parameters
         ----------
         customer_id : str
@@ -40,12 +70,11 @@ class PriceCorridor:
         dict
             Dicionário contendo o preço mínimo e o preço máximo aceitos pelo cliente.
         """
-        df_customer = self.df[self.df[self.customer_id] == customer_id]
-        
-        if df_customer.empty:
+        # Busca por hash no índice de clientes construído por get_all_corridors
+        corridors = self.get_all_corridors()
+        try:
+            position = corridors.index.get_loc(customer_id)
+        except KeyError:
             raise ValueError("Nenhuma transação encontrada para o cliente fornecido.")
-        
-        min_price = df_customer[self.price].min()
-        max_price = df_customer[self.price].max()
 
-        return {"min_price": min_price, "max_price": max_price}
+        return {"min_price": self._min_prices[position], "max_price": self._max_prices[position]}
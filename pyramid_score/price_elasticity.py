@@ -2,8 +2,9 @@
 
 import pandas as pd
 import numpy as np
+from .columnar import ColumnarLoaderMixin
 
-class PriceElasticity:
+class PriceElasticity(ColumnarLoaderMixin):
     """
     Classe para calcular a elasticidade-preço da demanda com base nos dados do cliente.
 
@@ -22,8 +23,16 @@ class PriceElasticity:
     -------
     calculate_elasticity(customer_id)
         Calcula a elasticidade-preço de um cliente específico.
+    calculate_all_elasticities()
+        Calcula a elasticidade-preço de todos os clientes.
+    fit_loglog_elasticities(group, min_obs)
+        Ajusta log(quantidade) ~ log(preço) por grupo (clientes, segmentos...) em um único cálculo vetorizado.
+    from_parquet(path, ...) / from_arrow(table, ...)
+        Cria a instância lendo apenas as colunas usadas pela classe.
     """
 
+    _column_arguments = ('customer_id', 'price', 'quantity')
+
     def __init__(self, df: pd.DataFrame, customer_id: str, price: str, quantity: str):
         self.df = df
         self.customer_id = customer_id
@@ -60,3 +69,105 @@ class PriceElasticity:
         elasticity = df_customer['quantity_change_pct'].mean() / df_customer['price_change_pct'].mean()
         
         return elasticity
+
+    def calculate_all_elasticities(self) -> pd.Series:
+        """
+        Calcula a elasticidade-preço de todos os clientes de forma vetorizada.
+
+        Usa a mesma definição de `calculate_elasticity`, mas ordena a tabela uma única vez por
+        (cliente, preço) e calcula as variações percentuais e suas médias por grupo.
+
+        Returns
+        -------
+        pd.Series
+            Elasticidade-preço indexada pelo cliente. Clientes com menos de dois preços
+            distintos recebem NaN.
+        """
+        df = self.df[[self.customer_id, self.price, self.quantity]].sort_values(by=[self.customer_id, self.price])
+        customers = df[self.customer_id]
+        prices = df[self.price]
+        quantities = df[self.quantity]
+
+        # Variações percentuais em relação à linha anterior do mesmo cliente
+        same_customer = customers.eq(customers.shift())
+        price_change_pct = (prices / prices.shift() - 1).where(same_customer)
+        quantity_change_pct = (quantities / quantities.shift() - 1).where(same_customer)
+
+        valid = price_change_pct.notna() & quantity_change_pct.notna()
+        mean_price_change = price_change_pct[valid].groupby(customers[valid]).mean()
+        mean_quantity_change = quantity_change_pct[valid].groupby(customers[valid]).mean()
+
+        # Elasticidade = %ΔQ / %ΔP
+        grouped_prices = prices.groupby(customers)
+        single_price = grouped_prices.min() == grouped_prices.max()
+        elasticity = (mean_quantity_change / mean_price_change).reindex(single_price.index)
+        elasticity[single_price] = np.nan
+        return elasticity.rename('elasticity')
+
+    def fit_loglog_elasticities(self, group: str = None, min_obs: int = 3) -> pd.DataFrame:
+        """
+        Ajusta a regressão log(quantidade) = intercepto + elasticidade * log(preço) para cada grupo.
+
+        Todas as regressões são resolvidas de uma vez a partir de estatísticas suficientes por grupo
+        (contagem, médias e somas de quadrados e produtos centrados, acumuladas com `np.bincount`),
+        sem laço em Python por grupo. Linhas com preço ou quantidade ausentes ou não positivos são ignoradas.
+
+        Parameters
+        ----------
+        group : str, optional
+            Coluna de agrupamento (ex.: a coluna de segmentos usada em `GroupPriceCorridor`).
+            Por padrão, a coluna de clientes.
+        min_obs : int, optional
+            Quantidade mínima de observações para ajustar o grupo (padrão 3, o mínimo para o erro padrão).
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame indexado pelo grupo, com as colunas 'elasticity' (inclinação), 'intercept',
+            'std_error' (erro padrão da elasticidade), 'intercept_std_error', 'r_squared' e 'n_obs'.
+            Grupos com menos de `min_obs` observações ou com um único preço recebem NaN.
+        """
+        group = self.customer_id if group is None else group
+        prices = self.df[self.price].to_numpy(dtype=float)
+        quantities = self.df[self.quantity].to_numpy(dtype=float)
+        with np.errstate(invalid='ignore'):
+            valid = (prices > 0) & (quantities > 0)
+        codes, groups = pd.factorize(self.df[group], sort=True)
+        valid &= codes >= 0
+
+        codes = codes[valid]
+        x = np.log(prices[valid])
+        y = np.log(quantities[valid])
+        n_groups = len(groups)
+
+        # Estatísticas suficientes por grupo (somas centradas nas médias do grupo)
+        n_obs = np.bincount(codes, minlength=n_groups).astype(float)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_x = np.bincount(codes, weights=x, minlength=n_groups) / n_obs
+            mean_y = np.bincount(codes, weights=y, minlength=n_groups) / n_obs
+            dx = x - mean_x[codes]
+            dy = y - mean_y[codes]
+            sxx = np.bincount(codes, weights=dx * dx, minlength=n_groups)
+            sxy = np.bincount(codes, weights=dx * dy, minlength=n_groups)
+            syy = np.bincount(codes, weights=dy * dy, minlength=n_groups)
+
+            slope = sxy / sxx
+            intercept = mean_y - slope * mean_x
+            residual = np.maximum(syy - slope * sxy, 0.0)
+            sigma2 = residual / (n_obs - 2)
+            std_error = np.sqrt(sigma2 / sxx)
+            intercept_std_error = np.sqrt(sigma2 * (1 / n_obs + mean_x ** 2 / sxx))
+            r_squared = np.where(syy > 0, 1 - residual / syy, np.nan)
+
+        # Preço constante no grupo (variância de log(preço) desprezível) não identifica a inclinação
+        fitted = (n_obs >= max(min_obs, 3)) & (sxx > 1e-12 * np.maximum(n_obs, 1))
+        result = pd.DataFrame({
+            'elasticity': slope,
+            'intercept': intercept,
+            'std_error': std_error,
+            'intercept_std_error': intercept_std_error,
+            'r_squared': r_squared,
+        }, index=pd.Index(groups, name=group))
+        result[~fitted] = np.nan
+        result['n_obs'] = n_obs.astype(np.int64)
+        return result
@@ -1,6 +1,162 @@
 import pandas as pd
+import numpy as np
+from .streaming import aggregate_transactions, merge_states, state_to_rfm_dataset
+from .parallel import parallel_rfm_state
+from .compact import compact_rfm_dataset
+from .instrumentation import run_stage
+from .columnar import ColumnarLoaderMixin
+from .segment_index import cached_segment_index
+from .cache import run_cached
 
-class PyramidScoreAnalysis:
+# Pesos de recência, frequência e valor monetário no pyramid_score
+PYRAMID_WEIGHTS = (0.15, 0.28, 0.57)
+
+# Percentual de clientes em cada faixa, da mais valiosa para a menos valiosa
+TIER_PERCENTILES = (0.005, 0.015, 0.03, 0.05, 0.10, 0.15, 0.20, 0.15, 0.10, 0.20)
+
+TIER_LABELS = (
+    'Platinum Tier', 'Gold Tier', 'Silver Tier', 'Bronze Tier', 'Prime Clients',
+    'Core Clients', 'Entry-Level Clients', 'Low Contribution', 'Minimal Value', 'Residual Tier'
+)
+
+
+def assign_tiers(scores, percentiles=TIER_PERCENTILES) -> np.ndarray:
+    """
+    Distribui os clientes nas faixas da pirâmide sem ordenar a tabela inteira.
+
+    Os limites das faixas são posições no ranking decrescente do score; `np.argpartition`
+    coloca cada limite na sua posição em uma única chamada, e cada faixa recebe o bloco entre
+    dois limites consecutivos. A última faixa recebe todos os clientes restantes.
+
+    Parameters
+    ----------
+    scores : array-like
+        Scores dos clientes (valores ausentes ficam na última faixa).
+    percentiles : sequence of float, optional
+        Percentual de clientes em cada faixa (a quantidade de cada faixa é truncada para inteiro).
+
+    Returns
+    -------
+    np.ndarray
+        Código da faixa de cada cliente (0 é a faixa mais valiosa), em int8.
+    """
+    scores = np.asarray(scores, dtype=float)
+    total_customers = len(scores)
+    boundaries = np.cumsum([int(p * total_customers) for p in percentiles[:-1]], dtype=np.intp)
+    boundaries = np.minimum(boundaries, total_customers)
+
+    kth = np.unique(boundaries[(boundaries > 0) & (boundaries < total_customers)])
+    # Sem limites internos, cada faixa é vazia ou contém todos os clientes
+    order = np.argpartition(-scores, kth) if len(kth) else np.arange(total_customers)
+
+    codes = np.full(total_customers, len(percentiles) - 1, dtype=np.int8)
+    start = 0
+    for code, end in enumerate(boundaries):
+        codes[order[start:end]] = code
+        start = end
+    return codes
+
+
+def sweep_pyramid_tiers(df: pd.DataFrame, weights, percentiles=None, labels=None, return_tiers: bool = False,
+                        batch_size: int = 64):
+    """
+    Avalia várias configurações de pesos e de percentuais das faixas sobre a mesma tabela de RFM.
+
+    Os scores de um lote de vetores de pesos são calculados em um único produto matricial
+    (clientes x 3) @ (3 x pesos); cada coluna de scores é ranqueada uma vez (`np.argsort` sobre o
+    eixo dos clientes) e as faixas de todos os esquemas de percentuais saem do ranking por
+    `np.searchsorted`. As estatísticas por faixa são acumuladas com `np.bincount`.
+
+    Cada configuração é um par (vetor de pesos, esquema de percentuais), em todas as combinações.
+    Com os pesos e percentuais padrão, as faixas coincidem com as de `PyramidScoreAnalysis`
+    (a menos da ordem entre clientes com scores empatados).
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        DataFrame com as colunas 'recency', 'frequency' e 'monetary_value'.
+    weights : array-like, shape (n_pesos, 3)
+        Pesos de recência, frequência e valor monetário de cada configuração.
+    percentiles : array-like, shape (n_esquemas, n_faixas), optional
+        Percentuais das faixas de cada esquema. Por padrão, `TIER_PERCENTILES`.
+    labels : sequence of str, optional
+        Rótulos das faixas. Por padrão, `TIER_LABELS` (para 10 faixas) ou 'Tier 1', 'Tier 2', ...
+    return_tiers : bool, optional
+        Se True, retorna também a faixa de cada cliente em cada configuração.
+    batch_size : int, optional
+        Quantidade de vetores de pesos por produto matricial (limita a memória dos scores).
+
+    Returns
+    -------
+    pd.DataFrame or tuple
+        Estatísticas por configuração e faixa: 'configuration', 'weights_id', 'percentiles_id',
+        'recency_weight', 'frequency_weight', 'monetary_weight', 'segment', 'no_of_customers',
+        'recency', 'frequency' e 'monetary_value' (médias) e 'monetary_share'. Com `return_tiers`,
+        uma tupla (estatísticas, faixas), em que faixas é um array int8 (clientes x configurações)
+        com o código da faixa (índice em `labels`).
+    """
+    weights = np.atleast_2d(np.asarray(weights, dtype=float))
+    percentiles = np.atleast_2d(np.asarray(TIER_PERCENTILES if percentiles is None else percentiles, dtype=float))
+    if weights.shape[1] != 3:
+        raise ValueError("Cada vetor de pesos deve ter 3 valores (recência, frequência e valor monetário).")
+    n_weights, (n_schedules, n_tiers) = len(weights), percentiles.shape
+    if labels is None:
+        labels = TIER_LABELS if n_tiers == len(TIER_LABELS) else [f'Tier {tier + 1}' for tier in range(n_tiers)]
+    if len(labels) != n_tiers:
+        raise ValueError("A quantidade de rótulos deve ser igual à quantidade de faixas.")
+
+    metrics = df[['recency', 'frequency', 'monetary_value']].to_numpy(dtype=float)
+    total_customers = len(metrics)
+    boundaries = [np.cumsum([int(p * total_customers) for p in schedule[:-1]]) for schedule in percentiles]
+
+    n_configurations = n_weights * n_schedules
+    counts = np.zeros((n_configurations, n_tiers))
+    sums = np.zeros((3, n_configurations, n_tiers))
+    tiers = np.empty((total_customers, n_configurations), dtype=np.int8) if return_tiers else None
+
+    for start in range(0, n_weights, batch_size):
+        block = weights[start:start + batch_size]
+        scores = metrics @ block.T
+
+        # Posição de cada cliente no ranking decrescente de cada vetor de pesos
+        order = np.argsort(-scores, axis=0, kind='stable')
+        ranks = np.empty_like(order)
+        np.put_along_axis(ranks, order, np.arange(total_customers)[:, None], axis=0)
+
+        for offset in range(len(block)):
+            for schedule, cumulative in enumerate(boundaries):
+                configuration = (start + offset) * n_schedules + schedule
+                codes = np.searchsorted(cumulative, ranks[:, offset], side='right')
+                counts[configuration] = np.bincount(codes, minlength=n_tiers)
+                for metric in range(3):
+                    sums[metric, configuration] = np.bincount(codes, weights=metrics[:, metric], minlength=n_tiers)
+                if return_tiers:
+                    tiers[:, configuration] = codes
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / counts
+        share = sums[2] / sums[2].sum(axis=1, keepdims=True)
+
+    configurations = np.repeat(np.arange(n_configurations), n_tiers)
+    weights_id, percentiles_id = np.divmod(configurations, n_schedules)
+    stats = pd.DataFrame({
+        'configuration': configurations,
+        'weights_id': weights_id,
+        'percentiles_id': percentiles_id,
+        'recency_weight': weights[weights_id, 0],
+        'frequency_weight': weights[weights_id, 1],
+        'monetary_weight': weights[weights_id, 2],
+        'segment': np.tile(np.asarray(labels, dtype=object), n_configurations),
+        'no_of_customers': counts.ravel().astype(np.int64),
+        'recency': means[0].ravel(),
+        'frequency': means[1].ravel(),
+        'monetary_value': means[2].ravel(),
+        'monetary_share': share.ravel(),
+    })
+    return (stats, tiers) if return_tiers else stats
+
+
+class PyramidScoreAnalysis(ColumnarLoaderMixin):
     """
     Classe para realizar análise de Pyramid Score (Recência, Frequência e Valor Monetário) e segmentação de clientes.
 
@@ -17,27 +173,99 @@ class PyramidScoreAnalysis:
     automated : bool, optional
         Se True (padrão), realiza todas as operações automaticamente.
         Se False, permite executar cada operação manualmente.
+    n_jobs : int, optional
+        Quantidade de processos usados na agregação por cliente (padrão 1). -1 usa todos os núcleos.
+        As transações são particionadas por hash do cliente; o score e as faixas são calculados
+        sobre o resultado combinado.
+    compact : bool, optional
+        Se True, a tabela usa tipos compactos: clientes e segmentos como categoria,
+        recência e frequência em int32 e valor monetário em float32.
+    instrumentation : PipelineInstrumentation, optional
+        Se informado, registra tempo, linhas e pico de memória de cada etapa automatizada
+        (e de `update`). Sem ele, as etapas são executadas sem nenhuma medição.
+    weights : tuple of float, optional
+        Pesos de recência, frequência e valor monetário no score (padrão `PYRAMID_WEIGHTS`).
+    percentiles : sequence of float, optional
+        Percentual de clientes em cada uma das 10 faixas (padrão `TIER_PERCENTILES`).
+    cache : ResultCache, optional
+        Se informado, as tabelas (e o estado usado por `update`) são lidas do cache quando as
+        mesmas transações e parâmetros já foram analisados, e gravadas nele caso contrário.
 
     Attributes
     ----------
     pyramid_score_table : pd.DataFrame
-        DataFrame contendo os scores e segmentos de Pyramid Score para cada cliente.
+        DataFrame contendo os scores e segmentos de Pyramid Score para cada cliente, na ordem
+        dos clientes (as faixas são calculadas sem ordenar a tabela pelo score).
     segment_table : pd.DataFrame
         DataFrame contendo a distribuição dos clientes por segmento.
+
+    Methods
+    -------
+    update(new_transactions)
+        Incorpora novas transações e recalcula as tabelas sem reprocessar o histórico.
+    from_parquet(path, ...) / from_arrow(table, ...)
+        Cria a instância lendo apenas as colunas usadas pela classe.
+    sweep(weights, percentiles)
+        Avalia configurações alternativas de pesos e percentuais sem recalcular a análise.
     """
     
-    def __init__(self, df: pd.DataFrame, customer_id: str, transaction_date: str, amount: str, automated=True):
+    _column_arguments = ('customer_id', 'transaction_date', 'amount')
+    _date_argument = 'transaction_date'
+    _result_table = 'pyramid_score_table'
+    _segment_column = 'segment'
+
+    def __init__(self, df: pd.DataFrame, customer_id: str, transaction_date: str, amount: str, automated=True, n_jobs=1, compact=False, instrumentation=None,
+                 weights=PYRAMID_WEIGHTS, percentiles=TIER_PERCENTILES, cache=None):
+        if len(weights) != 3:
+            raise ValueError("weights deve ter 3 valores (recência, frequência e valor monetário).")
+        if len(percentiles) != len(TIER_LABELS):
+            raise ValueError(f"percentiles deve ter {len(TIER_LABELS)} valores, um por faixa.")
         self.df = df
         self.customer_id = customer_id
         self.transaction_date = transaction_date
         self.amount = amount
+        self.n_jobs = n_jobs
+        self.compact = compact
+        self.instrumentation = instrumentation
+        self.weights = tuple(weights)
+        self.percentiles = tuple(percentiles)
+        self._customer_state = None
+        self._segment_index = None
         
         # Execução automática das operações
         if automated:
-            df_grp = self._produce_pyramid_score_dataset(self.df)
-            df_grp = self._calculate_pyramid_score(df_grp)
-            self.pyramid_score_table = self._assign_segments(df_grp)
-            self.segment_table = self._get_segment_distribution(self.pyramid_score_table)
+            params = {'weights': self.weights, 'percentiles': self.percentiles, 'compact': compact}
+            run_cached(cache, self, params, ('pyramid_score_table', 'segment_table', '_customer_state'), self._run_automated)
+
+    @classmethod
+    def from_rfm_dataset(cls, df_grp: pd.DataFrame, customer_id: str, compact=False,
+                         weights=PYRAMID_WEIGHTS, percentiles=TIER_PERCENTILES) -> 'PyramidScoreAnalysis':
+        """
+        Cria a análise a partir de valores de recência, frequência e valor monetário já agregados
+        (ex.: por `StreamingRFMAggregator.to_rfm_dataset`), executando apenas o score e a segmentação.
+
+        Parameters
+        ----------
+        df_grp : pd.DataFrame
+            DataFrame com as colunas customer_id, 'recency', 'frequency' e 'monetary_value'.
+        customer_id : str
+            Nome da coluna que identifica os clientes.
+        compact : bool, optional
+            Se True, a tabela usa tipos compactos.
+        weights, percentiles : optional
+            Pesos do score e percentuais das faixas (ver a classe).
+
+        Returns
+        -------
+        PyramidScoreAnalysis
+            Análise com `pyramid_score_table` e `segment_table` preenchidas.
+        """
+        analysis = cls(None, customer_id, None, None, automated=False, compact=compact,
+                       weights=weights, percentiles=percentiles)
+        df_grp = analysis._calculate_pyramid_score(df_grp.copy())
+        analysis.pyramid_score_table = analysis._assign_segments(df_grp)
+        analysis.segment_table = analysis._get_segment_distribution(analysis.pyramid_score_table)
+        return analysis
     
     def _produce_pyramid_score_dataset(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -53,18 +281,55 @@ class PyramidScoreAnalysis:
         pd.DataFrame
             DataFrame com os valores de recência, frequência e valor monetário por cliente.
         """
-        df = df.dropna(subset=[self.customer_id, self.amount])
-        df[self.amount] = df[self.amount].astype(float)
-        df[self.transaction_date] = pd.to_datetime(df[self.transaction_date])
+        # O estado por cliente (última data, quantidade e soma) é guardado para o `update`
+        if self.n_jobs != 1:
+            self._customer_state = parallel_rfm_state(df, self.customer_id, self.transaction_date, self.amount, n_jobs=self.n_jobs)
+        else:
+            self._customer_state = aggregate_transactions(df, self.customer_id, self.transaction_date, self.amount)
+        return state_to_rfm_dataset(self._customer_state, self.customer_id)
 
-        # Agrupamento por cliente e cálculo de recência, frequência e valor monetário
-        df_grp = df.groupby(self.customer_id).agg({
-            self.transaction_date: lambda x: (df[self.transaction_date].max() - x.max()).days,
-            self.amount: ['count', 'sum']
-        }).reset_index()
+    def update(self, new_transactions: pd.DataFrame) -> pd.DataFrame:
+        """
+        Incorpora novas transações ao estado por cliente e recalcula apenas o score e as faixas.
+
+        A recência de todos os clientes é recalculada a partir da última transação de cada um,
+        de modo que clientes sem novas compras envelhecem pelos dias decorridos. O resultado é
+        igual ao de uma análise completa sobre o histórico acrescido das novas transações
+        (a menos de arredondamento de ponto flutuante nas somas). `self.df` não é alterado.
+
+        Parameters
+        ----------
+        new_transactions : pd.DataFrame
+            DataFrame com as novas transações, nas mesmas colunas do DataFrame original.
 
-        df_grp.columns = [self.customer_id, 'recency', 'frequency', 'monetary_value']
-        return df_grp
+        Returns
+        -------
+        pd.DataFrame
+            A `pyramid_score_table` atualizada.
+        """
+        if self._customer_state is None:
+            raise ValueError("Não há estado por cliente para atualizar. Execute a análise completa sobre as transações antes de chamar update.")
+
+        df_grp = self._run_stage('update', self._merge_transactions, new_transactions)
+        self._score_and_segment(df_grp)
+        return self.pyramid_score_table
+
+    def _run_automated(self):
+        df_grp = self._run_stage('ingest', self._produce_pyramid_score_dataset, self.df)
+        self._score_and_segment(df_grp)
+
+    def _merge_transactions(self, new_transactions: pd.DataFrame) -> pd.DataFrame:
+        new_state = aggregate_transactions(new_transactions, self.customer_id, self.transaction_date, self.amount)
+        self._customer_state = merge_states(self._customer_state, new_state)
+        return state_to_rfm_dataset(self._customer_state, self.customer_id)
+
+    def _score_and_segment(self, df_grp: pd.DataFrame):
+        df_grp = self._run_stage('score', self._calculate_pyramid_score, df_grp)
+        self.pyramid_score_table = self._run_stage('segment', self._assign_segments, df_grp)
+        self.segment_table = self._run_stage('distribution', self._get_segment_distribution, self.pyramid_score_table)
+
+    def _run_stage(self, stage: str, func, data):
+        return run_stage(self.instrumentation, type(self).__name__, stage, func, data)
 
     def _calculate_pyramid_score(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -80,37 +345,19 @@ class PyramidScoreAnalysis:
         pd.DataFrame
             DataFrame com os scores calculados e a classificação em faixas.
         """
+        if self.compact:
+            df = compact_rfm_dataset(df, self.customer_id)
+
         # Calcular o score total como uma soma ponderada das métricas (ajustável)
-        df['pyramid_score'] = df['recency'] * 0.15 + df['frequency'] * 0.28 + df['monetary_value'] * 0.57
-
-        # Ordenar os clientes pelo pyramid_score (quanto maior o score, mais valioso o cliente)
-        df = df.sort_values(by='pyramid_score', ascending=False).reset_index(drop=True)
-
-        # Definir os percentuais acumulados
-        total_customers = len(df)
-        percentiles = [0.005, 0.015, 0.03, 0.05, 0.10, 0.15, 0.20, 0.15, 0.10, 0.20]
-        cumulative_percentiles = np.cumsum([int(p * total_customers) for p in percentiles])
-
-        # Classificar os clientes nas faixas de valor com os rótulos definidos
-        conditions = [
-            (df.index < cumulative_percentiles[0]),
-            (df.index >= cumulative_percentiles[0]) & (df.index < cumulative_percentiles[1]),
-            (df.index >= cumulative_percentiles[1]) & (df.index < cumulative_percentiles[2]),
-            (df.index >= cumulative_percentiles[2]) & (df.index < cumulative_percentiles[3]),
-            (df.index >= cumulative_percentiles[3]) & (df.index < cumulative_percentiles[4]),
-            (df.index >= cumulative_percentiles[4]) & (df.index < cumulative_percentiles[5]),
-            (df.index >= cumulative_percentiles[5]) & (df.index < cumulative_percentiles[6]),
-            (df.index >= cumulative_percentiles[6]) & (df.index < cumulative_percentiles[7]),
-            (df.index >= cumulative_percentiles[7]) & (df.index < cumulative_percentiles[8]),
-            (df.index >= cumulative_percentiles[8])
-        ]
-
-        labels = [
-            'Platinum Tier', 'Gold Tier', 'Silver Tier', 'Bronze Tier', 'Prime Clients', 
-            'Core Clients', 'Entry-Level Clients', 'Low Contribution', 'Minimal Value', 'Residual Tier'
-        ]
-
-        df['segment'] = np.select(conditions, labels, default='Other')
+        recency_weight, frequency_weight, monetary_weight = self.weights
+        df['pyramid_score'] = df['recency'] * recency_weight + df['frequency'] * frequency_weight + df['monetary_value'] * monetary_weight
+
+        # Classificar os clientes nas faixas de valor (quanto maior o score, mais valioso o cliente)
+        codes = assign_tiers(df['pyramid_score'].to_numpy(), self.percentiles)
+        if self.compact:
+            df['segment'] = pd.Categorical.from_codes(codes, categories=list(TIER_LABELS))
+        else:
+            df['segment'] = np.array(TIER_LABELS, dtype=object)[codes]
 
         return df
 
@@ -144,12 +391,15 @@ class PyramidScoreAnalysis:
         pd.DataFrame
             DataFrame com a contagem de clientes por segmento.
         """
-        return df.groupby('segment').size().reset_index(name='no_of_customers')
+        return df.groupby('segment', observed=True).size().reset_index(name='no_of_customers')
 
     def find_customers(self, segment: str) -> pd.DataFrame:
         """
         Retorna os clientes pertencentes a um determinado segmento.
 
+        As posições de cada segmento são indexadas na primeira consulta e reaproveitadas
+        enquanto `pyramid_score_table` não for substituída.
+
         Parameters
         ----------
         segment : str
@@ -160,4 +410,30 @@ class PyramidScoreAnalysis:
         pd.DataFrame
             DataFrame com os clientes do segmento especificado.
         """
-        return self.pyramid_score_table[self.pyramid_score_table['segment'] == segment].reset_index(drop=True)
+        self._segment_index = cached_segment_index(self._segment_index, self.pyramid_score_table, 'segment')
+        return self._segment_index.find(segment)
+
+    def sweep(self, weights, percentiles=None, return_tiers: bool = False, batch_size: int = 64):
+        """
+        Avalia configurações alternativas de pesos e percentuais das faixas sobre a tabela atual,
+        sem refazer a agregação das transações. Ver `sweep_pyramid_tiers`.
+
+        Parameters
+        ----------
+        weights : array-like, shape (n_pesos, 3)
+            Pesos de recência, frequência e valor monetário de cada configuração.
+        percentiles : array-like, shape (n_esquemas, 10), optional
+            Percentuais das faixas de cada esquema. Por padrão, os percentuais da análise.
+        return_tiers : bool, optional
+            Se True, retorna também a faixa de cada cliente (na ordem de `pyramid_score_table`).
+        batch_size : int, optional
+            Quantidade de vetores de pesos por produto matricial.
+
+        Returns
+        -------
+        pd.DataFrame or tuple
+            Estatísticas por configuração e faixa (e as faixas, se `return_tiers`).
+        """
+        percentiles = [self.percentiles] if percentiles is None else percentiles
+        return sweep_pyramid_tiers(self.pyramid_score_table, weights, percentiles, labels=TIER_LABELS,
+                                   return_tiers=return_tiers, batch_size=batch_size)
@@ -1,10 +1,107 @@
 import pandas as pd
 import numpy as np
 import warnings
-import matplotlib.pyplot as plt
+from .streaming import aggregate_transactions, state_to_rfm_dataset
+from .parallel import parallel_rfm_state
+from .compact import compact_rfm_dataset, rfm_score_code
+from .instrumentation import run_stage
+from .columnar import ColumnarLoaderMixin
+from .segment_index import cached_segment_index
+from .cache import run_cached
 warnings.filterwarnings('ignore')
 
-class RFV:
+# (segment, r scores, f scores, m scores), evaluated in order: the first matching rule wins
+SEGMENT_RULES = [
+    ('Champions', (4,5), (4,5), (4,5)),
+    ('Promising', (4,5), (1,2), (3,4,5)),
+    ('Loyal Accounts', (3,4,5), (3,4,5), (3,4,5)),
+    ('Potential Loyalist', (3,4,5), (2,3), (2,3,4)),
+    ('New Active Accounts', (5,), (1,), (1,2,3,4,5)),
+    ('Low Spenders', (3,4,5), (1,2,3,4,5), (1,2)),
+    ('Need Attention', (2,3), (1,2), (4,5)),
+    ('About to Sleep', (2,3), (1,2), (1,2,3)),
+    ('At Risk', (1,2), (1,2,3,4,5), (3,4,5)),
+    ('Lost', (1,2), (1,2,3,4,5), (1,2)),
+]
+
+def build_segment_lookup(rules:list)->np.ndarray:
+    """
+    build_segment_lookup(rules)
+    |  compiles segment rules into a lookup table indexed by [r, f, m]
+    |  Parameters:
+    |  -----------
+    |  rules : list of (segment, r scores, f scores, m scores) tuples, first matching rule wins
+    |   Returns
+    |   -------
+    |       lookup : np.ndarray of shape (6, 6, 6), object dtype, NaN where no rule matches (index 0 is never matched)
+    """
+    lookup = np.full((6, 6, 6), np.nan, dtype=object)
+    matched = np.zeros((6, 6, 6), dtype=bool)
+    codes = np.arange(6)
+    for segment, r_scores, f_scores, m_scores in rules:
+        mask = (np.isin(codes, r_scores)[:, None, None]
+                & np.isin(codes, f_scores)[None, :, None]
+                & np.isin(codes, m_scores)[None, None, :])
+        mask[0, :, :] = mask[:, 0, :] = mask[:, :, 0] = False
+        lookup[mask & ~matched] = segment
+        matched |= mask
+    return lookup
+
+def render_rfm_score(r, f, m)->np.ndarray:
+    """
+    render_rfm_score(r, f, m)
+    |  concatenates r, f and m scores (each below 1000) into rfm_score strings,
+    |  formatting every distinct combination only once
+    |   Returns
+    |   -------
+    |       rfm_score : np.ndarray of str, object dtype
+    """
+    combined = (np.asarray(r, dtype=np.int64) * 1000 + np.asarray(f, dtype=np.int64)) * 1000 + np.asarray(m, dtype=np.int64)
+    codes, uniques = pd.factorize(combined)
+    labels = np.array([f'{u // 1000000}{u // 1000 % 1000}{u % 1000}' for u in uniques], dtype=object)
+    return labels[codes]
+
+def prepare_transactions(df:pd.DataFrame, customer_id:str, transaction_date:str, amount:str)->pd.DataFrame:
+    """
+    prepare_transactions(df, customer_id, transaction_date, amount)
+    |  vectorized preprocessing of raw transactions with the same rules as RFV.produce_rfm_dateset:
+    |  amount coerced to float (missing/invalid -> 0), transaction_date to datetime, rows without customer
+    |  dropped, duplicated rows dropped and customer ids normalized to strings ('123.0' -> '123')
+    |  Parameters:
+    |  -----------
+    |  df : pd.DataFrame object, containing raw transaction records of customers
+    |  customer_id, transaction_date, amount : str, column names
+    |   Returns
+    |   -------
+    |       DataFrame object, df is not modified
+    """
+    df = df.assign(**{
+        amount: pd.to_numeric(df[amount], errors='coerce').fillna(0).astype(float),
+        transaction_date: pd.to_datetime(df[transaction_date]),
+    })
+    df = df.dropna(subset=[customer_id])
+    df = df.drop_duplicates()
+    df[customer_id] = normalize_customer_ids(df[customer_id])
+    return df
+
+def normalize_customer_ids(values)->np.ndarray:
+    """
+    normalize_customer_ids(values)
+    |  same customer id normalization as produce_rfm_dateset ('123.0' -> '123', 1.0 -> '1'),
+    |  applied once per distinct id and gathered back
+    |  Parameters:
+    |  -----------
+    |  values : array-like, raw customer ids
+    |   Returns
+    |   -------
+    |       np.ndarray of str
+    """
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    ids = pd.Series(uniques).astype(str).str.strip()
+    ids = ids.where(~ids.str.contains('.0', regex=False), ids.str[:-2])
+    return ids.to_numpy(dtype=object)[codes]
+
+class RFV(ColumnarLoaderMixin):
     """
     Performs RFV analysis and customer segmentation on input dataset.
     Attributes:
@@ -17,19 +114,81 @@ class RFV:
     transaction_date : string, name of the column which represents trasaction date
     amount : string, column stating amount of transaction
     automated : bool, default=True, carries out operations automatically; pass False if you want to perform each operation manually
+    vectorized : bool, default=None, uses produce_rfm_dataset_vectorized for the ingest step instead of the per-cell produce_rfm_dateset.
+                 None means False when n_jobs is 1 and True otherwise. Its amount/id parsing can differ from produce_rfm_dateset,
+                 so vectorized=False with n_jobs other than 1 raises ValueError
+    segment_rules : list, default=None, (segment, r scores, f scores, m scores) rules used by find_segments; defaults to SEGMENT_RULES
+    n_jobs : int, default=1, number of processes for the ingest step; -1 uses all cores. Values other than 1 require the vectorized ingest,
+             with transactions hash-partitioned by normalized customer_id and aggregated per process before the global scoring steps,
+             so results do not depend on the number of processes
+    compact : bool, default=False, stores the rfm table with compact dtypes: categorical customer_id, int32 recency/frequency,
+              float32 monetary_value, int8 r/f/m, int16 rfm_score code (e.g. 543, see rfm_score_labels) and categorical segment
+    instrumentation : PipelineInstrumentation, default=None, records wall time, rows in/out and peak memory of each automated stage
+    cache : ResultCache, default=None, reads rfm_table/segment_table from the on-disk cache when the same transactions (all columns),
+            ingest mode and parameters were already analysed, and stores them otherwise
     """
-    def __init__(self, df:pd.DataFrame, customer_id:str, transaction_date:str, amount:str, automated=True):
+    _column_arguments = ('customer_id', 'transaction_date', 'amount')
+    _date_argument = 'transaction_date'
+    # the ingest drops duplicated rows over every column, so from_parquet/from_arrow read them all
+    _reads_all_columns = True
+    _result_table = 'rfm_table'
+    _segment_column = 'segment'
+
+    def __init__(self, df:pd.DataFrame, customer_id:str, transaction_date:str, amount:str, automated=True, vectorized=None, segment_rules=None, n_jobs=1, compact=False, instrumentation=None, cache=None):
         self.df = df
         self.customer_id = customer_id
         self.transaction_date = transaction_date
         self.amount = amount
+        if vectorized is False and n_jobs != 1:
+            raise ValueError("n_jobs other than 1 requires the vectorized ingest (vectorized=True or None).")
+        self.vectorized = n_jobs != 1 if vectorized is None else vectorized
+        self.n_jobs = n_jobs
+        self.compact = compact
+        self.instrumentation = instrumentation
+        self._segment_index = None
+        self.segment_rules = SEGMENT_RULES if segment_rules is None else segment_rules
+        self._segment_lookup = build_segment_lookup(self.segment_rules)
+        # segment names in rule order and the same lookup as category codes (-1 where no rule matches)
+        self._segment_categories = list(dict.fromkeys(rule[0] for rule in self.segment_rules))
+        self._segment_code_lookup = np.full(self._segment_lookup.shape, -1, dtype=np.int8)
+        for code, segment in enumerate(self._segment_categories):
+            self._segment_code_lookup[self._segment_lookup == segment] = code
         
         # automated operations
         if automated:
-            df_grp = self.produce_rfm_dateset(self.df)
-            df_grp = self.calculate_rfm_score(df_grp)
-            self.rfm_table = self.find_segments(df_grp)
-            self.segment_table = self.find_segment_df(self.rfm_table)
+            # both ingest modes drop duplicated rows over every column, so all columns enter the fingerprint
+            params = {'vectorized': self.vectorized, 'segment_rules': self.segment_rules, 'compact': compact}
+            run_cached(cache, self, params, ('rfm_table', 'segment_table'), self._run_automated, columns=list(df.columns))
+
+    def _run_automated(self):
+        ingest = self.produce_rfm_dataset_vectorized if self.vectorized else self.produce_rfm_dateset
+        pipeline = type(self).__name__
+        df_grp = run_stage(self.instrumentation, pipeline, 'ingest', ingest, self.df)
+        df_grp = run_stage(self.instrumentation, pipeline, 'score', self.calculate_rfm_score, df_grp)
+        self.rfm_table = run_stage(self.instrumentation, pipeline, 'segment', self.find_segments, df_grp)
+        self.segment_table = run_stage(self.instrumentation, pipeline, 'distribution', self.find_segment_df, self.rfm_table)
+
+    @classmethod
+    def from_rfm_dataset(cls, df_grp:pd.DataFrame, customer_id:str, segment_rules=None, compact=False)->'RFV':
+        """
+        from_rfm_dataset(df_grp, customer_id, segment_rules, compact)
+        |  builds the analysis from already aggregated rfm values (e.g. StreamingRFMAggregator.to_rfm_dataset),
+        |  running only the scoring and segmentation steps
+        |  Parameters:
+        |  -----------
+        |  df_grp : pd.DataFrame object, containing customer_id, recency, frequency and monetary_value columns
+        |  customer_id : str, name of the customer column
+        |  segment_rules : list, default=None, rules used by find_segments
+        |  compact : bool, default=False, stores the rfm table with compact dtypes
+        |   Returns
+        |   -------
+        |       RFV object with rfm_table and segment_table
+        """
+        rfv = cls(None, customer_id, None, None, automated=False, segment_rules=segment_rules, compact=compact)
+        df_grp = rfv.calculate_rfm_score(df_grp.copy())
+        rfv.rfm_table = rfv.find_segments(df_grp)
+        rfv.segment_table = rfv.find_segment_df(rfv.rfm_table)
+        return rfv
         
     def produce_rfm_dateset(self, df:pd.DataFrame)->pd.DataFrame:
         """
@@ -65,16 +224,68 @@ class RFV:
         df_grp['monetary_value'] = df_grp[self.amount].apply(sum)
         
         return df_grp[[self.customer_id, 'recency', 'frequency', 'monetary_value']]
+
+    def produce_rfm_dataset_vectorized(self, df:pd.DataFrame)->pd.DataFrame:
+        """
+        produce_rfm_dataset_vectorized(df)
+        |  Vectorized version of produce_rfm_dateset, returns the same customer_id, recency, frequency, monetary_value table.
+        |  amount and transaction_date are coerced to numeric/datetime dtypes and RFM values are found with
+        |  native groupby max/size/sum, no per-cell lambdas and no list aggregation. df is not modified.
+        |  with n_jobs other than 1, contiguous row ranges are aggregated in a process pool (see pyramid_score.parallel).
+        |  Parameters:
+        |  -----------
+        |  df : pd.DataFrame object, containing raw transaction records of customers
+        |   Returns
+        |   -------
+        |       DataFrame object
+        """
+        if self.n_jobs != 1:
+            state = parallel_rfm_state(df, self.customer_id, self.transaction_date, self.amount,
+                                       n_jobs=self.n_jobs, prepare=prepare_transactions)
+        else:
+            df = prepare_transactions(df, self.customer_id, self.transaction_date, self.amount)
+            state = aggregate_transactions(df, self.customer_id, self.transaction_date, self.amount)
+        return state_to_rfm_dataset(state, self.customer_id)
     
         # adding functionality for dynamic binning
+    def dynamic_bin_edges(self, df, column, n_bins=5):
+        """
+        dynamic_bin_edges(df, column, n_bins)
+        |  calculates dynamic bin edges for r,f,m values.
+        |  consumed by "calculate_dynamic_rfm_score" function internally.
+        |  we use dynamic cutoffs for binning customers
+        |  into rfm scores in a more sensible way
+        |  rather than using statc cutoffs:
+        |  the 1..100 percentiles of the column are walked from the lowest value,
+        |  each bin taking 1/n of the remaining percentiles (plus ties with its last one)
+        |  Parameters:
+        |  -----------
+        |  df : pd.DataFrame object
+        |  column : str, name of columns for binning
+        |  n_bins : int, no. of bins to perform
+        |   Returns
+        |   -------
+        |       edges : np.ndarray, ascending lower bounds of every bin but the lowest one
+        |       (fewer than n_bins - 1 edges when the column has too few distinct values)
+        """
+        if n_bins < 1:
+            raise ValueError("n_bins must be at least 1.")
+        percentiles = df[column].quantile(np.arange(1, 101) / 100).to_numpy()
+        edges = []
+        start = 0
+        for bins_left in range(n_bins, 1, -1):
+            cutoff = percentiles[start + int((len(percentiles) - start) / bins_left)]
+            start = np.searchsorted(percentiles, cutoff, side='right')
+            if start == len(percentiles):
+                break
+            edges.append(percentiles[start])
+        return np.array(edges, dtype=float)
+
     def dynamic_cutoffs(self, df, column, n_bins=5):
         """
         dynamic_cutoffs(df, column, n_bins)
-        |  calculates dynamic cutoffs for r,f,m values. 
-        |  consumed by "calculate_dynamic_rfm_score" function internally.
-        |  we use dynamic cutoffs for binning customers 
-        |  into rfm scores in a more sensible way 
-        |  rather than using statc cutoffs
+        |  kept for compatibility, calculate_dynamic_rfm_score uses dynamic_bin_edges/assign_bins.
+        |  calculates the [min, max] percentile values of every bin found by dynamic_bin_edges
         |  Parameters:
         |  -----------
         |  df : pd.DataFrame object
@@ -84,38 +295,15 @@ class RFV:
         |   -------
         |       rfm_cutoffs : dict
         """
-        dd = pd.DataFrame()
-        examples = 100
-        d = df[column].quantile([i/100 for i in range(1,101)]).to_dict()
-        d = pd.DataFrame({'%':d.keys(),column:d.values()})
-        while (n_bins > 1):
-            cutoff_percentile = d.iloc[int(examples/n_bins)][column]
-            mask = d[column] <= cutoff_percentile
-            d.loc[mask, 'bin_no'] = n_bins
-            new_index = d[d['bin_no'].isna()].index[0]
-            dd = pd.concat([dd,d[d['bin_no'].notna()]],axis=0).reset_index().drop('index',axis=1)
-            d = d.iloc[new_index:].reset_index().drop('index',axis=1)
-            examples = len(d)
-            n_bins = n_bins - 1
-            if n_bins == 1:
-                break
-        d['bin_no'] = n_bins
-        dd = pd.concat([dd,d[d['bin_no'].notna()]],axis=0).reset_index().drop('index',axis=1)
-        dd = dd.groupby('bin_no').agg(list).reset_index()
-        rfm_cutoffs = dict()
-        for bin_no in dd['bin_no']-1:
-            rfm_cutoffs[bin_no+1] = [min(dd[column][bin_no]),max(dd[column][bin_no])]
-        if column == 'recency':
-            return rfm_cutoffs
-        else:
-            rc = dict()
-            for k in range(1,len(rfm_cutoffs)+1):
-                rc[len(rfm_cutoffs)-k+1] = rfm_cutoffs[k]
-            return rc
+        percentiles = df[column].quantile(np.arange(1, 101) / 100).to_numpy()
+        bins = self.assign_bins(percentiles, self.dynamic_bin_edges(df, column, n_bins), column, n_bins)
+        return {int(bin_no): [percentiles[bins == bin_no].min(), percentiles[bins == bin_no].max()]
+                for bin_no in np.unique(bins)}
 
     def find_bin_no(self, x, col, cutoff):
         """
         find_bin_no(x, col, cutoff)
+        |  kept for compatibility, see assign_bins.
         |  function to apply on a column to find bin numbers of repective column values
         |  Parameters:
         |  -----------
@@ -133,7 +321,8 @@ class RFV:
     def adjust_cutoffs(self, df, cutoff, col):
         """
         adjust_cutoffs(df, cutoff, col)
-        |  function to adjust the threshold values of bins 
+        |  kept for compatibility, see dynamic_bin_edges.
+        |  function to adjust the threshold values of bins
         |  in an edge-to-edge fashion thus avoiding generation of any NA values
         |  Parameters:
         |  -----------
@@ -160,7 +349,26 @@ class RFV:
             cutoff[1][0] = df[col].min()
         return cutoff
 
-    def calculate_dynamic_rfm_score(self, df, n_bins):
+    def assign_bins(self, values, edges, column, n_bins=5):
+        """
+        assign_bins(values, edges, column, n_bins)
+        |  finds bin numbers of the respective column values with a binary search over the edges
+        |  Parameters:
+        |  -----------
+        |  values : array-like, column values
+        |  edges : np.ndarray, bin edges generated by dynamic_bin_edges
+        |  column : str, column name; recency bins are reversed (lowest recency gets n_bins)
+        |  n_bins : int, no. of bins used to generate the edges
+        |   Returns
+        |   -------
+        |       bins : np.ndarray of int, bin number for respective input
+        """
+        position = np.searchsorted(edges, np.asarray(values, dtype=float), side='right')
+        if column == 'recency':
+            return n_bins - position
+        return position + 1
+
+    def calculate_dynamic_rfm_score(self, df, n_bins=5):
         """
         calculate_dynamic_rfm_score(df, n_bins)
         |  dynamically calculate rfm scores (binning) and put into columns of master dataframe
@@ -172,14 +380,16 @@ class RFV:
         |   -------
         |       df : pd.DataFrame, with added rfm score columns: r, f, m, rfm
         """
-        recency_cutoffs = self.adjust_cutoffs(df, self.dynamic_cutoffs(df,'recency', n_bins),'recency')
-        frequency_cutoffs = self.adjust_cutoffs(df, self.dynamic_cutoffs(df,'frequency', n_bins),'frequency')
-        monetary_cutoffs = self.adjust_cutoffs(df, self.dynamic_cutoffs(df,'monetary_value', n_bins),'monetary_value')
-
-        df['r'] = df['recency'].apply(lambda x: int(self.find_bin_no(x, 'recency', recency_cutoffs)))
-        df['f'] = df['frequency'].apply(lambda x: self.find_bin_no(x, 'frequency', frequency_cutoffs))
-        df['m'] = df['monetary_value'].apply(lambda x: self.find_bin_no(x, 'monetary_value', monetary_cutoffs))
-        df['rfm_score'] = df['r'].apply(str) + df['f'].apply(str) + df['m'].apply(str)
+        if self.compact:
+            df = compact_rfm_dataset(df, self.customer_id)
+        for column, score in (('recency', 'r'), ('frequency', 'f'), ('monetary_value', 'm')):
+            edges = self.dynamic_bin_edges(df, column, n_bins)
+            df[score] = self.assign_bins(df[column], edges, column, n_bins)
+        if self.compact:
+            df[['r', 'f', 'm']] = df[['r', 'f', 'm']].astype(np.int8)
+            df['rfm_score'] = rfm_score_code(df['r'], df['f'], df['m'])
+        else:
+            df['rfm_score'] = render_rfm_score(df['r'], df['f'], df['m'])
         return df
 
 
@@ -194,10 +404,17 @@ class RFV:
         |  -------
         |  df : pd.DataFrame object
         """
-        df['r'] = pd.qcut(df['recency'].rank(method='first'),5,labels=[5,4,3,2,1]).tolist()
-        df['f'] = pd.qcut(df['frequency'].rank(method='first'),5,labels=[1,2,3,4,5]).tolist()
-        df['m'] = pd.qcut(df['monetary_value'].rank(method='first'),5,labels=[1,2,3,4,5]).tolist()
-        df['rfm_score'] = df['r'].apply(str) + df['f'].apply(str) + df['m'].apply(str)
+        if self.compact:
+            df = compact_rfm_dataset(df, self.customer_id)
+            df['r'] = (5 - pd.qcut(df['recency'].rank(method='first'),5,labels=False)).astype(np.int8)
+            df['f'] = (pd.qcut(df['frequency'].rank(method='first'),5,labels=False) + 1).astype(np.int8)
+            df['m'] = (pd.qcut(df['monetary_value'].rank(method='first'),5,labels=False) + 1).astype(np.int8)
+            df['rfm_score'] = rfm_score_code(df['r'], df['f'], df['m'])
+        else:
+            df['r'] = pd.qcut(df['recency'].rank(method='first'),5,labels=[5,4,3,2,1]).tolist()
+            df['f'] = pd.qcut(df['frequency'].rank(method='first'),5,labels=[1,2,3,4,5]).tolist()
+            df['m'] = pd.qcut(df['monetary_value'].rank(method='first'),5,labels=[1,2,3,4,5]).tolist()
+            df['rfm_score'] = df['r'].apply(str) + df['f'].apply(str) + df['m'].apply(str)
         df = df.sort_values(by='rfm_score',ascending=False).reset_index(drop=True)
         return df
         
@@ -205,6 +422,7 @@ class RFV:
         """
         find_segments(df)
         |  finds customer segments based on the rfm scores
+        |  segments are gathered from the lookup table compiled from segment_rules, combinations without a rule get NaN
         |  Parameters:
         |  -----------
         |  df : pd.DataFrame object, containing r,f,m scores columns
@@ -212,39 +430,16 @@ class RFV:
         |  -------
         |  df : pd.DataFrame object
         """
-        classes = []
-        classes_append = classes.append
-        cust = self.customer_id
-        for row in df.iterrows():
-            rec = row[1]
-            r = rec['r']
-            f = rec['f']
-            m = rec['m']
-            if (r in (4,5)) & (f in (4,5)) & (m in (4,5)):
-                classes_append({rec[cust]:'Champions'})
-            elif (r in (4,5)) & (f in (1,2)) & (m in (3,4,5)):
-                classes_append({rec[cust]:'Promising'})
-            elif (r in (3,4,5)) & (f in (3,4,5)) & (m in (3,4,5)):
-                classes_append({rec[cust]:'Loyal Accounts'})
-            elif (r in (3,4,5)) & (f in (2,3)) & (m in (2,3,4)):
-                classes_append({rec[cust]:'Potential Loyalist'})
-            elif (r in (5,)) & (f in (1,)) & (m in (1,2,3,4,5)):
-                classes_append({rec[cust]:'New Active Accounts'})
-            elif (r in (3,4,5)) & (f in (1,2,3,4,5)) & (m in (1,2)):
-                classes_append({rec[cust]:'Low Spenders'})
-            elif (r in (2,3)) & (f in (1,2)) & (m in (4,5)):
-                classes_append({rec[cust]:'Need Attention'})
-            elif (r in (2,3)) & (f in (1,2)) & (m in (1,2,3)):
-                classes_append({rec[cust]:"About to Sleep"})
-            elif (r in (1,2)) & (f in (1,2,3,4,5)) & (m in (3,4,5)):
-                classes_append({rec[cust]:'At Risk'})
-            elif (r in (1,2)) & (f in (1,2,3,4,5)) & (m in (1,2)):
-                classes_append({rec[cust]:"Lost"})
-            else:
-                classes.append({0:[row[1]['r'],row[1]['f'],row[1]['m']]})
-        accs = [list(i.keys())[0] for i in classes]
-        segments = [list(i.values())[0] for i in classes]
-        df['segment'] = df[self.customer_id].map(dict(zip(accs,segments)))
+        r = pd.to_numeric(df['r'], errors='coerce').fillna(0).to_numpy(dtype=np.int64)
+        f = pd.to_numeric(df['f'], errors='coerce').fillna(0).to_numpy(dtype=np.int64)
+        m = pd.to_numeric(df['m'], errors='coerce').fillna(0).to_numpy(dtype=np.int64)
+        # codes outside 1..5 have no rule and are sent to the 0 slot, which is always NaN
+        valid = (r >= 1) & (r <= 5) & (f >= 1) & (f <= 5) & (m >= 1) & (m <= 5)
+        r, f, m = np.where(valid, r, 0), np.where(valid, f, 0), np.where(valid, m, 0)
+        if self.compact:
+            df['segment'] = pd.Categorical.from_codes(self._segment_code_lookup[r, f, m], categories=self._segment_categories)
+        else:
+            df['segment'] = self._segment_lookup[r, f, m]
         return df
     
     def find_segment_df(self, df:pd.DataFrame)->pd.DataFrame:
@@ -256,8 +451,17 @@ class RFV:
         |  df : pd.DataFrame, rfm_table, result from find_segments function
         |  Returns segment distribution dataframe
         """
-        segment_df = df[['segment',self.customer_id]].groupby('segment',sort=False).count().reset_index().rename({self.customer_id:'no of customers'},axis=1)
+        segment_df = df[['segment',self.customer_id]].groupby('segment',sort=False,observed=True).count().reset_index().rename({self.customer_id:'no of customers'},axis=1)
         return segment_df
+
+    def rfm_score_labels(self)->pd.Series:
+        """
+        rfm_score_labels()
+        |  renders the rfm_score of rfm_table as text (e.g. '543'), useful in compact mode where rfm_score is an integer code
+        |  Returns Series of str aligned with rfm_table
+        """
+        return pd.Series(render_rfm_score(self.rfm_table['r'], self.rfm_table['f'], self.rfm_table['m']),
+                         index=self.rfm_table.index, name='rfm_score')
     
     def find_customers(self, segment:str)->pd.DataFrame:
         """
@@ -267,5 +471,7 @@ class RFV:
         |  ----------
         |  segment : str, one of the 10 categories : ['Champions', 'Loyal Accounts', 'Low Spenders', 'Potential Loyalist', 'Promising', 'New Active Accounts', 'Need Attention', 'About to Sleep', 'At Risk', 'Lost']
         |  Returns dataframe of customers with specified segment
+        |  Segment row positions are indexed on the first call and reused until rfm_table is replaced
         """
-        return self.rfm_table[self.rfm_table['segment'] == segment].reset_index(drop=True)
\ No newline at end of file
+        self._segment_index = cached_segment_index(self._segment_index, self.rfm_table, 'segment')
+        return self._segment_index.find(segment)
\ No newline at end of file
@@ -1,22 +1,111 @@
 import pandas as pd
 import numpy as np
 import warnings
-import matplotlib.pyplot as plt
+from .rfv import prepare_transactions
+from .streaming import aggregate_transactions, state_to_rfm_dataset
+from .parallel import parallel_rfm_state
+from .compact import compact_rfm_dataset
+from .instrumentation import run_stage
+from .columnar import ColumnarLoaderMixin
+from .segment_index import cached_segment_index
+from .sketches import KLLSketch
+from .cache import run_cached
 warnings.filterwarnings('ignore')
 
-class RFV10:
-    def __init__(self, df, customer_id, transaction_date, amount, automated=True):
+
+def decile_codes(values, labels=False):
+    """
+    decile_codes(values, labels)
+    |  pd.qcut into 10 deciles; when repeated values make decile edges collide (qcut raises ValueError),
+    |  values are ranked first (ties broken by position) so every decile stays well defined.
+    |  Data with distinct decile edges gets exactly the plain qcut result.
+    """
+    try:
+        return pd.qcut(values, 10, labels=labels)
+    except ValueError:
+        return pd.qcut(values.rank(method='first'), 10, labels=labels)
+
+
+class RFV10(ColumnarLoaderMixin):
+    _column_arguments = ('customer_id', 'transaction_date', 'amount')
+    _date_argument = 'transaction_date'
+    # the ingest drops duplicated rows over every column, so from_parquet/from_arrow read them all
+    _reads_all_columns = True
+    _result_table = 'rfv_table'
+    _segment_column = 'class'
+
+    def __init__(self, df, customer_id, transaction_date, amount, automated=True, n_jobs=1, compact=False, instrumentation=None,
+                 approximate=False, epsilon=0.01, sketches=None, cache=None, vectorized=None):
         self.df = df
         self.customer_id = customer_id
         self.transaction_date = transaction_date
         self.amount = amount
+        # vectorized=True: same preprocessing as RFV.produce_rfm_dataset_vectorized (prepare_transactions), whose amount/id
+        # parsing can differ from produce_rfv_dataset; None means True only when n_jobs != 1, which requires it
+        if vectorized is False and n_jobs != 1:
+            raise ValueError("n_jobs other than 1 requires the vectorized ingest (vectorized=True or None).")
+        self.vectorized = n_jobs != 1 if vectorized is None else vectorized
+        self.n_jobs = n_jobs
+        # compact=True: categorical customer_id, int32 recency/frequency, float32 monetary_value/composite_score, int8 scores
+        self.compact = compact
+        # instrumentation: PipelineInstrumentation recording time, rows and peak memory of each automated stage
+        self.instrumentation = instrumentation
+        # approximate=True: r/f/v deciles from mergeable KLL sketches (rank error ~ epsilon) instead of exact qcut;
+        # sketches: optional {'recency', 'frequency', 'monetary_value'} -> KLLSketch built elsewhere (chunks, workers)
+        self.approximate = approximate
+        self.epsilon = epsilon
+        # sketches built from the data are rebuilt on every scoring run, so a reused instance never scores with stale ones
+        self._provided_sketches = dict(sketches or {})
+        self.sketches = dict(self._provided_sketches)
+        self._segment_index = None
         
         if automated:
-            df_grp = self.produce_rfv_dataset(df)
-            df_grp = self.calculate_rfv_score_percentiles(df_grp)
-            self.rfv_table = self.assign_uniform_class(df_grp)
+            # cache: ResultCache reading/storing rfv_table per transactions fingerprint (all columns, since the ingest
+            # drops duplicated rows over every column), ingest mode and parameters
+            # (bypassed when prebuilt sketches are given, since they are not part of the fingerprint)
+            params = {'compact': compact, 'approximate': approximate, 'epsilon': epsilon, 'vectorized': self.vectorized}
+            run_cached(None if self.sketches else cache, self, params, ('rfv_table',), self._run_automated,
+                       columns=list(df.columns))
+
+    def _run_automated(self):
+        pipeline = type(self).__name__
+        df_grp = run_stage(self.instrumentation, pipeline, 'ingest', self.produce_rfv_dataset, self.df)
+        df_grp = run_stage(self.instrumentation, pipeline, 'score', self.calculate_rfv_score_percentiles, df_grp)
+        self.rfv_table = run_stage(self.instrumentation, pipeline, 'segment', self.assign_uniform_class, df_grp)
+
+    @classmethod
+    def from_rfm_dataset(cls, df_grp, customer_id, compact=False, approximate=False, epsilon=0.01, sketches=None):
+        """
+        from_rfm_dataset(df_grp, customer_id, compact, approximate, epsilon, sketches)
+        |  builds the analysis from already aggregated rfm values (e.g. StreamingRFMAggregator.to_rfm_dataset),
+        |  running only the scoring and classification steps
+        |  Parameters:
+        |  -----------
+        |  df_grp : pd.DataFrame object, containing customer_id, recency, frequency and monetary_value columns
+        |  customer_id : str, name of the customer column
+        |  compact : bool, default=False, stores the rfv table with compact dtypes
+        |  approximate : bool, default=False, computes the r/f/v deciles from KLL sketches
+        |  epsilon : float, default=0.01, normalized rank error of the sketches
+        |  sketches : dict, optional, prebuilt (e.g. merged per worker) sketches per rfm column
+        |  Returns RFV10 object with rfv_table
+        """
+        rfv10 = cls(None, customer_id, None, None, automated=False, compact=compact,
+                    approximate=approximate, epsilon=epsilon, sketches=sketches)
+        df_grp = rfv10.calculate_rfv_score_percentiles(df_grp.copy())
+        rfv10.rfv_table = rfv10.assign_uniform_class(df_grp)
+        return rfv10
 
     def produce_rfv_dataset(self, df):
+        # vectorized: preprocessing with the same rules as RFV and per-customer aggregation, in a process pool when n_jobs != 1
+        if self.vectorized:
+            if self.n_jobs != 1:
+                state = parallel_rfm_state(df, self.customer_id, self.transaction_date, self.amount, n_jobs=self.n_jobs,
+                                           prepare=prepare_transactions)
+            else:
+                df = prepare_transactions(df, self.customer_id, self.transaction_date, self.amount)
+                state = aggregate_transactions(df, self.customer_id, self.transaction_date, self.amount)
+            return state_to_rfm_dataset(state, self.customer_id)
+
         df = df.copy()
         for col in df.columns:
             if col != self.customer_id and df[col].dtype == 'float64':
@@ -38,9 +127,51 @@ class RFV10:
         return df_grp
     
     def calculate_rfv_score_percentiles(self, df):
-        df['r_score'] = pd.qcut(df['recency'], 10, labels=range(10, 0, -1))
-        df['f_score'] = pd.qcut(df['frequency'], 10, labels=range(1, 11))
-        df['v_score'] = pd.qcut(df['monetary_value'], 10, labels=range(1, 11))
+        if self.compact:
+            df = compact_rfm_dataset(df, self.customer_id)
+        if self.approximate:
+            return self.calculate_rfv_score_sketches(df)
+        if self.compact:
+            df['r_score'] = (10 - decile_codes(df['recency'])).astype(np.int8)
+            df['f_score'] = (decile_codes(df['frequency']) + 1).astype(np.int8)
+            df['v_score'] = (decile_codes(df['monetary_value']) + 1).astype(np.int8)
+            return df
+        df['r_score'] = decile_codes(df['recency'], labels=range(10, 0, -1))
+        df['f_score'] = decile_codes(df['frequency'], labels=range(1, 11))
+        df['v_score'] = decile_codes(df['monetary_value'], labels=range(1, 11))
+        return df
+
+    def decile_sketch(self, column, values, chunk_size=1_000_000):
+        """
+        decile_sketch(column, values, chunk_size)
+        |  returns the KLL sketch of an rfm column, reusing self.sketches[column] when provided
+        |  (or already built in the current scoring run) and otherwise building it from values in chunks of chunk_size
+        """
+        if column not in self.sketches:
+            self.sketches[column] = KLLSketch.from_array(values, self.epsilon, chunk_size=chunk_size, seed=0)
+        return self.sketches[column]
+
+    def calculate_rfv_score_sketches(self, df):
+        """
+        calculate_rfv_score_sketches(df)
+        |  approximate r/f/v deciles: the 9 decile edges of each column come from a KLL sketch
+        |  and each customer is placed with searchsorted (bins closed on the right, as in qcut).
+        |  Tied values always share a score, so decile sizes are approximately (not exactly) equal.
+        |  Sketches not given in the constructor are rebuilt from df on every call.
+        |  Returns df with r_score, f_score and v_score columns
+        """
+        self.sketches = dict(self._provided_sketches)
+        for column, score, descending in (('recency', 'r_score', True), ('frequency', 'f_score', False),
+                                          ('monetary_value', 'v_score', False)):
+            values = df[column].to_numpy(dtype=float)
+            edges = self.decile_sketch(column, values).quantiles(np.arange(1, 10) / 10)
+            bins = np.searchsorted(edges, values, side='left')
+            scores = 10 - bins if descending else bins + 1
+            if self.compact:
+                df[score] = scores.astype(np.int8)
+            else:
+                categories = range(10, 0, -1) if descending else range(1, 11)
+                df[score] = pd.Categorical(scores, categories=categories, ordered=True)
         return df
 
     def assign_uniform_class(self, df):
@@ -56,7 +187,9 @@ class RFV10:
                         'classe 9': 'At Risk',
                         'classe 10': 'Potential Lost'}
         df['composite_score'] = (df['r_score'].astype(int) + df['f_score'].astype(int) + df['v_score'].astype(int))/3
-        df['class'] = pd.qcut(df['composite_score'], 10, labels=[f'classe {i}' for i in range(1, 11)])
+        if self.compact:
+            df['composite_score'] = df['composite_score'].astype(np.float32)
+        df['class'] = decile_codes(df['composite_score'], labels=[f'classe {i}' for i in range(1, 11)])
         df['class'] = df['class'].map(class_name)
         return df
 
@@ -68,5 +201,7 @@ class RFV10:
         |  ----------
         |  classe : str, one of the 10 categories : ['Potential Champions', 'Loyal Accounts', 'Low Spenders', 'Potential', 'Promising', 'Standard Client', 'Need Attention', 'About to Sleep', 'At Risk', 'Potential Lost']
         |  Returns dataframe of customers with specified classe
+        |  Class row positions are indexed on the first call and reused until rfv_table is replaced
         """
-        return self.rfv_table[self.rfv_table['class'] == classe].reset_index(drop=True)
\ No newline at end of file
+        self._segment_index = cached_segment_index(self._segment_index, self.rfv_table, 'class')
+        return self._segment_index.find(classe)
\ No newline at end of file
@@ -0,0 +1,60 @@
+# pyramid_score/segment_index.py
+
+import numpy as np
+import pandas as pd
+
+
+class SegmentIndex:
+    """
+    Índice das posições de linha de cada segmento de uma tabela de resultados, construído em uma
+    única passagem. Consultas devolvem as linhas do segmento sem percorrer a tabela inteira.
+
+    Parameters
+    ----------
+    table : pd.DataFrame
+        Tabela de resultados (ex.: `pyramid_score_table`, `rfm_table`, `rfv_table`).
+    column : str
+        Nome da coluna de segmentos.
+
+    Attributes
+    ----------
+    table : pd.DataFrame
+        A tabela indexada. O índice vale enquanto a tabela não for alterada in-place.
+
+    Methods
+    -------
+    find(segment)
+        Retorna as linhas do segmento, na ordem da tabela.
+    """
+
+    def __init__(self, table: pd.DataFrame, column: str):
+        self.table = table
+        self.column = column
+        self._positions = table.groupby(column, observed=True, sort=False).indices
+
+    def find(self, segment) -> pd.DataFrame:
+        """
+        Retorna as linhas do segmento, na ordem da tabela e com o índice reiniciado.
+
+        Parameters
+        ----------
+        segment : str
+            O nome do segmento.
+
+        Returns
+        -------
+        pd.DataFrame
+            Linhas do segmento (vazio se o segmento não existir).
+        """
+        positions = self._positions.get(segment, np.empty(0, dtype=np.intp))
+        return self.table.iloc[positions].reset_index(drop=True)
+
+
+def cached_segment_index(index: SegmentIndex, table: pd.DataFrame, column: str) -> SegmentIndex:
+    """
+    Retorna `index` se ele foi construído sobre `table`; senão constrói um novo índice
+    (ex.: depois de `update` ou de recalcular a tabela).
+    """
+    if index is None or index.table is not table:
+        return SegmentIndex(table, column)
+    return index
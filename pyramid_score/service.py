@@ -0,0 +1,412 @@
+# pyramid_score/service.py
+
+import asyncio
+import json
+import math
+from urllib.parse import unquote
+
+import numpy as np
+import pandas as pd
+from .migration import _segment_table
+
+
+def _json_value(value):
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return None if math.isnan(value) else float(value)
+    return value
+
+
+class CustomerSnapshot:
+    """
+    Resultados pré-calculados por cliente, indexados por hash (dicionário pelo ID do cliente em texto),
+    para consultas O(1) do `ScoringService`.
+
+    Parameters
+    ----------
+    records : dict
+        Campos pré-calculados de cada cliente ({id: {campo: valor}}).
+    churn : ChurnPrediction, optional
+        Modelo de churn treinado, usado para as probabilidades.
+    churn_features : pd.DataFrame, optional
+        Variáveis preditoras de cada cliente, indexadas pelo ID do cliente.
+    version : str, optional
+        Identificação da versão do snapshot (retornada nas respostas).
+
+    Methods
+    -------
+    build(customer_id, ...)
+        Monta o snapshot a partir das análises.
+    lookup(customer)
+        Retorna os campos pré-calculados de um cliente, ou None.
+    features(customer)
+        Retorna as variáveis preditoras de churn de um cliente, ou None.
+    """
+
+    def __init__(self, records: dict, churn=None, churn_features: pd.DataFrame = None, version: str = None):
+        self.records = records
+        self.churn = churn
+        self.version = version
+        self._features = None
+        self._feature_positions = {}
+        if churn is not None and churn_features is not None:
+            self._features = churn_features[churn.features].to_numpy(dtype=float)
+            self._feature_positions = {str(customer): position for position, customer in enumerate(churn_features.index)}
+
+    @classmethod
+    def build(cls, customer_id: str, segments=None, tiers=None, corridors=None, elasticities=None, churn=None,
+              churn_features: pd.DataFrame = None, version: str = None) -> 'CustomerSnapshot':
+        """
+        Monta o snapshot a partir das análises já calculadas.
+
+        Parameters
+        ----------
+        customer_id : str
+            Nome da coluna que identifica os clientes nas tabelas de resultado.
+        segments : RFV, RFV10 or pd.DataFrame, optional
+            Análise (ou tabela com a coluna 'segment') que fornece o campo 'segment'.
+        tiers : PyramidScoreAnalysis or pd.DataFrame, optional
+            Análise (ou tabela com a coluna 'segment') que fornece os campos 'tier' e 'pyramid_score'.
+        corridors : PriceCorridor, optional
+            Fornece os campos 'min_price' e 'max_price'.
+        elasticities : PriceElasticity, optional
+            Fornece o campo 'elasticity'.
+        churn : ChurnPrediction, optional
+            Modelo treinado, usado para o campo 'churn_probability'.
+        churn_features : pd.DataFrame, optional
+            Variáveis preditoras por cliente (coluna customer_id e as colunas de `churn.features`).
+        version : str, optional
+            Identificação da versão do snapshot.
+
+        Returns
+        -------
+        CustomerSnapshot
+        """
+        columns = {}
+        if segments is not None:
+            table, column = _segment_table(segments, None)
+            columns['segment'] = table.set_index(table[customer_id].astype(str))[column].astype(object)
+        if tiers is not None:
+            table, column = _segment_table(tiers, None)
+            table = table.set_index(table[customer_id].astype(str))
+            columns['tier'] = table[column].astype(object)
+            if 'pyramid_score' in table:
+                columns['pyramid_score'] = table['pyramid_score'].astype(float)
+        if corridors is not None:
+            table = corridors.get_all_corridors()
+            table = table.set_axis(table.index.astype(str))
+            columns['min_price'], columns['max_price'] = table['min_price'], table['max_price']
+        if elasticities is not None:
+            elasticity = elasticities.calculate_all_elasticities()
+            columns['elasticity'] = elasticity.set_axis(elasticity.index.astype(str))
+
+        records = {}
+        if columns:
+            frame = pd.concat(columns, axis=1)
+            frame = frame.astype(object).where(frame.notna(), None)
+            records = frame.to_dict('index')
+
+        if churn_features is not None:
+            churn_features = churn_features.set_index(churn_features[customer_id].astype(str))
+            for customer in churn_features.index.difference(pd.Index(list(records), dtype=object)):
+                records[customer] = {}
+        return cls(records, churn, churn_features, version)
+
+    def lookup(self, customer: str) -> dict:
+        """
+        Retorna os campos pré-calculados de um cliente, ou None se o cliente não existir.
+        """
+        return self.records.get(customer)
+
+    def features(self, customer: str) -> np.ndarray:
+        """
+        Retorna as variáveis preditoras de churn de um cliente, ou None.
+        """
+        position = self._feature_positions.get(customer)
+        return None if position is None else self._features[position]
+
+
+class ChurnBatcher:
+    """
+    Agrupa as previsões de churn de requisições concorrentes em uma única chamada ao modelo.
+
+    Cada requisição coloca sua linha de variáveis na fila e aguarda; a tarefa de lote espera até
+    `max_delay` segundos (ou até `max_batch` linhas) e avalia todas as linhas pendentes de uma vez,
+    em uma thread do executor padrão, para não bloquear o loop de eventos. Depois de `close`, as
+    linhas já enfileiradas ainda são avaliadas e novas linhas são recusadas.
+
+    Parameters
+    ----------
+    churn : ChurnPrediction
+        Modelo de churn treinado.
+    max_batch : int, optional
+        Quantidade máxima de linhas por chamada ao modelo (padrão 256).
+    max_delay : float, optional
+        Espera máxima, em segundos, para completar um lote (padrão 0.001).
+    """
+
+    def __init__(self, churn, max_batch: int = 256, max_delay: float = 0.001):
+        self.churn = churn
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.batches = 0
+        self.closed = False
+        self._queue = None
+        self._task = None
+
+    def submit(self, row: np.ndarray) -> asyncio.Future:
+        """
+        Enfileira uma linha de variáveis imediatamente (sem ceder o loop) e retorna o future com a
+        probabilidade de churn. Levanta RuntimeError se o batcher já foi encerrado.
+        """
+        if self.closed:
+            raise RuntimeError("O ChurnBatcher foi encerrado.")
+        loop = asyncio.get_running_loop()
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+        future = loop.create_future()
+        self._queue.put_nowait((row, future))
+        return future
+
+    async def predict(self, row: np.ndarray) -> float:
+        """
+        Retorna a probabilidade de churn de uma linha de variáveis, avaliada em lote.
+        """
+        return await self.submit(row)
+
+    async def _run(self):
+        closing = False
+        while not closing:
+            item = await self._queue.get()
+            batch = []
+            if item is None:
+                closing = True
+            else:
+                await asyncio.sleep(self.max_delay)
+                batch.append(item)
+            # Completa o lote; depois do sentinela de `close`, esvazia a fila inteira
+            while (closing or len(batch) < self.max_batch) and not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is None:
+                    closing = True
+                else:
+                    batch.append(item)
+            for start in range(0, len(batch), self.max_batch):
+                await self._evaluate(batch[start:start + self.max_batch])
+
+    async def _evaluate(self, batch: list):
+        rows, futures = zip(*batch)
+        try:
+            X = pd.DataFrame(np.vstack(rows), columns=self.churn.features)
+            predictions = await asyncio.get_running_loop().run_in_executor(None, self.churn.predict_churn_many, X)
+            probabilities = predictions.to_numpy()
+        except Exception as exc:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        self.batches += 1
+        for future, probability in zip(futures, probabilities):
+            if not future.done():
+                future.set_result(float(probability))
+
+    async def close(self):
+        """
+        Encerra a tarefa de lote depois de avaliar as linhas já enfileiradas; novas linhas são recusadas.
+        """
+        self.closed = True
+        if self._task is not None:
+            self._queue.put_nowait(None)
+            await self._task
+            self._task = None
+
+
+class ScoringService:
+    """
+    Serviço HTTP local (asyncio, sem dependências externas) que responde por cliente o segmento,
+    a faixa, o corredor de preços, a elasticidade e a probabilidade de churn a partir de um
+    `CustomerSnapshot` em memória.
+
+    Rotas
+    -----
+    GET /health
+        Estado do serviço e versão do snapshot.
+    GET /customers/<id>
+        Campos pré-calculados do cliente e 'churn_probability' (se houver modelo e variáveis).
+    POST /churn
+        Corpo {"features": {variável: valor}} ou {"features": [{...}, ...]}; retorna as probabilidades.
+
+    As probabilidades de churn de requisições concorrentes são avaliadas em lote (`ChurnBatcher`).
+    `swap` troca o snapshot sem interromper o serviço: requisições em andamento terminam com o
+    snapshot antigo e as novas usam o novo.
+
+    Parameters
+    ----------
+    snapshot : CustomerSnapshot
+        Snapshot inicial.
+    host : str, optional
+        Endereço de escuta (padrão '127.0.0.1').
+    port : int, optional
+        Porta (padrão 0, escolhida pelo sistema; veja `port` depois de `start`).
+    max_batch, max_delay : optional
+        Parâmetros do `ChurnBatcher`.
+    max_body : int, optional
+        Tamanho máximo do corpo das requisições em bytes (padrão 1 MiB); corpos maiores recebem 413.
+
+    Requisições malformadas recebem 400 e erros ao responder (ex.: do modelo de churn) recebem 500;
+    nos dois casos a conexão é encerrada depois da resposta.
+    """
+
+    def __init__(self, snapshot: CustomerSnapshot, host: str = '127.0.0.1', port: int = 0,
+                 max_batch: int = 256, max_delay: float = 0.001, max_body: int = 2 ** 20):
+        self.host = host
+        self.port = port
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_body = max_body
+        self._server = None
+        self._state = self._make_state(snapshot)
+
+    def _make_state(self, snapshot: CustomerSnapshot):
+        batcher = ChurnBatcher(snapshot.churn, self.max_batch, self.max_delay) if snapshot.churn is not None else None
+        return snapshot, batcher
+
+    @property
+    def snapshot(self) -> CustomerSnapshot:
+        return self._state[0]
+
+    @property
+    def churn_batches(self) -> int:
+        """Quantidade de lotes de churn avaliados com o snapshot atual."""
+        _, batcher = self._state
+        return 0 if batcher is None else batcher.batches
+
+    async def swap(self, snapshot: CustomerSnapshot):
+        """
+        Substitui o snapshot em uso. A troca é uma única atribuição; o lote de churn do snapshot
+        antigo é encerrado depois de responder as previsões pendentes.
+        """
+        _, old_batcher = self._state
+        self._state = self._make_state(snapshot)
+        if old_batcher is not None:
+            await old_batcher.close()
+
+    async def start(self):
+        """
+        Inicia o servidor e define `port` com a porta em uso.
+        """
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        """
+        Encerra o servidor e as tarefas de lote.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        _, batcher = self._state
+        if batcher is not None:
+            await batcher.close()
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    def run(self):
+        """
+        Executa o serviço até ser interrompido (bloqueante).
+        """
+        asyncio.run(self.serve_forever())
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                headers = {}
+                try:
+                    # Linhas acima do limite do StreamReader levantam ValueError (LimitOverrunError)
+                    request_line = await reader.readline()
+                    if not request_line.strip():
+                        break
+                    method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                    while True:
+                        line = await reader.readline()
+                        if line in (b'\r\n', b'\n', b''):
+                            break
+                        name, _, value = line.decode('latin-1').partition(':')
+                        headers[name.strip().lower()] = value.strip()
+                    length = int(headers.get('content-length', 0))
+                    if length < 0:
+                        raise ValueError(f'content-length negativo: {length}')
+                except ValueError as exc:
+                    await self._respond(writer, '400 Bad Request', {'error': f'requisição inválida: {exc}'}, False)
+                    break
+                if length > self.max_body:
+                    await self._respond(writer, '413 Payload Too Large', {'error': f'corpo maior que {self.max_body} bytes'}, False)
+                    break
+                body = await reader.readexactly(length)
+
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                try:
+                    status, payload = await self._dispatch(method, target, body)
+                except Exception as exc:
+                    status, payload, keep_alive = '500 Internal Server Error', {'error': f'erro interno: {exc}'}, False
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: str, payload: dict, keep_alive: bool):
+        data = json.dumps(payload).encode()
+        writer.write(f'HTTP/1.1 {status}\r\nContent-Type: application/json\r\nContent-Length: {len(data)}\r\n'
+                     f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n'.encode() + data)
+        await writer.drain()
+
+    async def _dispatch(self, method: str, target: str, body: bytes):
+        snapshot, batcher = self._state
+        path = target.split('?', 1)[0]
+        if method == 'GET' and path == '/health':
+            return '200 OK', {'status': 'ok', 'version': snapshot.version, 'customers': len(snapshot.records)}
+        if method == 'GET' and path.startswith('/customers/'):
+            return await self._customer(snapshot, batcher, unquote(path[len('/customers/'):]))
+        if method == 'POST' and path == '/churn':
+            return await self._churn(snapshot, batcher, body)
+        return '404 Not Found', {'error': 'rota não encontrada'}
+
+    async def _customer(self, snapshot: CustomerSnapshot, batcher: ChurnBatcher, customer: str):
+        record = snapshot.lookup(customer)
+        if record is None:
+            return '404 Not Found', {'error': 'cliente não encontrado', 'customer_id': customer}
+
+        response = {'customer_id': customer, 'version': snapshot.version}
+        response.update((name, _json_value(value)) for name, value in record.items())
+        row = snapshot.features(customer)
+        if batcher is not None and row is not None:
+            response['churn_probability'] = await batcher.predict(row)
+        return '200 OK', response
+
+    async def _churn(self, snapshot: CustomerSnapshot, batcher: ChurnBatcher, body: bytes):
+        if batcher is None:
+            return '404 Not Found', {'error': 'nenhum modelo de churn carregado'}
+        try:
+            features = json.loads(body or b'{}')['features']
+            many = isinstance(features, list)
+            rows = [np.array([float(item[name]) for name in snapshot.churn.features]) for item in (features if many else [features])]
+        except (ValueError, KeyError, TypeError) as exc:
+            return '400 Bad Request', {'error': f'corpo inválido: {exc}'}
+
+        # Todas as linhas entram na fila antes do primeiro await, de modo que um `swap` concorrente
+        # (que encerra este batcher) ainda as avalia
+        probabilities = await asyncio.gather(*[batcher.submit(row) for row in rows])
+        return '200 OK', {'churn_probability': list(probabilities) if many else probabilities[0], 'version': snapshot.version}
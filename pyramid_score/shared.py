@@ -0,0 +1,198 @@
+# pyramid_score/shared.py
+
+import json
+import os
+import time
+
+import pandas as pd
+from .columnar import _require_pyarrow
+
+MANIFEST = 'manifest.json'
+_VERSION_METADATA = b'pyramid_score.version'
+_REFRESH_ATTEMPTS = 5
+
+
+def _ipc():
+    pyarrow = _require_pyarrow()
+    import pyarrow.ipc
+    return pyarrow
+
+
+def _read_manifest(directory) -> dict:
+    try:
+        with open(os.path.join(directory, MANIFEST)) as manifest:
+            return json.load(manifest)
+    except FileNotFoundError:
+        return None
+
+
+def export_tables(directory, tables: dict, keep: int = 2) -> int:
+    """
+    Grava as tabelas de resultado como arquivos Arrow IPC (sem compressão, prontos para serem
+    mapeados em memória) e publica uma nova versão no manifesto do diretório.
+
+    Os arquivos de cada versão têm nomes próprios e o manifesto é substituído de forma atômica,
+    de modo que leitores nunca veem uma versão incompleta. Os arquivos das versões antigas além
+    de `keep` são removidos (em Linux, leitores que ainda os mapeiam continuam válidos). A versão
+    anterior é sempre mantida, para leitores que acabaram de ler o manifesto antigo.
+
+    Parameters
+    ----------
+    directory : str
+        Diretório compartilhado (ex.: em /dev/shm para ficar em memória).
+    tables : dict
+        Tabelas por nome (ex.: {'rfm_table': rfv.rfm_table, 'pyramid_score_table': ...}).
+        Também aceita as análises (`PyramidScoreAnalysis`, `RFV`, `RFV10`), das quais é usada a
+        tabela de resultado.
+    keep : int, optional
+        Quantidade de versões mantidas em disco (padrão e mínimo 2: a atual e a anterior).
+
+    Returns
+    -------
+    int
+        Número da versão publicada.
+    """
+    if keep < 2:
+        raise ValueError("keep deve ser pelo menos 2 (a versão atual e a anterior).")
+    pyarrow = _ipc()
+    directory = os.fspath(directory)
+    os.makedirs(directory, exist_ok=True)
+    previous = _read_manifest(directory)
+    version = previous['version'] + 1 if previous else 1
+
+    files = {}
+    for name, table in tables.items():
+        if not isinstance(table, pd.DataFrame):
+            table = getattr(table, table._result_table)
+        arrow = pyarrow.Table.from_pandas(table)
+        metadata = dict(arrow.schema.metadata or {})
+        metadata[_VERSION_METADATA] = str(version).encode()
+        arrow = arrow.replace_schema_metadata(metadata)
+
+        files[name] = f'{name}.v{version}.arrow'
+        with pyarrow.OSFile(os.path.join(directory, files[name]), 'wb') as sink:
+            with pyarrow.ipc.new_file(sink, arrow.schema) as writer:
+                writer.write_table(arrow)
+
+    manifest = {'version': version, 'created': time.time(), 'tables': files}
+    staging = os.path.join(directory, f'.{MANIFEST}.{os.getpid()}.tmp')
+    with open(staging, 'w') as handle:
+        json.dump(manifest, handle)
+    os.replace(staging, os.path.join(directory, MANIFEST))
+
+    # Remove os arquivos das versões antigas
+    for file_name in os.listdir(directory):
+        stem, _, extension = file_name.rpartition('.')
+        if extension == 'arrow' and '.v' in stem:
+            file_version = stem.rpartition('.v')[2]
+            if file_version.isdigit() and int(file_version) <= version - keep:
+                os.remove(os.path.join(directory, file_name))
+    return version
+
+
+class SharedTables:
+    """
+    Classe para abrir, em modo somente leitura e sem cópia, as tabelas publicadas por `export_tables`.
+
+    Os arquivos Arrow IPC são mapeados em memória: todos os processos que abrem a mesma versão
+    compartilham as mesmas páginas. Colunas numéricas sem valores ausentes viram arrays NumPy
+    somente leitura apontando para o mapeamento; colunas de texto são materializadas em cada
+    processo (use `compact=True` nas análises para guardar IDs e segmentos como dicionários).
+
+    Parameters
+    ----------
+    directory : str
+        Diretório usado em `export_tables`.
+
+    Attributes
+    ----------
+    version : int
+        Versão aberta.
+
+    Methods
+    -------
+    table(name)
+        Tabela Arrow mapeada em memória.
+    to_pandas(name)
+        DataFrame da tabela.
+    column(name, column)
+        Array NumPy (sem cópia) de uma coluna numérica.
+    is_stale()
+        Indica se há uma versão mais nova publicada.
+    refresh()
+        Abre a versão mais nova, se houver.
+    """
+
+    def __init__(self, directory):
+        self.directory = os.fspath(directory)
+        self.version = None
+        self._tables = {}
+        self.refresh()
+
+    def refresh(self) -> bool:
+        """
+        Abre a versão publicada mais recente. Se os arquivos da versão lida no manifesto já tiverem
+        sido removidos por publicações mais novas, o manifesto é lido de novo e a versão mais
+        recente é aberta.
+
+        Returns
+        -------
+        bool
+            True se uma nova versão foi aberta.
+        """
+        for attempt in range(_REFRESH_ATTEMPTS):
+            manifest = _read_manifest(self.directory)
+            if manifest is None:
+                raise FileNotFoundError(f"Nenhuma tabela publicada em '{self.directory}'.")
+            if manifest['version'] == self.version:
+                return False
+            try:
+                self._tables = self._open(manifest)
+            except FileNotFoundError:
+                latest = _read_manifest(self.directory)
+                if attempt + 1 == _REFRESH_ATTEMPTS or latest is None or latest['version'] == manifest['version']:
+                    raise
+                continue
+            self.version = manifest['version']
+            return True
+
+    def _open(self, manifest: dict) -> dict:
+        pyarrow = _ipc()
+        tables = {}
+        for name, file_name in manifest['tables'].items():
+            source = pyarrow.memory_map(os.path.join(self.directory, file_name), 'r')
+            table = pyarrow.ipc.open_file(source).read_all()
+            if table.schema.metadata.get(_VERSION_METADATA) != str(manifest['version']).encode():
+                raise ValueError(f"O arquivo '{file_name}' não pertence à versão {manifest['version']}.")
+            tables[name] = table
+        return tables
+
+    def is_stale(self) -> bool:
+        """
+        Indica se o manifesto publica uma versão diferente da aberta.
+        """
+        manifest = _read_manifest(self.directory)
+        return manifest is not None and manifest['version'] != self.version
+
+    @property
+    def names(self) -> list:
+        return list(self._tables)
+
+    def table(self, name: str):
+        """
+        Retorna a tabela Arrow (mapeada em memória).
+        """
+        return self._tables[name]
+
+    def to_pandas(self, name: str) -> pd.DataFrame:
+        """
+        Retorna a tabela como DataFrame. Colunas numéricas sem valores ausentes não são copiadas
+        (ficam somente leitura).
+        """
+        return self._tables[name].to_pandas(split_blocks=True)
+
+    def column(self, name: str, column: str):
+        """
+        Retorna uma coluna numérica como array NumPy somente leitura, sem cópia.
+        """
+        return self._tables[name].column(column).to_numpy()
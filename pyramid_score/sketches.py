@@ -0,0 +1,179 @@
+# pyramid_score/sketches.py
+
+import numpy as np
+
+# Constante empírica entre k e o erro de rank normalizado do KLL (erro máximo ~ 3 / k)
+_ERROR_CONSTANT = 3.0
+_MIN_CAPACITY = 8
+_CAPACITY_DECAY = 2 / 3
+
+
+class KLLSketch:
+    """
+    Sketch de quantis KLL (Karnin, Lang e Liberty): resume um fluxo de valores em memória
+    O(k log(n / k)) e responde quantis com erro de rank normalizado aproximadamente `epsilon`.
+
+    Os valores ficam em níveis; cada item do nível h representa 2**h valores. Quando um nível
+    passa da sua capacidade, ele é ordenado e metade dos itens (os de posição par ou ímpar,
+    sorteada) sobe para o nível seguinte. Sketches construídos sobre partes diferentes dos dados
+    (chunks, arquivos, workers) podem ser combinados com `merge`. O mínimo e o máximo são exatos.
+
+    Parameters
+    ----------
+    epsilon : float, optional
+        Erro de rank normalizado desejado (padrão 0.01, ou seja, 1% dos valores). Define o
+        parâmetro k do sketch.
+    seed : int, optional
+        Semente do sorteio das compactações, para resultados reprodutíveis.
+
+    Attributes
+    ----------
+    k : int
+        Capacidade do nível mais alto.
+    n : int
+        Quantidade de valores resumidos.
+    min, max : float
+        Menor e maior valor resumidos.
+
+    Methods
+    -------
+    update(values)
+        Incorpora um array de valores.
+    merge(other)
+        Incorpora outro sketch.
+    quantiles(q)
+        Retorna os quantis aproximados.
+    rank(values)
+        Retorna a fração aproximada de valores menores ou iguais a cada valor.
+    """
+
+    def __init__(self, epsilon: float = 0.01, seed: int = None):
+        if not 0 < epsilon < 1:
+            raise ValueError("epsilon deve estar entre 0 e 1.")
+        self.epsilon = epsilon
+        self.k = max(_MIN_CAPACITY, int(np.ceil(_ERROR_CONSTANT / epsilon)))
+        self.n = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._rng = np.random.default_rng(seed)
+        self._levels = [np.empty(0)]
+
+    @classmethod
+    def from_array(cls, values, epsilon: float = 0.01, chunk_size: int = None, seed: int = None) -> 'KLLSketch':
+        """
+        Cria um sketch a partir de um array, opcionalmente em chunks de `chunk_size` valores.
+
+        Returns
+        -------
+        KLLSketch
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        sketch = cls(epsilon, seed)
+        chunk_size = chunk_size or max(len(values), 1)
+        for start in range(0, len(values), chunk_size):
+            sketch.update(values[start:start + chunk_size])
+        return sketch
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(_MIN_CAPACITY, int(np.ceil(self.k * _CAPACITY_DECAY ** depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self._levels):
+                    self._levels.append(np.empty(0))
+                items = np.sort(items)
+                # Com quantidade ímpar, um item fica no nível atual
+                kept, items = items[:len(items) % 2], items[len(items) % 2:]
+                promoted = items[self._rng.integers(2)::2]
+                self._levels[level] = kept
+                self._levels[level + 1] = np.concatenate([self._levels[level + 1], promoted])
+            level += 1
+
+    def update(self, values) -> 'KLLSketch':
+        """
+        Incorpora um array de valores (valores ausentes são ignorados).
+
+        Returns
+        -------
+        KLLSketch
+            O próprio sketch.
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.n += len(values)
+            self.min = min(self.min, values.min())
+            self.max = max(self.max, values.max())
+            self._levels[0] = np.concatenate([self._levels[0], values])
+            self._compress()
+        return self
+
+    def merge(self, other: 'KLLSketch') -> 'KLLSketch':
+        """
+        Incorpora outro sketch (ex.: construído por outro worker ou sobre outro chunk).
+
+        Returns
+        -------
+        KLLSketch
+            O próprio sketch.
+        """
+        if other.n:
+            while len(self._levels) < len(other._levels):
+                self._levels.append(np.empty(0))
+            for level, items in enumerate(other._levels):
+                self._levels[level] = np.concatenate([self._levels[level], items])
+            self.n += other.n
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self._compress()
+        return self
+
+    def _weighted_items(self):
+        items = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(len(values), 2.0 ** level) for level, values in enumerate(self._levels)])
+        order = np.argsort(items, kind='stable')
+        return items[order], np.cumsum(weights[order])
+
+    def quantiles(self, q) -> np.ndarray:
+        """
+        Retorna os quantis aproximados (q=0 e q=1 retornam o mínimo e o máximo exatos).
+
+        Parameters
+        ----------
+        q : float or array-like
+            Quantis entre 0 e 1.
+
+        Returns
+        -------
+        np.ndarray
+        """
+        if not self.n:
+            raise ValueError("O sketch está vazio.")
+        q = np.atleast_1d(np.asarray(q, dtype=float))
+        items, cumulative = self._weighted_items()
+        positions = np.searchsorted(cumulative, q * cumulative[-1], side='left')
+        result = items[np.minimum(positions, len(items) - 1)]
+        result[q <= 0] = self.min
+        result[q >= 1] = self.max
+        return result
+
+    def rank(self, values) -> np.ndarray:
+        """
+        Retorna a fração aproximada dos valores resumidos menores ou iguais a cada valor.
+
+        Returns
+        -------
+        np.ndarray
+        """
+        items, cumulative = self._weighted_items()
+        positions = np.searchsorted(items, np.asarray(values, dtype=float), side='right')
+        return np.where(positions > 0, cumulative[np.maximum(positions - 1, 0)], 0.0) / cumulative[-1]
+
+    @property
+    def size(self) -> int:
+        """Quantidade de itens guardados pelo sketch."""
+        return sum(len(items) for items in self._levels)
@@ -0,0 +1,133 @@
+# pyramid_score/snapshots.py
+
+import numpy as np
+import pandas as pd
+
+
+class RFMSnapshots:
+    """
+    Classe para calcular a recência, frequência e valor monetário de cada cliente em várias datas
+    de referência ("as-of") a partir de uma única ordenação das transações.
+
+    As transações são ordenadas uma vez por (cliente, data) e acumuladas por cliente. Para cada
+    data de referência, uma busca binária (`np.searchsorted`) encontra a última transação de cada
+    cliente até aquela data, e a quantidade, a soma e a última data saem dos acumulados.
+
+    O resultado de cada data é igual ao de rodar a agregação de `PyramidScoreAnalysis` sobre a
+    cópia filtrada `df[df[transaction_date] <= data]`: linhas sem cliente ou sem valor são
+    descartadas e, por padrão, a recência é medida a partir da transação mais recente da cópia.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        DataFrame contendo as transações.
+    customer_id : str
+        Nome da coluna que identifica os clientes.
+    transaction_date : str
+        Nome da coluna que contém as datas de transações.
+    amount : str
+        Nome da coluna que contém o valor das transações.
+
+    Methods
+    -------
+    snapshot(reference_date, from_snapshot_date=False)
+        Retorna a tabela de RFM de uma data de referência.
+    snapshots(reference_dates, analysis=None, from_snapshot_date=False)
+        Retorna as tabelas de todas as datas em formato longo, opcionalmente segmentadas.
+    """
+
+    def __init__(self, df: pd.DataFrame, customer_id: str, transaction_date: str, amount: str):
+        self.customer_id = customer_id
+
+        df = df.dropna(subset=[customer_id, amount])
+        dates = pd.to_datetime(df[transaction_date])
+        df, dates = df[dates.notna()], dates[dates.notna()]
+
+        codes, self._customers = pd.factorize(df[customer_id], sort=True)
+        self._dates, date_ranks = np.unique(dates.to_numpy(), return_inverse=True)
+        self._stride = len(self._dates) + 1
+
+        # Chave (cliente, data) em um único inteiro: uma ordenação serve para todas as datas de referência
+        keys = codes.astype(np.int64) * self._stride + date_ranks
+        order = np.argsort(keys, kind='stable')
+        self._keys = keys[order]
+        self._cumulative = pd.Series(df[amount].to_numpy(dtype=float)[order]).groupby(codes[order]).cumsum().to_numpy()
+        self._starts = np.searchsorted(self._keys, np.arange(len(self._customers), dtype=np.int64) * self._stride)
+
+    def snapshot(self, reference_date, from_snapshot_date: bool = False) -> pd.DataFrame:
+        """
+        Retorna a recência, frequência e valor monetário dos clientes com transações até `reference_date`.
+
+        Parameters
+        ----------
+        reference_date : datetime-like
+            Data de referência (inclusiva).
+        from_snapshot_date : bool, optional
+            Se True, a recência é medida a partir de `reference_date`. Se False (padrão), a partir da
+            transação mais recente até `reference_date`, como em uma análise sobre a cópia filtrada.
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame com as colunas customer_id, 'recency', 'frequency' e 'monetary_value', ordenado pelo cliente.
+        """
+        reference_date = pd.Timestamp(reference_date)
+        date_position = np.searchsorted(self._dates, reference_date.to_datetime64(), side='right') - 1
+
+        customers = np.arange(len(self._customers), dtype=np.int64)
+        ends = np.searchsorted(self._keys, customers * self._stride + date_position, side='right')
+        frequency = ends - self._starts
+        active = frequency > 0
+        last = ends[active] - 1
+
+        last_transaction = self._dates[self._keys[last] % self._stride]
+        if not from_snapshot_date:
+            reference_date = self._dates[date_position] if date_position >= 0 else reference_date
+
+        return pd.DataFrame({
+            self.customer_id: self._customers[active],
+            'recency': pd.TimedeltaIndex(pd.Timestamp(reference_date).to_datetime64() - last_transaction).days.to_numpy(),
+            'frequency': frequency[active],
+            'monetary_value': self._cumulative[last],
+        })
+
+    def snapshots(self, reference_dates, analysis=None, from_snapshot_date: bool = False) -> pd.DataFrame:
+        """
+        Retorna as tabelas de RFM de todas as datas de referência em formato longo.
+
+        Parameters
+        ----------
+        reference_dates : iterable of datetime-like
+            Datas de referência (ex.: `pd.date_range(inicio, fim, freq='ME')` para fins de mês).
+        analysis : type, optional
+            Classe de análise (`PyramidScoreAnalysis`, `RFV` ou `RFV10`). Se informada, cada data é
+            segmentada com `analysis.from_rfm_dataset` e a coluna de segmento da classe é acrescentada.
+        from_snapshot_date : bool, optional
+            Se True, a recência é medida a partir de cada data de referência.
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame com as colunas 'snapshot_date', customer_id, 'recency', 'frequency',
+            'monetary_value' e, se `analysis` for informada, a coluna de segmento.
+        """
+        frames = []
+        for reference_date in pd.to_datetime(list(reference_dates)):
+            df_grp = self.snapshot(reference_date, from_snapshot_date)
+            if analysis is not None:
+                df_grp[analysis._segment_column] = self._segments(df_grp, analysis)
+            frames.append(df_grp.assign(snapshot_date=reference_date))
+
+        if not frames:
+            columns = ['snapshot_date', self.customer_id, 'recency', 'frequency', 'monetary_value']
+            return pd.DataFrame(columns=columns + ([analysis._segment_column] if analysis is not None else []))
+
+        long = pd.concat(frames, ignore_index=True)
+        return long[['snapshot_date'] + [column for column in long.columns if column != 'snapshot_date']]
+
+    def _segments(self, df_grp: pd.DataFrame, analysis) -> np.ndarray:
+        if df_grp.empty:
+            return np.empty(0, dtype=object)
+        table = getattr(analysis.from_rfm_dataset(df_grp, self.customer_id), analysis._result_table)
+        segments = table.set_index(table[self.customer_id].astype(df_grp[self.customer_id].dtype))[analysis._segment_column]
+        return segments.reindex(df_grp[self.customer_id]).to_numpy()
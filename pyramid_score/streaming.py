@@ -0,0 +1,278 @@
+# pyramid_score/streaming.py
+
+import pandas as pd
+
+
+def aggregate_transactions(df: pd.DataFrame, customer_id: str, transaction_date: str, amount: str) -> pd.DataFrame:
+    """
+    Reduz transações ao estado agregável por cliente: última data, quantidade e soma dos valores.
+
+    Segue as mesmas regras de `PyramidScoreAnalysis`: linhas sem cliente ou sem valor são descartadas.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        DataFrame contendo as transações.
+    customer_id : str
+        Nome da coluna que identifica os clientes.
+    transaction_date : str
+        Nome da coluna que contém as datas de transações.
+    amount : str
+        Nome da coluna que contém o valor das transações.
+
+    Returns
+    -------
+    pd.DataFrame
+        Estado indexado pelo cliente, com as colunas 'last_transaction', 'frequency' e 'monetary_value'.
+    """
+    df = df.dropna(subset=[customer_id, amount])
+    customers = df[customer_id]
+    amounts = df[amount].astype(float).groupby(customers)
+
+    state = pd.DataFrame({
+        'last_transaction': pd.to_datetime(df[transaction_date]).groupby(customers).max(),
+        'frequency': amounts.count(),
+        'monetary_value': amounts.sum(),
+    })
+    state.index.name = customer_id
+    return state
+
+
+def merge_states(*states: pd.DataFrame) -> pd.DataFrame:
+    """
+    Combina estados produzidos por `aggregate_transactions` (de chunks, arquivos ou workers diferentes).
+
+    Parameters
+    ----------
+    *states : pd.DataFrame
+        Estados por cliente a serem combinados.
+
+    Returns
+    -------
+    pd.DataFrame
+        Estado combinado, ordenado pelo cliente.
+    """
+    combined = pd.concat(states)
+    if not combined.index.has_duplicates:
+        return combined.sort_index()
+
+    grouped = combined.groupby(level=0)
+    merged = pd.DataFrame({
+        'last_transaction': grouped['last_transaction'].max(),
+        'frequency': grouped['frequency'].sum(),
+        'monetary_value': grouped['monetary_value'].sum(),
+    })
+    merged.index.name = combined.index.name
+    return merged
+
+
+def state_to_rfm_dataset(state: pd.DataFrame, customer_id: str, reference_date=None) -> pd.DataFrame:
+    """
+    Converte o estado por cliente na tabela de recência, frequência e valor monetário.
+
+    Parameters
+    ----------
+    state : pd.DataFrame
+        Estado produzido por `aggregate_transactions` ou `merge_states`.
+    customer_id : str
+        Nome da coluna de clientes na tabela resultante.
+    reference_date : datetime-like, optional
+        Data de referência da recência. Por padrão, a transação mais recente do estado.
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame com as colunas customer_id, 'recency', 'frequency' e 'monetary_value'.
+    """
+    if reference_date is None:
+        reference_date = state['last_transaction'].max()
+
+    df_grp = pd.DataFrame({
+        'recency': (pd.Timestamp(reference_date) - state['last_transaction']).dt.days,
+        'frequency': state['frequency'],
+        'monetary_value': state['monetary_value'],
+    })
+    df_grp.index.name = customer_id
+    return df_grp.reset_index()
+
+
+class StreamingRFMAggregator:
+    """
+    Classe para agregar transações em chunks, mantendo apenas o estado por cliente
+    (última data, quantidade e soma). O uso de memória cresce com o número de clientes,
+    não com o número de transações.
+
+    Parameters
+    ----------
+    customer_id : str
+        Nome da coluna que identifica os clientes.
+    transaction_date : str
+        Nome da coluna que contém as datas de transações.
+    amount : str
+        Nome da coluna que contém o valor das transações.
+
+    Attributes
+    ----------
+    state : pd.DataFrame
+        Estado agregado por cliente ('last_transaction', 'frequency', 'monetary_value').
+
+    Methods
+    -------
+    update(chunk)
+        Incorpora um chunk de transações ao estado.
+    merge(other)
+        Incorpora o estado de outro agregador (ex.: de outro worker).
+    to_rfm_dataset(reference_date)
+        Retorna a tabela de RFM consumida por `from_rfm_dataset` das classes de análise.
+    """
+
+    def __init__(self, customer_id: str, transaction_date: str, amount: str):
+        self.customer_id = customer_id
+        self.transaction_date = transaction_date
+        self.amount = amount
+        self.state = None
+
+    def update(self, chunk: pd.DataFrame) -> 'StreamingRFMAggregator':
+        """
+        Incorpora um chunk de transações ao estado.
+
+        Parameters
+        ----------
+        chunk : pd.DataFrame
+            DataFrame com as colunas de cliente, data e valor.
+
+        Returns
+        -------
+        StreamingRFMAggregator
+            O próprio agregador.
+        """
+        chunk_state = aggregate_transactions(chunk, self.customer_id, self.transaction_date, self.amount)
+        self.state = chunk_state if self.state is None else merge_states(self.state, chunk_state)
+        return self
+
+    def merge(self, other: 'StreamingRFMAggregator') -> 'StreamingRFMAggregator':
+        """
+        Incorpora o estado de outro agregador.
+
+        Parameters
+        ----------
+        other : StreamingRFMAggregator
+            Agregador construído sobre outra parte das transações.
+
+        Returns
+        -------
+        StreamingRFMAggregator
+            O próprio agregador.
+        """
+        if other.state is not None:
+            self.state = other.state.copy() if self.state is None else merge_states(self.state, other.state)
+        return self
+
+    def consume(self, chunks) -> 'StreamingRFMAggregator':
+        """
+        Incorpora todos os chunks de um iterável de DataFrames.
+
+        Parameters
+        ----------
+        chunks : iterable of pd.DataFrame
+            Chunks de transações.
+
+        Returns
+        -------
+        StreamingRFMAggregator
+            O próprio agregador.
+        """
+        for chunk in chunks:
+            self.update(chunk)
+        return self
+
+    def to_rfm_dataset(self, reference_date=None) -> pd.DataFrame:
+        """
+        Retorna a tabela de recência, frequência e valor monetário por cliente.
+
+        Parameters
+        ----------
+        reference_date : datetime-like, optional
+            Data de referência da recência. Por padrão, a transação mais recente consumida.
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame com as colunas customer_id, 'recency', 'frequency' e 'monetary_value'.
+        """
+        if self.state is None:
+            raise ValueError("Nenhuma transação foi consumida pelo agregador.")
+        return state_to_rfm_dataset(self.state, self.customer_id, reference_date)
+
+    @classmethod
+    def from_chunks(cls, chunks, customer_id: str, transaction_date: str, amount: str) -> 'StreamingRFMAggregator':
+        """
+        Cria um agregador a partir de um iterável de DataFrames.
+
+        Parameters
+        ----------
+        chunks : iterable of pd.DataFrame
+            Chunks de transações.
+        customer_id, transaction_date, amount : str
+            Nomes das colunas de cliente, data e valor.
+
+        Returns
+        -------
+        StreamingRFMAggregator
+        """
+        return cls(customer_id, transaction_date, amount).consume(chunks)
+
+    @classmethod
+    def from_csv(cls, path, customer_id: str, transaction_date: str, amount: str,
+                 chunksize: int = 1_000_000, **read_csv_kwargs) -> 'StreamingRFMAggregator':
+        """
+        Cria um agregador lendo um CSV em chunks, apenas com as colunas de cliente, data e valor.
+
+        Parameters
+        ----------
+        path : str
+            Caminho do arquivo CSV.
+        customer_id, transaction_date, amount : str
+            Nomes das colunas de cliente, data e valor.
+        chunksize : int, optional
+            Quantidade de linhas por chunk.
+        **read_csv_kwargs
+            Argumentos adicionais para `pd.read_csv` (ex.: `dtype={customer_id: str}`).
+
+        Returns
+        -------
+        StreamingRFMAggregator
+        """
+        chunks = pd.read_csv(path, usecols=[customer_id, transaction_date, amount],
+                             chunksize=chunksize, **read_csv_kwargs)
+        return cls.from_chunks(chunks, customer_id, transaction_date, amount)
+
+    @classmethod
+    def from_parquet(cls, path, customer_id: str, transaction_date: str, amount: str,
+                     batch_size: int = 1_000_000) -> 'StreamingRFMAggregator':
+        """
+        Cria um agregador lendo um arquivo ou diretório Parquet em lotes, apenas com as colunas
+        de cliente, data e valor. Requer o pacote pyarrow.
+
+        Parameters
+        ----------
+        path : str
+            Caminho do arquivo ou diretório Parquet.
+        customer_id, transaction_date, amount : str
+            Nomes das colunas de cliente, data e valor.
+        batch_size : int, optional
+            Quantidade máxima de linhas por lote.
+
+        Returns
+        -------
+        StreamingRFMAggregator
+        """
+        try:
+            import pyarrow.dataset as ds
+        except ImportError as exc:
+            raise ImportError("A leitura de arquivos Parquet requer o pacote pyarrow.") from exc
+
+        batches = ds.dataset(path, format='parquet').to_batches(
+            columns=[customer_id, transaction_date, amount], batch_size=batch_size)
+        chunks = (batch.to_pandas() for batch in batches)
+        return cls.from_chunks(chunks, customer_id, transaction_date, amount)
@@ -7,7 +7,7 @@ setup(
     description='Análise de clientes com RFM Pyramid Score',
     author='Renato Cesar Menendes Cruz',
     author_email='renatomenendes@yahoo.com.br',
-    packages=find_packages(),
+    packages=find_packages(exclude=['tests', 'benchmarks']),
     install_requires=[
         'pandas>=1.0',
         'numpy>=1.18',
@@ -1,4 +1,5 @@
 # tests/test_analysis.py
+import numpy as np
 import pandas as pd
 from pyramid_score import PyramidScoreAnalysis
 
@@ -15,3 +16,25 @@ def test_pyramid_analysis():
     # Teste da análise
     analysis = PyramidScoreAnalysis(df, 'customer_id', 'transaction_date', 'amount')
     assert analysis.pyramid_score_table is not None
+
+
+def test_pyramid_analysis_update():
+    # Histórico e um novo dia de transações (cliente existente e cliente novo)
+    rng = np.random.default_rng(0)
+    history = pd.DataFrame({
+        'customer_id': rng.integers(0, 300, 3000).astype(str),
+        'transaction_date': pd.Timestamp('2021-01-01') + pd.to_timedelta(rng.integers(0, 365, 3000), unit='D'),
+        'amount': rng.integers(1, 1000, 3000).astype(float),
+    })
+    new_day = pd.DataFrame({
+        'customer_id': ['7', '7', 'novo'],
+        'transaction_date': pd.to_datetime(['2022-01-10'] * 3),
+        'amount': [50.0, 25.0, 300.0],
+    })
+
+    analysis = PyramidScoreAnalysis(history.copy(), 'customer_id', 'transaction_date', 'amount')
+    analysis.update(new_day)
+    rebuild = PyramidScoreAnalysis(pd.concat([history, new_day], ignore_index=True), 'customer_id', 'transaction_date', 'amount')
+
+    pd.testing.assert_frame_equal(analysis.pyramid_score_table, rebuild.pyramid_score_table)
+    pd.testing.assert_frame_equal(analysis.segment_table, rebuild.segment_table)
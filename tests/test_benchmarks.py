@@ -0,0 +1,42 @@
+# tests/test_benchmarks.py
+import json
+import pandas as pd
+from benchmarks.synthetic import generate_transactions, parse_size
+from benchmarks.run import main, run_benchmarks
+from benchmarks.parallel import run_parallel_benchmarks
+
+
+def test_generate_transactions_is_seeded():
+    first = generate_transactions(2000, seed=3)
+    second = generate_transactions(2000, seed=3)
+
+    pd.testing.assert_frame_equal(first, second)
+    assert len(first) == 2000
+    assert parse_size('10k') == 10_000 and parse_size('1m') == 1_000_000
+    # Distribuição assimétrica: o cliente mais ativo compra bem mais que a mediana
+    counts = first['customer_id'].value_counts()
+    assert counts.iloc[0] > 5 * counts.median()
+
+
+def test_run_benchmarks_report(tmp_path):
+    report = run_benchmarks([2000], track_memory=False, skip=['RFV'])
+    stages = {(result['case'], result['stage']) for result in report['results']}
+
+    assert ('PyramidScoreAnalysis', 'ingest') in stages
+    assert ('RFV[vectorized]', 'segment') in stages
+    assert ('PriceElasticity.calculate_all_elasticities', 'total') in stages
+    assert not any(case == 'RFV' for case, _ in stages)
+
+    output = tmp_path / 'report.json'
+    main(['--sizes', '1000', '--skip', 'RFV', 'RFV10', '--output', str(output)])
+    assert json.loads(output.read_text())['results'][0]['peak_mb'] > 0
+
+
+def test_run_parallel_benchmarks_report():
+    report = run_parallel_benchmarks([3000], workers=[2])
+    results = {(result['case'], result['workers']): result for result in report['results']}
+
+    # workers=1 é sempre medido como referência do ganho
+    assert set(results) == {(case, n) for case in ('PyramidScoreAnalysis', 'RFV[vectorized]') for n in (1, 2)}
+    assert results[('RFV[vectorized]', 1)]['speedup'] == 1.0
+    assert all(result['matches'] for result in results.values())
@@ -0,0 +1,90 @@
+# tests/test_cache.py
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from pyramid_score import PipelineInstrumentation, PyramidScoreAnalysis, ResultCache, RFV10
+
+pytest.importorskip('pyarrow')
+
+
+def _transactions(n_rows=3000, n_customers=300, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'customer_id': rng.integers(0, n_customers, n_rows).astype(str),
+        'transaction_date': pd.Timestamp('2022-01-01') + pd.to_timedelta(rng.integers(0, 365, n_rows), unit='D'),
+        'amount': rng.integers(1, 500, n_rows).astype(float),
+    })
+
+
+def test_cache_hit_skips_computation(tmp_path):
+    df = _transactions()
+    cache = ResultCache(tmp_path)
+    first = RFV10(df, 'customer_id', 'transaction_date', 'amount', cache=cache)
+
+    # Na segunda execução nenhuma etapa é executada, as tabelas vêm do disco
+    instrumentation = PipelineInstrumentation(track_memory=False)
+    second = RFV10(df.copy(), 'customer_id', 'transaction_date', 'amount', cache=cache, instrumentation=instrumentation)
+    assert instrumentation.stages == []
+    pd.testing.assert_frame_equal(first.rfv_table, second.rfv_table)
+
+    # Parâmetros ou transações diferentes geram outra entrada
+    RFV10(df, 'customer_id', 'transaction_date', 'amount', cache=cache, compact=True)
+    changed = df.assign(amount=df['amount'] + 1)
+    RFV10(changed, 'customer_id', 'transaction_date', 'amount', cache=cache, instrumentation=instrumentation)
+    assert len(instrumentation.stages) == 3
+
+    # O estado por cliente também é guardado, de modo que update funciona depois de uma leitura do cache
+    PyramidScoreAnalysis(df, 'customer_id', 'transaction_date', 'amount', cache=cache)
+    cached = PyramidScoreAnalysis(df, 'customer_id', 'transaction_date', 'amount', cache=cache)
+    new_day = pd.DataFrame({'customer_id': ['1'], 'transaction_date': [pd.Timestamp('2023-01-05')], 'amount': [10.0]})
+    rebuild = PyramidScoreAnalysis(pd.concat([df, new_day], ignore_index=True), 'customer_id', 'transaction_date', 'amount')
+    pd.testing.assert_frame_equal(cached.update(new_day), rebuild.pyramid_score_table)
+
+
+def test_cache_lru_eviction(tmp_path):
+    df = _transactions()
+    cache = ResultCache(tmp_path)
+    keys = []
+    for seed in range(3):
+        keys.append(ResultCache.key('teste', df, ['customer_id'], {'seed': seed}))
+        cache.put(keys[-1], {'table': df.sample(frac=1.0, random_state=seed)})
+        os.utime(tmp_path / keys[-1], (seed, seed))
+    entry_size = cache.size // 3
+
+    # A entrada mais antiga é lida (e passa a ser a mais recente); a próxima mais antiga é removida
+    assert cache.get(keys[0]) is not None
+    cache.max_bytes = 2 * entry_size + entry_size // 2
+    cache.put(ResultCache.key('teste', df, ['customer_id'], {'seed': 3}), {'table': df})
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.size <= cache.max_bytes
+
+
+def test_cache_key_covers_ingest(tmp_path):
+    from pyramid_score.rfv import RFV
+    cache = ResultCache(tmp_path)
+    df = pd.DataFrame({
+        'customer_id': ['A', 'A', 'B'],
+        'transaction_date': pd.to_datetime(['2022-01-01', '2022-01-01', '2022-02-01']),
+        'amount': [7.05, 7.05, 3.0],
+        'store': ['x', 'y', 'x'],
+    })
+
+    # Ingest legado e vetorizado (n_jobs=2) interpretam os valores de forma diferente: entradas distintas
+    legacy = RFV(df.copy(), 'customer_id', 'transaction_date', 'amount', cache=cache)
+    parallel = RFV(df.copy(), 'customer_id', 'transaction_date', 'amount', n_jobs=2, cache=cache)
+    fresh = RFV(df.copy(), 'customer_id', 'transaction_date', 'amount', n_jobs=2)
+    pd.testing.assert_frame_equal(parallel.rfm_table, fresh.rfm_table)
+    monetary = [table.set_index('customer_id').loc['A', 'monetary_value'] for table in (legacy.rfm_table, parallel.rfm_table)]
+    assert monetary == [14.0, 14.1]
+
+    # Colunas fora de customer_id/date/amount alteram a deduplicação e portanto a chave
+    same_store = df.assign(store='x')
+    for cls, table in ((RFV, 'rfm_table'), (RFV10, 'rfv_table')):
+        cls(df.copy(), 'customer_id', 'transaction_date', 'amount', cache=cache)
+        cached = getattr(cls(same_store.copy(), 'customer_id', 'transaction_date', 'amount', cache=cache), table)
+        expected = getattr(cls(same_store.copy(), 'customer_id', 'transaction_date', 'amount'), table)
+        pd.testing.assert_frame_equal(cached, expected)
+        assert cached['frequency'].tolist() == [1, 1]
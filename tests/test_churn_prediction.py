@@ -0,0 +1,61 @@
+# tests/test_churn_prediction.py
+import numpy as np
+import pandas as pd
+import pytest
+from pyramid_score import ChurnPrediction
+
+
+def _churn_data(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'frequency': rng.integers(1, 30, n),
+        'monetary_value': rng.uniform(10, 1000, n),
+        'recency': rng.integers(0, 365, n),
+    })
+    df['churn'] = (df['recency'] > 180).astype(int)
+    return df
+
+
+def test_predict_churn_many_and_persistence(tmp_path):
+    df = _churn_data()
+    features = ['frequency', 'monetary_value', 'recency']
+
+    churn = ChurnPrediction(df, 'churn')
+    churn.train_model(features)
+
+    expected = churn.model.predict_proba(df[features])[:, 1]
+    probabilities = churn.predict_churn_many(df)
+    assert np.allclose(probabilities.to_numpy(), expected)
+    assert np.allclose(churn.predict_churn_many(df, chunk_size=7).to_numpy(), expected)
+
+    # Modelo salvo e carregado sem retreinar
+    path = tmp_path / 'churn.joblib'
+    churn.save_model(path)
+    loaded = ChurnPrediction.load_model(path)
+    assert loaded.features == features
+    assert np.allclose(loaded.predict_churn_many(df).to_numpy(), expected)
+
+
+def test_train_model_streaming(tmp_path):
+    pytest.importorskip('pyarrow')
+    df = _churn_data(2000)
+    features = ['frequency', 'monetary_value', 'recency']
+    chunks = [df.iloc[start:start + 300] for start in range(0, len(df), 300)]
+
+    churn = ChurnPrediction(None, 'churn')
+    results = churn.train_model_streaming(chunks, features, holdout_size=200)
+    assert results['n_train'] + results['n_holdout'] == len(df)
+    assert results['n_evaluated'] == 200
+    assert 0 <= results['accuracy'] <= 1
+    probabilities = churn.predict_churn_many(df)
+    assert len(probabilities) == len(df) and probabilities.between(0, 1).all()
+
+    # Parquet (Path) em lotes de outro tamanho, com mais de uma época: mesmo holdout
+    path = tmp_path / 'churn.parquet'
+    df.to_parquet(path)
+    again = ChurnPrediction(None, 'churn').train_model_streaming(path, features, epochs=2, batch_size=700)
+    assert (again['n_train'], again['n_holdout']) == (results['n_train'], results['n_holdout'])
+
+    # Um iterador só pode ser consumido uma vez
+    with pytest.raises(ValueError):
+        churn.train_model_streaming(iter(chunks), features, epochs=2)
@@ -0,0 +1,75 @@
+# tests/test_columnar.py
+import numpy as np
+import pandas as pd
+import pytest
+from pyramid_score import ChurnPrediction, PriceElasticity, PyramidScoreAnalysis, RFV
+
+pa = pytest.importorskip('pyarrow')
+
+
+def _transactions(n_rows=2000, n_customers=150, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'customer_id': rng.integers(0, n_customers, n_rows).astype(str),
+        'transaction_date': pd.Timestamp('2022-01-01') + pd.to_timedelta(rng.integers(0, 365, n_rows), unit='D'),
+        'amount': rng.integers(1, 500, n_rows).astype(float),
+        'price': rng.integers(1, 50, n_rows).astype(float),
+        'quantity': rng.integers(1, 20, n_rows),
+    })
+    # Colunas largas que não devem ser lidas
+    for i in range(10):
+        df[f'extra_{i}'] = 'x'
+    return df
+
+
+def test_from_parquet_projection_and_date_filter(tmp_path):
+    df = _transactions()
+    path = tmp_path / 'transactions.parquet'
+    df.to_parquet(path, index=False, row_group_size=500)
+
+    analysis = PyramidScoreAnalysis.from_parquet(path, 'customer_id', 'transaction_date', 'amount',
+                                                 start_date='2022-03-01', end_date='2022-10-31')
+    assert list(analysis.df.columns) == ['customer_id', 'transaction_date', 'amount']
+
+    mask = df['transaction_date'].between('2022-03-01', '2022-10-31')
+    expected = PyramidScoreAnalysis(df[mask].reset_index(drop=True), 'customer_id', 'transaction_date', 'amount')
+    pd.testing.assert_frame_equal(analysis.pyramid_score_table, expected.pyramid_score_table)
+
+    elasticity = PriceElasticity.from_parquet(path, 'customer_id', 'price', 'quantity')
+    assert list(elasticity.df.columns) == ['customer_id', 'price', 'quantity']
+    with pytest.raises(ValueError):
+        PriceElasticity.from_parquet(path, 'customer_id', 'price', 'quantity', start_date='2022-03-01')
+
+
+def test_from_arrow():
+    df = _transactions(seed=1)
+    df['churn'] = (df['amount'] > 250).astype(int)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    analysis = PyramidScoreAnalysis.from_arrow(table, 'customer_id', 'transaction_date', 'amount', end_date='2022-06-30')
+    assert analysis.df['transaction_date'].max() <= pd.Timestamp('2022-06-30')
+
+    churn = ChurnPrediction.from_arrow(table, 'churn', columns=['amount', 'quantity'])
+    assert list(churn.df.columns) == ['churn', 'amount', 'quantity']
+
+
+def test_rfv_from_parquet_parity(tmp_path):
+    df = pd.DataFrame({
+        'customer_id': ['A', 'A', 'B', 'B', 'C'],
+        'transaction_date': pd.to_datetime(['2022-01-01 10:00', '2022-01-01 10:00', '2022-01-31 18:30',
+                                            '2022-01-31 18:30', '2022-02-01 09:00']),
+        'amount': [10.0, 10.0, 5.0, 5.0, 7.0],
+        'store': ['x', 'y', 'x', 'x', 'x'],
+    })
+    path = tmp_path / 'transactions.parquet'
+    df.to_parquet(path, index=False)
+
+    # A deduplicação considera todas as colunas, como na leitura completa do arquivo
+    analysis = RFV.from_parquet(path, 'customer_id', 'transaction_date', 'amount', vectorized=True)
+    expected = RFV(pd.read_parquet(path), 'customer_id', 'transaction_date', 'amount', vectorized=True)
+    pd.testing.assert_frame_equal(analysis.rfm_table, expected.rfm_table)
+    assert analysis.rfm_table.set_index('customer_id').loc['A', 'frequency'] == 2
+
+    # end_date sem horário inclui as transações ao longo do último dia
+    january = RFV.from_parquet(path, 'customer_id', 'transaction_date', 'amount', vectorized=True, end_date='2022-01-31')
+    assert sorted(january.rfm_table['customer_id']) == ['A', 'B']
@@ -0,0 +1,54 @@
+# tests/test_compact.py
+import numpy as np
+import pandas as pd
+from pyramid_score import PyramidScoreAnalysis
+from pyramid_score.rfv import RFV
+from pyramid_score.rfv10 import RFV10
+
+
+def _transactions(n_rows=3000, n_customers=250, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'customer_id': rng.integers(0, n_customers, n_rows).astype(str),
+        'transaction_date': pd.Timestamp('2022-01-01') + pd.to_timedelta(rng.integers(0, 365, n_rows), unit='D'),
+        'amount': rng.integers(1, 500, n_rows).astype(float),
+    })
+
+
+def _by_customer(table, columns):
+    table = table.assign(customer_id=table['customer_id'].astype(str))
+    return table.set_index('customer_id')[columns].astype(str).sort_index()
+
+
+def test_rfv_compact():
+    df = _transactions()
+    regular = RFV(df.copy(), 'customer_id', 'transaction_date', 'amount', vectorized=True)
+    compact = RFV(df.copy(), 'customer_id', 'transaction_date', 'amount', vectorized=True, compact=True)
+    table = compact.rfm_table
+
+    assert isinstance(table['customer_id'].dtype, pd.CategoricalDtype)
+    assert isinstance(table['segment'].dtype, pd.CategoricalDtype)
+    assert table['recency'].dtype == np.int32 and table['monetary_value'].dtype == np.float32
+    assert table['r'].dtype == np.int8 and table['rfm_score'].dtype == np.int16
+
+    # Mesmos scores e segmentos, com o rfm_score em texto gerado sob demanda
+    table = table.assign(rfm_score=compact.rfm_score_labels())
+    columns = ['r', 'f', 'm', 'rfm_score', 'segment']
+    pd.testing.assert_frame_equal(_by_customer(table, columns), _by_customer(regular.rfm_table, columns))
+    assert table.memory_usage(deep=True).sum() < regular.rfm_table.memory_usage(deep=True).sum()
+
+
+def test_pyramid_and_rfv10_compact():
+    df = _transactions(seed=1)
+
+    regular = PyramidScoreAnalysis(df.copy(), 'customer_id', 'transaction_date', 'amount')
+    compact = PyramidScoreAnalysis(df.copy(), 'customer_id', 'transaction_date', 'amount', compact=True)
+    assert isinstance(compact.pyramid_score_table['segment'].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(_by_customer(compact.pyramid_score_table, ['segment']),
+                                  _by_customer(regular.pyramid_score_table, ['segment']))
+
+    regular = RFV10(df.copy(), 'customer_id', 'transaction_date', 'amount')
+    compact = RFV10(df.copy(), 'customer_id', 'transaction_date', 'amount', compact=True)
+    assert compact.rfv_table['r_score'].dtype == np.int8
+    columns = ['r_score', 'f_score', 'v_score', 'class']
+    pd.testing.assert_frame_equal(_by_customer(compact.rfv_table, columns), _by_customer(regular.rfv_table, columns))
@@ -0,0 +1,26 @@
+# tests/test_group_price_corridor.py
+import pandas as pd
+import pytest
+from pyramid_score import GroupPriceCorridor
+
+
+def test_group_price_corridor():
+    # Segmento X com um outlier superior, segmento Y sem outliers
+    data = {
+        'segment': ['X'] * 6 + ['Y'] * 3,
+        'price': [10.0, 11.0, 12.0, 13.0, 14.0, 100.0, 5.0, 6.0, 7.0]
+    }
+    df = pd.DataFrame(data)
+
+    corridor = GroupPriceCorridor(df, 'segment', 'price')
+    all_corridors = corridor.get_all_price_corridors()
+
+    for segment in ['X', 'Y']:
+        expected = corridor._remove_outliers(df[df['segment'] == segment], 'price')['price']
+        assert all_corridors.loc[segment, 'min_price'] == expected.min()
+        assert all_corridors.loc[segment, 'max_price'] == expected.max()
+
+    assert corridor.get_price_corridor('X') == {'min_price': 10.0, 'max_price': 14.0}
+
+    with pytest.raises(ValueError):
+        corridor.get_price_corridor('Z')
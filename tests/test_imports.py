@@ -0,0 +1,24 @@
+# tests/test_imports.py
+import subprocess
+import sys
+
+
+def _loaded_modules(code):
+    # Executa em um novo interpretador para medir apenas o que o import carrega
+    script = code + "\nimport sys; print(' '.join(m for m in ('pandas', 'sklearn', 'matplotlib') if m in sys.modules))"
+    output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True)
+    return output.stdout.split()
+
+
+def test_import_is_lazy():
+    assert _loaded_modules("import pyramid_score") == []
+    assert _loaded_modules("from pyramid_score import PriceCorridor") == ['pandas']
+    assert 'sklearn' in _loaded_modules("from pyramid_score import ChurnPrediction")
+
+
+def test_lazy_attributes():
+    import pyramid_score
+    from pyramid_score.rfv import RFV
+
+    assert pyramid_score.RFV is RFV
+    assert set(pyramid_score.__all__) <= set(dir(pyramid_score))
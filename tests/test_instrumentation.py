@@ -0,0 +1,66 @@
+# tests/test_instrumentation.py
+import logging
+import tracemalloc
+import numpy as np
+import pandas as pd
+import pytest
+from pyramid_score import PipelineInstrumentation, PyramidScoreAnalysis
+from pyramid_score.rfv import RFV
+
+
+def _transactions(n_rows=1000, n_customers=100, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'customer_id': rng.integers(0, n_customers, n_rows).astype(str),
+        'transaction_date': pd.Timestamp('2022-01-01') + pd.to_timedelta(rng.integers(0, 365, n_rows), unit='D'),
+        'amount': rng.integers(1, 500, n_rows).astype(float),
+    })
+
+
+def test_pipeline_instrumentation(caplog):
+    df = _transactions()
+    received = []
+    instrumentation = PipelineInstrumentation(callback=received.append, logger=logging.getLogger('pyramid_score'),
+                                              track_memory=True)
+
+    with caplog.at_level(logging.INFO, logger='pyramid_score'):
+        analysis = PyramidScoreAnalysis(df, 'customer_id', 'transaction_date', 'amount', instrumentation=instrumentation)
+        RFV(df.copy(), 'customer_id', 'transaction_date', 'amount', vectorized=True, instrumentation=instrumentation)
+
+    stages = [(stats.pipeline, stats.stage) for stats in instrumentation.stages]
+    assert stages == [('PyramidScoreAnalysis', 'ingest'), ('PyramidScoreAnalysis', 'score'),
+                      ('PyramidScoreAnalysis', 'segment'), ('PyramidScoreAnalysis', 'distribution'),
+                      ('RFV', 'ingest'), ('RFV', 'score'), ('RFV', 'segment'), ('RFV', 'distribution')]
+    assert received == instrumentation.stages
+    assert len(caplog.records) == 8
+
+    ingest = instrumentation.stages[0]
+    assert ingest.rows_in == len(df) and ingest.rows_out == len(analysis.pyramid_score_table)
+    assert ingest.seconds > 0 and ingest.peak_memory_mb > 0
+
+    # Atualização incremental também é instrumentada
+    analysis.update(df.iloc[:10])
+    assert instrumentation.stages[8].stage == 'update'
+
+
+def test_failing_stage_stops_tracing():
+    instrumentation = PipelineInstrumentation()
+
+    def fail(data):
+        raise RuntimeError('falha na etapa')
+
+    # Uma etapa com erro não deixa o tracemalloc ligado nem registra estatísticas
+    with pytest.raises(RuntimeError):
+        instrumentation.run('Pipeline', 'stage', fail, [1, 2, 3])
+    assert not tracemalloc.is_tracing()
+    assert instrumentation.stages == []
+
+
+def test_memory_tracking_is_opt_in():
+    # Por padrão apenas tempo e linhas são registrados, sem ligar o tracemalloc
+    tracing = []
+    instrumentation = PipelineInstrumentation()
+    instrumentation.run('Pipeline', 'stage', lambda data: tracing.append(tracemalloc.is_tracing()) or data, [1, 2, 3])
+    stats = instrumentation.stages[0]
+    assert tracing == [False]
+    assert stats.peak_memory_mb is None and stats.rows_out == 3
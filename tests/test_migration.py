@@ -0,0 +1,36 @@
+# tests/test_migration.py
+import numpy as np
+import pandas as pd
+from pyramid_score import PyramidScoreAnalysis, SegmentMigration
+from pyramid_score.pyramid_score import TIER_LABELS
+
+
+def _transactions(n_rows=4000, n_customers=400, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'customer_id': rng.integers(0, n_customers, n_rows).astype(str),
+        'transaction_date': pd.Timestamp('2022-01-01') + pd.to_timedelta(rng.integers(0, 730, n_rows), unit='D'),
+        'amount': rng.integers(1, 500, n_rows).astype(float),
+    })
+
+
+def test_migration_matches_merge_crosstab():
+    df = _transactions()
+    before = PyramidScoreAnalysis(df[df['transaction_date'] < '2023-01-01'], 'customer_id', 'transaction_date', 'amount')
+    after = PyramidScoreAnalysis(df, 'customer_id', 'transaction_date', 'amount', compact=True)
+    migration = SegmentMigration(before, after, 'customer_id')
+
+    # Ordem das faixas vem das categorias do modo compacto
+    assert migration.labels == list(TIER_LABELS) + ['Ausente']
+
+    # Mesmo resultado do merge em IDs de texto seguido de crosstab
+    merged = before.pyramid_score_table[['customer_id', 'segment']].merge(
+        after.pyramid_score_table[['customer_id', 'segment']].astype(str),
+        on='customer_id', how='outer', suffixes=('_before', '_after')).fillna('Ausente')
+    expected = pd.crosstab(merged['segment_before'], merged['segment_after'])
+    expected = expected.reindex(index=migration.labels, columns=migration.labels, fill_value=0)
+    np.testing.assert_array_equal(migration.matrix.to_numpy(), expected.to_numpy())
+
+    cell = merged[(merged['segment_before'] == 'Residual Tier') & (merged['segment_after'] == 'Minimal Value')]
+    assert set(migration.customers('Residual Tier', 'Minimal Value')) == set(cell['customer_id'])
+    assert np.allclose(migration.rates().loc[migration.matrix.sum(axis=1) > 0].sum(axis=1), 1.0)
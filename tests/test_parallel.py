@@ -0,0 +1,93 @@
+# tests/test_parallel.py
+import numpy as np
+import pandas as pd
+import pytest
+from pyramid_score import PyramidScoreAnalysis
+from pyramid_score.rfv import RFV
+from pyramid_score.rfv10 import RFV10
+from pyramid_score import parallel
+from pyramid_score.parallel import parallel_rfm_state, partition_by_customer, row_ranges
+from pyramid_score.rfv import prepare_transactions
+from pyramid_score.streaming import aggregate_transactions
+
+
+def _transactions(n_rows=3000, n_customers=200, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'customer_id': rng.integers(0, n_customers, n_rows).astype(str),
+        'transaction_date': pd.Timestamp('2022-01-01') + pd.to_timedelta(rng.integers(0, 365, n_rows), unit='D'),
+        'amount': rng.integers(1, 500, n_rows).astype(float),
+    })
+
+
+def test_partition_by_customer():
+    df = _transactions()
+    shards = partition_by_customer(df, 'customer_id', 4)
+
+    assert sum(len(shard) for shard in shards) == len(df)
+    # Cada cliente aparece em uma única partição
+    owners = pd.concat([shard['customer_id'].drop_duplicates() for shard in shards])
+    assert not owners.duplicated().any()
+
+
+def test_row_ranges():
+    assert row_ranges(10, 3) == [(0, 3), (3, 6), (6, 10)]
+    assert row_ranges(2, 4) == [(0, 1), (1, 2)]
+    assert row_ranges(0, 4) == []
+
+
+def test_parallel_matches_single_process():
+    df = _transactions()
+
+    single = PyramidScoreAnalysis(df.copy(), 'customer_id', 'transaction_date', 'amount')
+    parallel = PyramidScoreAnalysis(df.copy(), 'customer_id', 'transaction_date', 'amount', n_jobs=2)
+    pd.testing.assert_frame_equal(parallel.pyramid_score_table, single.pyramid_score_table)
+
+    single = RFV(df.copy(), 'customer_id', 'transaction_date', 'amount', vectorized=True)
+    parallel = RFV(df.copy(), 'customer_id', 'transaction_date', 'amount', n_jobs=2)
+    pd.testing.assert_frame_equal(parallel.rfm_table, single.rfm_table)
+
+    single = RFV10(df.copy(), 'customer_id', 'transaction_date', 'amount')
+    parallel = RFV10(df.copy(), 'customer_id', 'transaction_date', 'amount', n_jobs=2)
+    pd.testing.assert_frame_equal(parallel.rfv_table, single.rfv_table)
+
+
+def test_parallel_normalizes_ids_before_partitioning():
+    # O mesmo cliente aparece como inteiro, float e texto ('7', 7.0, '7.0')
+    df = _transactions(n_rows=600, n_customers=50)
+    ids = df['customer_id'].astype(int).to_numpy()
+    mixed = [[i, float(i), f'{i}.0'][position % 3] for position, i in enumerate(ids)]
+    df['customer_id'] = pd.Series(mixed, dtype=object)
+
+    single = RFV(df.copy(), 'customer_id', 'transaction_date', 'amount', vectorized=True)
+    parallel = RFV(df.copy(), 'customer_id', 'transaction_date', 'amount', n_jobs=2)
+    assert len(parallel.rfm_table) == 50
+    pd.testing.assert_frame_equal(parallel.rfm_table, single.rfm_table)
+
+    single = RFV10(df.copy(), 'customer_id', 'transaction_date', 'amount', vectorized=True)
+    parallel = RFV10(df.copy(), 'customer_id', 'transaction_date', 'amount', n_jobs=2)
+    pd.testing.assert_frame_equal(parallel.rfv_table, single.rfv_table)
+
+    # O ingest legado não é usado com mais de um processo
+    with pytest.raises(ValueError):
+        RFV(df.copy(), 'customer_id', 'transaction_date', 'amount', vectorized=False, n_jobs=2)
+
+
+@pytest.mark.parametrize('fork', [True, False])
+def test_parallel_drops_duplicates_across_ranges(monkeypatch, fork):
+    # Cópias das primeiras linhas no fim do DataFrame caem em outro intervalo
+    df = _transactions(n_rows=900, n_customers=60)
+    df = pd.concat([df, df.iloc[:150], df.iloc[:20]], ignore_index=True)
+    if not fork:
+        monkeypatch.setattr(parallel, '_fork_context', lambda: None)
+
+    expected = aggregate_transactions(prepare_transactions(df, 'customer_id', 'transaction_date', 'amount'),
+                                      'customer_id', 'transaction_date', 'amount')
+    for n_jobs in (2, 3):
+        state = parallel_rfm_state(df, 'customer_id', 'transaction_date', 'amount', n_jobs=n_jobs,
+                                   prepare=prepare_transactions)
+        pd.testing.assert_frame_equal(state.sort_index(), expected.sort_index())
+
+    # Sem `prepare`, as linhas repetidas são somadas como no processo único
+    state = parallel_rfm_state(df, 'customer_id', 'transaction_date', 'amount', n_jobs=3)
+    pd.testing.assert_frame_equal(state, aggregate_transactions(df, 'customer_id', 'transaction_date', 'amount'))
@@ -0,0 +1,23 @@
+# tests/test_price_corridor.py
+import pandas as pd
+import pytest
+from pyramid_score import PriceCorridor
+
+
+def test_price_corridor():
+    # Criação de dados sintéticos simples
+    data = {
+        'customer_id': ['A', 'A', 'B', 'A', 'C', 'B'],
+        'price': [10.0, 12.5, 7.0, 9.0, 20.0, 8.0]
+    }
+    df = pd.DataFrame(data)
+
+    corridor = PriceCorridor(df, 'customer_id', 'price')
+    all_corridors = corridor.get_all_corridors()
+
+    assert all_corridors.loc['A'].tolist() == [9.0, 12.5]
+    assert all_corridors.loc['B'].tolist() == [7.0, 8.0]
+    assert corridor.get_price_corridor('C') == {'min_price': 20.0, 'max_price': 20.0}
+
+    with pytest.raises(ValueError):
+        corridor.get_price_corridor('Z')
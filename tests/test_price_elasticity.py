@@ -0,0 +1,49 @@
+# tests/test_price_elasticity.py
+import numpy as np
+import pandas as pd
+from pyramid_score import PriceElasticity
+
+
+def test_calculate_all_elasticities():
+    # Clientes A e B com preços variados, C com um único preço e D com uma única transação
+    data = {
+        'customer_id': ['A', 'A', 'A', 'B', 'B', 'C', 'C', 'D', 'B'],
+        'price': [10.0, 12.0, 8.0, 5.0, 6.0, 3.0, 3.0, 7.0, 4.0],
+        'quantity': [100, 80, 130, 20, 18, 5, 6, 1, 25]
+    }
+    df = pd.DataFrame(data)
+
+    calculator = PriceElasticity(df, 'customer_id', 'price', 'quantity')
+    elasticities = calculator.calculate_all_elasticities()
+
+    for customer in ['A', 'B']:
+        assert np.isclose(elasticities[customer], calculator.calculate_elasticity(customer))
+    assert np.isnan(elasticities['C'])
+    assert np.isnan(elasticities['D'])
+
+
+def test_fit_loglog_elasticities():
+    # Segmentos com elasticidade conhecida (-1.5 e -0.5), um com preço único e um com poucas observações
+    rng = np.random.default_rng(0)
+    prices = rng.uniform(5, 50, 400)
+    segments = np.repeat(['S1', 'S2'], 200)
+    slopes = np.where(segments == 'S1', -1.5, -0.5)
+    quantities = np.exp(4 + slopes * np.log(prices) + rng.normal(0, 0.1, 400))
+    df = pd.DataFrame({'customer_id': np.arange(400).astype(str), 'segment': segments,
+                       'price': prices, 'quantity': quantities})
+    df = pd.concat([df, pd.DataFrame({'customer_id': ['x'] * 4, 'segment': ['S3', 'S3', 'S3', 'S4'],
+                                      'price': [10.0, 10.0, 10.0, 8.0], 'quantity': [1.0, 2.0, 3.0, 1.0]})])
+
+    result = PriceElasticity(df, 'customer_id', 'price', 'quantity').fit_loglog_elasticities('segment')
+
+    # Mesmo resultado de mínimos quadrados ajustado grupo a grupo
+    for segment in ['S1', 'S2']:
+        group = df[df['segment'] == segment]
+        X = np.column_stack([np.ones(len(group)), np.log(group['price'])])
+        coef, residual, _, _ = np.linalg.lstsq(X, np.log(group['quantity']), rcond=None)
+        covariance = residual[0] / (len(group) - 2) * np.linalg.inv(X.T @ X)
+        expected = [coef[1], coef[0], np.sqrt(covariance[1, 1]), np.sqrt(covariance[0, 0])]
+        assert np.allclose(result.loc[segment, ['elasticity', 'intercept', 'std_error', 'intercept_std_error']], expected)
+    assert abs(result.loc['S1', 'elasticity'] + 1.5) < 0.05
+    assert result.loc[['S3', 'S4'], 'elasticity'].isna().all()
+    assert result['n_obs'].tolist() == [200, 200, 3, 1]
@@ -18,3 +18,72 @@ def test_rfv_analysis():
     assert not rfv_analysis.rfm_table.empty
     assert not rfv_analysis.segment_table.empty
     print(rfv_analysis.rfm_table.head())
+
+
+def test_produce_rfm_dataset_vectorized_parity():
+    # Dados com IDs em float, valores ausentes e linhas duplicadas
+    data = {
+        'customer_id': [1.0, 2.0, 1.0, 3.0, 2.0, 2.0, None],
+        'transaction_date': ['2022-01-01', '2022-02-15', '2022-03-01', '2022-03-10', '2022-04-01', '2022-04-01', '2022-05-01'],
+        'amount': [100.0, 150.5, None, 200.25, 80.0, 80.0, 10.0],
+        'store': ['x', 'y', 'x', 'z', 'y', 'y', 'x'],
+    }
+    df = pd.DataFrame(data)
+
+    rfv_analysis = RFV(df.copy(), 'customer_id', 'transaction_date', 'amount', automated=False)
+    expected = rfv_analysis.produce_rfm_dateset(df.copy())
+    result = rfv_analysis.produce_rfm_dataset_vectorized(df)
+
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_find_segments_lookup():
+    # IDs repetidos não devem colapsar linhas
+    df = pd.DataFrame({
+        'customer_id': ['A', 'A', 'B', 'C'],
+        'r': [5, 1, 5, 3],
+        'f': [5, 1, 1, 1],
+        'm': [5, 1, 1, 9],
+    })
+    rfv_analysis = RFV(df, 'customer_id', 'transaction_date', 'amount', automated=False)
+    segments = rfv_analysis.find_segments(df.copy())['segment']
+
+    assert segments[:3].tolist() == ['Champions', 'Lost', 'New Active Accounts']
+    assert pd.isna(segments[3])
+
+    # Regras customizadas substituem a tabela padrão
+    rules = [('Top', (5,), (1,2,3,4,5), (1,2,3,4,5)), ('Rest', (1,2,3,4), (1,2,3,4,5), (1,2,3,4,5))]
+    custom = RFV(df, 'customer_id', 'transaction_date', 'amount', automated=False, segment_rules=rules)
+    assert custom.find_segments(df.copy())['segment'][:3].tolist() == ['Top', 'Rest', 'Top']
+
+
+def test_calculate_dynamic_rfm_score():
+    # Valores distintos e uniformes
+    df = pd.DataFrame({
+        'customer_id': range(700),
+        'recency': range(700),
+        'frequency': range(700),
+        'monetary_value': [float(i) for i in range(700)],
+    })
+    rfv_analysis = RFV(df, 'customer_id', 'transaction_date', 'amount', automated=False)
+
+    for n_bins in (5, 7):
+        result = rfv_analysis.calculate_dynamic_rfm_score(df.copy(), n_bins)
+        assert sorted(result['f'].unique()) == list(range(1, n_bins + 1))
+        assert result['f'].is_monotonic_increasing
+        assert result['r'].is_monotonic_decreasing
+        assert (result['r'] == n_bins + 1 - result['f']).all()
+        if n_bins == 5:
+            assert result['m'].value_counts().sort_index().tolist() == [154, 140, 140, 140, 126]
+    assert result.loc[0, 'rfm_score'] == '711'
+
+
+def test_legacy_cutoff_methods():
+    # Métodos antigos continuam disponíveis e concordam com assign_bins em 5 bins
+    df = pd.DataFrame({'recency': [(i * 37) % 365 for i in range(300)], 'frequency': [1 + i % 17 for i in range(300)]})
+    rfv_analysis = RFV(df, 'customer_id', 'transaction_date', 'amount', automated=False)
+    for column in ('recency', 'frequency'):
+        cutoffs = rfv_analysis.adjust_cutoffs(df, rfv_analysis.dynamic_cutoffs(df, column), column)
+        expected = rfv_analysis.assign_bins(df[column], rfv_analysis.dynamic_bin_edges(df, column), column)
+        assert sorted(cutoffs) == [1, 2, 3, 4, 5]
+        assert [rfv_analysis.find_bin_no(x, column, cutoffs) for x in df[column]] == expected.tolist()
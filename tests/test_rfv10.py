@@ -1,6 +1,6 @@
 # tests/test_rfv10.py
 import pandas as pd
-from pyramid_score.rfv10 import RFV10
+from pyramid_score.rfv10 import RFV10, decile_codes
 
 def test_rfv10_analysis():
     # Criação de dados sintéticos
@@ -21,3 +21,14 @@ def test_rfv10_analysis():
     # Testando a função de encontrar clientes por classe
     customers = rfv10_analysis.find_customers('Loyal Accounts')
     print(customers)
+
+
+def test_decile_codes_ties():
+    # Empates que não colidem nas bordas: resultado idêntico ao pd.qcut
+    values = pd.Series([1, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19])
+    assert decile_codes(values).tolist() == pd.qcut(values, 10, labels=False).tolist()
+
+    # Muitos empates (bordas repetidas): desempate pela posição, decis de mesmo tamanho
+    values = pd.Series([1] * 12 + [2] * 5 + [3] * 3)
+    codes = decile_codes(values)
+    assert codes.tolist() == [0, 0, 1, 1, 2, 2, 3, 3, 4, 4, 5, 5, 6, 6, 7, 7, 8, 8, 9, 9]
@@ -0,0 +1,53 @@
+# tests/test_segment_index.py
+import numpy as np
+import pandas as pd
+from pyramid_score import PyramidScoreAnalysis
+from pyramid_score.pyramid_score import TIER_LABELS, TIER_PERCENTILES, assign_tiers
+from pyramid_score.rfv import RFV
+from pyramid_score.rfv10 import RFV10
+
+
+def _transactions(n_rows=3000, n_customers=400, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'customer_id': rng.integers(0, n_customers, n_rows).astype(str),
+        'transaction_date': pd.Timestamp('2022-01-01') + pd.to_timedelta(rng.integers(0, 365, n_rows), unit='D'),
+        'amount': rng.integers(1, 500, n_rows).astype(float),
+    })
+
+
+def test_assign_tiers_matches_sorted_ranking():
+    # As faixas calculadas por partição devem coincidir com as do ranking completo
+    scores = np.random.default_rng(1).normal(size=1001)
+    codes = assign_tiers(scores)
+
+    cumulative = np.cumsum([int(p * len(scores)) for p in TIER_PERCENTILES])
+    ranking = np.empty(len(scores), dtype=int)
+    ranking[np.argsort(-scores)] = np.arange(len(scores))
+    np.testing.assert_array_equal(codes, np.searchsorted(cumulative[:-1], ranking, side='right'))
+
+    analysis = PyramidScoreAnalysis(_transactions(), 'customer_id', 'transaction_date', 'amount')
+    table = analysis.pyramid_score_table
+    top = table.nlargest(int(0.005 * len(table)), 'pyramid_score')
+    assert (top['segment'] == TIER_LABELS[0]).all()
+
+
+def test_find_customers_uses_index():
+    df = _transactions()
+    analyses = [
+        (PyramidScoreAnalysis(df.copy(), 'customer_id', 'transaction_date', 'amount'), 'pyramid_score_table', 'segment'),
+        (RFV(df.copy(), 'customer_id', 'transaction_date', 'amount', vectorized=True), 'rfm_table', 'segment'),
+        (RFV10(df.copy(), 'customer_id', 'transaction_date', 'amount'), 'rfv_table', 'class'),
+    ]
+    for analysis, table_name, column in analyses:
+        table = getattr(analysis, table_name)
+        for segment in table[column].dropna().unique():
+            expected = table[table[column] == segment].reset_index(drop=True)
+            pd.testing.assert_frame_equal(analysis.find_customers(segment), expected)
+        assert analysis.find_customers('Inexistente').empty
+
+    # O índice é reconstruído quando a tabela é substituída (ex.: por update)
+    analysis = analyses[0][0]
+    analysis.update(pd.DataFrame({'customer_id': ['novo'], 'transaction_date': [pd.Timestamp('2023-06-01')],
+                                  'amount': [10000.0]}))
+    assert 'novo' in set(analysis.find_customers(TIER_LABELS[0])['customer_id'])
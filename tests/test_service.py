@@ -0,0 +1,142 @@
+# tests/test_service.py
+import asyncio
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from pyramid_score import ChurnPrediction, PriceCorridor, PyramidScoreAnalysis
+from pyramid_score.service import CustomerSnapshot, ScoringService
+
+
+def _transactions(n_rows=3000, n_customers=200, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'customer_id': rng.integers(0, n_customers, n_rows).astype(str),
+        'transaction_date': pd.Timestamp('2022-01-01') + pd.to_timedelta(rng.integers(0, 365, n_rows), unit='D'),
+        'amount': rng.integers(1, 500, n_rows).astype(float),
+        'price': rng.integers(1, 50, n_rows).astype(float),
+    })
+
+
+async def _request(port, method, path, body=b''):
+    return await _raw_request(port, f'{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n'
+                                    f'Connection: close\r\n\r\n'.encode() + body)
+
+
+async def _raw_request(port, data):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(data)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b'\r\n\r\n')
+    return int(head.split(b' ')[1]), json.loads(payload)
+
+
+def test_scoring_service_localhost():
+    df = _transactions()
+    analysis = PyramidScoreAnalysis(df, 'customer_id', 'transaction_date', 'amount')
+    features = analysis.pyramid_score_table[['customer_id', 'recency', 'frequency', 'monetary_value']]
+    churn = ChurnPrediction(features.assign(churn=(features['recency'] > 60).astype(int)), 'churn')
+    churn.train_model(['recency', 'frequency', 'monetary_value'])
+    expected = churn.predict_churn_many(features).set_axis(features['customer_id'])
+
+    snapshot = CustomerSnapshot.build('customer_id', tiers=analysis, corridors=PriceCorridor(df, 'customer_id', 'price'),
+                                      churn=churn, churn_features=features, version='v1')
+
+    async def scenario():
+        service = await ScoringService(snapshot, max_delay=0.005).start()
+        customers = list(features['customer_id'][:50])
+        responses = await asyncio.gather(*(_request(service.port, 'GET', f'/customers/{customer}')
+                                           for customer in customers))
+        batches = service.churn_batches
+
+        # Troca do snapshot sem reiniciar o serviço
+        await service.swap(CustomerSnapshot.build('customer_id', tiers=analysis, version='v2'))
+        swapped = await _request(service.port, 'GET', f'/customers/{customers[0]}')
+        missing = await _request(service.port, 'GET', '/customers/inexistente')
+        await service.stop()
+        return customers, responses, batches, swapped, missing
+
+    customers, responses, batches, swapped, missing = asyncio.run(scenario())
+    table = analysis.pyramid_score_table.set_index('customer_id')
+    for customer, (status, body) in zip(customers, responses):
+        assert status == 200 and body['version'] == 'v1'
+        assert body['tier'] == table.loc[customer, 'segment']
+        assert np.isclose(body['churn_probability'], expected[customer])
+    # As previsões concorrentes foram avaliadas em poucos lotes
+    assert batches < len(customers)
+
+    assert swapped[0] == 200 and swapped[1]['version'] == 'v2' and 'churn_probability' not in swapped[1]
+    assert missing[0] == 404
+
+
+def test_scoring_service_errors():
+    df = _transactions(n_rows=500, n_customers=50)
+    analysis = PyramidScoreAnalysis(df, 'customer_id', 'transaction_date', 'amount')
+    features = analysis.pyramid_score_table[['customer_id', 'recency', 'frequency', 'monetary_value']]
+    churn = ChurnPrediction(features.assign(churn=(features['recency'] > 60).astype(int)), 'churn')
+    churn.train_model(['recency', 'frequency', 'monetary_value'])
+
+    def failing_model(*args, **kwargs):
+        raise RuntimeError('modelo indisponível')
+
+    churn.predict_churn_many = failing_model
+    snapshot = CustomerSnapshot.build('customer_id', tiers=analysis, churn=churn, churn_features=features)
+    customer = features['customer_id'].iloc[0]
+
+    async def scenario():
+        service = await ScoringService(snapshot, max_body=100).start()
+        malformed = await _raw_request(service.port, b'GARBAGE\r\n\r\n')
+        bad_length = await _raw_request(service.port, b'POST /churn HTTP/1.1\r\nContent-Length: abc\r\n\r\n')
+        long_line = await _raw_request(service.port, b'GET /' + b'a' * 100_000 + b' HTTP/1.1\r\n\r\n')
+        too_large = await _request(service.port, 'POST', '/churn', b'x' * 101)
+        failed = await _request(service.port, 'GET', f'/customers/{customer}')
+        health = await _request(service.port, 'GET', '/health')
+        await service.stop()
+        return malformed, bad_length, long_line, too_large, failed, health
+
+    malformed, bad_length, long_line, too_large, failed, health = asyncio.run(scenario())
+    # Erros de parsing (inclusive linha acima do limite) recebem 400, corpo acima do limite 413 e erros do modelo 500
+    assert malformed[0] == 400 and bad_length[0] == 400 and long_line[0] == 400
+    assert too_large[0] == 413
+    assert failed[0] == 500 and 'modelo indisponível' in failed[1]['error']
+    assert health[0] == 200
+
+
+def test_scoring_service_swap_during_churn_request():
+    df = _transactions(n_rows=500, n_customers=50).assign(customer_id=lambda frame: frame['customer_id'].astype(int))
+    analysis = PyramidScoreAnalysis(df.astype({'customer_id': str}), 'customer_id', 'transaction_date', 'amount')
+    features = analysis.pyramid_score_table[['customer_id', 'recency', 'frequency', 'monetary_value']]
+    churn = ChurnPrediction(features.assign(churn=(features['recency'] > 60).astype(int)), 'churn')
+    churn.train_model(['recency', 'frequency', 'monetary_value'])
+
+    # O snapshot não altera o corredor de preços recebido (IDs inteiros viram texto apenas no snapshot)
+    corridors = PriceCorridor(df, 'customer_id', 'price')
+    expected_corridor = corridors.get_price_corridor(1)
+    snapshot = CustomerSnapshot.build('customer_id', corridors=corridors, churn=churn, churn_features=features)
+    assert corridors.get_price_corridor(1) == expected_corridor
+    assert snapshot.lookup('1')['min_price'] == expected_corridor['min_price']
+
+    rows = features[churn.features].head(5)
+    body = json.dumps({'features': rows.to_dict('records')}).encode()
+
+    async def scenario():
+        service = ScoringService(snapshot, max_delay=0.01)
+        await service._dispatch('POST', '/churn', body)
+        old_batcher = service._state[1]
+
+        # O swap acontece depois de a requisição começar e antes de as linhas serem avaliadas
+        request = asyncio.ensure_future(service._dispatch('POST', '/churn', body))
+        await asyncio.sleep(0)
+        await service.swap(CustomerSnapshot.build('customer_id', churn=churn, churn_features=features, version='v2'))
+        status, payload = await asyncio.wait_for(request, timeout=5)
+        with pytest.raises(RuntimeError):
+            old_batcher.submit(rows.to_numpy()[0])
+        await service.stop()
+        return status, payload
+
+    status, payload = asyncio.run(scenario())
+    assert status == '200 OK'
+    assert np.allclose(payload['churn_probability'], churn.predict_churn_many(rows).to_numpy())
@@ -0,0 +1,68 @@
+# tests/test_shared.py
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from pyramid_score import PyramidScoreAnalysis, RFV
+from pyramid_score import shared as shared_module
+from pyramid_score.shared import SharedTables, export_tables
+
+pytest.importorskip('pyarrow')
+
+
+def _transactions(n_rows=3000, n_customers=300, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'customer_id': rng.integers(0, n_customers, n_rows).astype(str),
+        'transaction_date': pd.Timestamp('2022-01-01') + pd.to_timedelta(rng.integers(0, 365, n_rows), unit='D'),
+        'amount': rng.integers(1, 500, n_rows).astype(float),
+    })
+
+
+def test_export_and_attach(tmp_path):
+    df = _transactions()
+    analysis = PyramidScoreAnalysis(df, 'customer_id', 'transaction_date', 'amount', compact=True)
+    rfv = RFV(df, 'customer_id', 'transaction_date', 'amount', vectorized=True)
+    assert export_tables(tmp_path, {'pyramid_score_table': analysis, 'rfm_table': rfv.rfm_table}) == 1
+
+    shared = SharedTables(tmp_path)
+    pd.testing.assert_frame_equal(shared.to_pandas('pyramid_score_table'), analysis.pyramid_score_table)
+    pd.testing.assert_frame_equal(shared.to_pandas('rfm_table'), rfv.rfm_table)
+
+    # Colunas numéricas apontam para o arquivo mapeado e são somente leitura
+    scores = shared.column('pyramid_score_table', 'pyramid_score')
+    assert not scores.flags.writeable and not scores.flags.owndata
+
+    # Outro processo abre a mesma versão
+    code = (f"from pyramid_score.shared import SharedTables; s = SharedTables({str(tmp_path)!r}); "
+            f"print(s.version, len(s.to_pandas('rfm_table')))")
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout.split()
+    assert output == ['1', str(len(rfv.rfm_table))]
+
+    # Uma nova publicação é detectada pelo leitor
+    assert not shared.is_stale()
+    export_tables(tmp_path, {'rfm_table': rfv.rfm_table.head(10)})
+    assert shared.is_stale() and shared.refresh()
+    assert shared.version == 2 and shared.names == ['rfm_table'] and len(shared.to_pandas('rfm_table')) == 10
+
+
+def test_refresh_retries_removed_version(tmp_path, monkeypatch):
+    table = pd.DataFrame({'value': np.arange(10.0)})
+    export_tables(tmp_path, {'table': table})
+    stale = shared_module._read_manifest(tmp_path)
+
+    # Duas publicações removem a versão 1 entre a leitura do manifesto e o mapeamento dos arquivos
+    export_tables(tmp_path, {'table': table.head(5)})
+    export_tables(tmp_path, {'table': table.head(3)})
+    manifests = [stale]
+    read_manifest = shared_module._read_manifest
+    monkeypatch.setattr(shared_module, '_read_manifest',
+                        lambda directory: manifests.pop() if manifests else read_manifest(directory))
+
+    shared = SharedTables(tmp_path)
+    assert shared.version == 3 and len(shared.to_pandas('table')) == 3
+
+    with pytest.raises(ValueError):
+        export_tables(tmp_path, {'table': table}, keep=1)
@@ -0,0 +1,75 @@
+# tests/test_sketches.py
+import numpy as np
+import pandas as pd
+from pyramid_score import GroupPriceCorridor, RFV10
+from pyramid_score.sketches import KLLSketch
+
+
+def test_kll_sketch_merge_error_bound():
+    values = np.random.default_rng(0).lognormal(size=200_000)
+    epsilon = 0.01
+
+    # Sketches de partes diferentes (ex.: workers) combinados
+    sketch = KLLSketch(epsilon, seed=0)
+    for part in np.array_split(values, 4):
+        sketch.merge(KLLSketch.from_array(part, epsilon, chunk_size=10_000, seed=1))
+
+    assert sketch.n == len(values)
+    assert sketch.size < len(values) / 100
+    q = np.linspace(0.01, 0.99, 99)
+    true_rank = np.searchsorted(np.sort(values), sketch.quantiles(q), side='right') / len(values)
+    assert np.abs(true_rank - q).max() <= epsilon
+    assert sketch.quantiles([0, 1]).tolist() == [values.min(), values.max()]
+
+
+def test_approximate_modes():
+    rng = np.random.default_rng(1)
+    rfm = pd.DataFrame({
+        'customer_id': np.arange(5000).astype(str),
+        'recency': rng.integers(0, 365, 5000),
+        'frequency': rng.integers(1, 50, 5000),
+        'monetary_value': rng.lognormal(5, 1, 5000),
+    })
+    exact = RFV10.from_rfm_dataset(rfm, 'customer_id').rfv_table
+    approximate = RFV10.from_rfm_dataset(rfm, 'customer_id', approximate=True, epsilon=0.005).rfv_table
+    # Sem empates, os decis aproximados diferem do qcut apenas perto das bordas
+    assert (exact['v_score'].astype(int) == approximate['v_score'].astype(int)).mean() > 0.95
+    assert set(approximate['class'].dropna()) == set(exact['class'].dropna())
+
+    prices = pd.DataFrame({'segment': rng.choice(['A', 'B'], 20_000), 'price': rng.normal(100, 10, 20_000)})
+    corridors = GroupPriceCorridor(prices, 'segment', 'price').get_all_price_corridors()
+    approximate = GroupPriceCorridor(prices, 'segment', 'price', approximate=True).get_all_price_corridors()
+    np.testing.assert_allclose(approximate[['q1', 'q3']], corridors[['q1', 'q3']], rtol=0.01)
+
+
+def test_approximate_state_is_rebuilt():
+    rng = np.random.default_rng(2)
+
+    def rfm(n):
+        return pd.DataFrame({
+            'customer_id': np.arange(n).astype(str),
+            'recency': rng.integers(0, 365, n),
+            'frequency': rng.integers(1, 50, n),
+            'monetary_value': rng.lognormal(5, 1, n),
+        })
+
+    # Instância reaproveitada em dados novos não usa os sketches da execução anterior
+    first, second = rfm(3000), rfm(2000)
+    second['monetary_value'] *= 10
+    rfv10 = RFV10.from_rfm_dataset(first, 'customer_id', approximate=True)
+    reused = rfv10.calculate_rfv_score_sketches(second.copy())
+    fresh = RFV10.from_rfm_dataset(second, 'customer_id', approximate=True).rfv_table
+    assert rfv10.sketches['monetary_value'].n == 2000
+    assert reused['v_score'].astype(int).tolist() == fresh['v_score'].astype(int).tolist()
+
+    # Corredor aproximado em chunks: mínimo e máximo exatos dentro dos limites de cada segmento
+    prices = pd.DataFrame({'segment': rng.choice(['A', 'B'], 5000), 'price': rng.normal(100, 10, 5000)})
+    prices.loc[::250, 'price'] = 1000.0
+    corridor = GroupPriceCorridor(prices, 'segment', 'price', approximate=True)
+    corridors = corridor._approximate_corridors(chunk_size=700)
+    for segment, row in corridors.iterrows():
+        values = prices.loc[prices['segment'] == segment, 'price']
+        values = values[(values >= row['lower_bound']) & (values <= row['upper_bound'])]
+        assert (row['min_price'], row['max_price']) == (values.min(), values.max())
+    corridor.build_sketches(chunk_size=700)
+    assert sum(sketch.n for sketch in corridor.sketches.values()) == len(prices)
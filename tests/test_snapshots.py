@@ -0,0 +1,39 @@
+# tests/test_snapshots.py
+import numpy as np
+import pandas as pd
+from pyramid_score import PyramidScoreAnalysis, RFMSnapshots, RFV10
+
+
+def _transactions(n_rows=3000, n_customers=300, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'customer_id': rng.integers(0, n_customers, n_rows).astype(str),
+        'transaction_date': pd.Timestamp('2022-01-01') + pd.to_timedelta(rng.integers(0, 365, n_rows), unit='D'),
+        'amount': rng.integers(1, 500, n_rows).astype(float),
+    })
+
+
+def test_snapshots_match_filtered_copies():
+    df = _transactions()
+    dates = pd.date_range('2022-01-31', '2022-12-31', freq='ME')
+    snapshots = RFMSnapshots(df, 'customer_id', 'transaction_date', 'amount').snapshots(dates)
+
+    # Cada data deve coincidir com a agregação sobre a cópia filtrada
+    for date in dates:
+        analysis = PyramidScoreAnalysis(df[df['transaction_date'] <= date], 'customer_id', 'transaction_date',
+                                        'amount', automated=False)
+        expected = analysis._produce_pyramid_score_dataset(analysis.df)
+        result = snapshots[snapshots['snapshot_date'] == date].drop(columns='snapshot_date').reset_index(drop=True)
+        pd.testing.assert_frame_equal(result, expected, check_exact=False)
+
+
+def test_snapshots_with_segments():
+    engine = RFMSnapshots(_transactions(), 'customer_id', 'transaction_date', 'amount')
+    snapshots = engine.snapshots(['2022-06-30', '2022-12-31'], analysis=RFV10, from_snapshot_date=True)
+
+    assert list(snapshots.columns) == ['snapshot_date', 'customer_id', 'recency', 'frequency', 'monetary_value', 'class']
+    assert snapshots['class'].notna().all()
+    # Recência medida a partir da própria data de referência
+    june = snapshots[snapshots['snapshot_date'] == '2022-06-30']
+    assert june['recency'].min() >= 0
+    assert engine.snapshot('2021-01-01').empty
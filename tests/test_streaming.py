@@ -0,0 +1,54 @@
+# tests/test_streaming.py
+import numpy as np
+import pandas as pd
+import pytest
+from pyramid_score import PyramidScoreAnalysis
+from pyramid_score.rfv import RFV
+from pyramid_score.rfv10 import RFV10
+from pyramid_score.streaming import StreamingRFMAggregator
+
+
+def _transactions(n_rows=2000, n_customers=150, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'customer_id': rng.integers(0, n_customers, n_rows).astype(str),
+        'transaction_date': pd.Timestamp('2022-01-01') + pd.to_timedelta(rng.integers(0, 365, n_rows), unit='D'),
+        'amount': rng.integers(1, 500, n_rows).astype(float),
+    })
+
+
+def test_streaming_matches_in_memory():
+    df = _transactions()
+    chunks = [df.iloc[i:i + 300] for i in range(0, len(df), 300)]
+
+    aggregator = StreamingRFMAggregator.from_chunks(chunks, 'customer_id', 'transaction_date', 'amount')
+    rfm = aggregator.to_rfm_dataset()
+
+    analysis = PyramidScoreAnalysis(df.copy(), 'customer_id', 'transaction_date', 'amount')
+    expected = analysis._produce_pyramid_score_dataset(df.copy())
+    pd.testing.assert_frame_equal(rfm, expected)
+
+    # A tabela agregada alimenta o score e a segmentação existentes
+    streamed = PyramidScoreAnalysis.from_rfm_dataset(rfm, 'customer_id')
+    pd.testing.assert_frame_equal(streamed.segment_table, analysis.segment_table)
+    assert not RFV.from_rfm_dataset(rfm, 'customer_id').segment_table.empty
+    assert RFV10.from_rfm_dataset(rfm, 'customer_id').rfv_table['class'].notna().all()
+
+
+def test_streaming_from_files(tmp_path):
+    df = _transactions(seed=1)
+    df['store'] = 'x'
+    expected = StreamingRFMAggregator.from_chunks([df], 'customer_id', 'transaction_date', 'amount').to_rfm_dataset()
+
+    csv_path = tmp_path / 'transactions.csv'
+    df.to_csv(csv_path, index=False)
+    from_csv = StreamingRFMAggregator.from_csv(csv_path, 'customer_id', 'transaction_date', 'amount',
+                                               chunksize=500, dtype={'customer_id': str})
+    pd.testing.assert_frame_equal(from_csv.to_rfm_dataset(), expected)
+
+    pytest.importorskip('pyarrow')
+    parquet_path = tmp_path / 'transactions.parquet'
+    df.to_parquet(parquet_path, index=False)
+    from_parquet = StreamingRFMAggregator.from_parquet(parquet_path, 'customer_id', 'transaction_date', 'amount',
+                                                       batch_size=500)
+    pd.testing.assert_frame_equal(from_parquet.to_rfm_dataset(), expected)
@@ -0,0 +1,34 @@
+# tests/test_sweep.py
+import numpy as np
+import pandas as pd
+from pyramid_score import PyramidScoreAnalysis
+from pyramid_score.pyramid_score import PYRAMID_WEIGHTS, TIER_LABELS, TIER_PERCENTILES
+
+
+def _transactions(n_rows=5000, n_customers=500, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'customer_id': rng.integers(0, n_customers, n_rows).astype(str),
+        'transaction_date': pd.Timestamp('2022-01-01') + pd.to_timedelta(rng.integers(0, 365, n_rows), unit='D'),
+        'amount': rng.uniform(1, 500, n_rows),
+    })
+
+
+def test_sweep_matches_analysis():
+    analysis = PyramidScoreAnalysis(_transactions(), 'customer_id', 'transaction_date', 'amount')
+    weights = [PYRAMID_WEIGHTS, (0.5, 0.3, 0.2), (0.0, 0.0, 1.0)]
+    schedules = [TIER_PERCENTILES, [0.1] * 10]
+    stats, tiers = analysis.sweep(weights, schedules, return_tiers=True)
+
+    assert len(stats) == len(weights) * len(schedules) * len(TIER_LABELS)
+    assert tiers.shape == (len(analysis.pyramid_score_table), 6)
+    assert (stats.groupby('configuration')['no_of_customers'].sum() == len(tiers)).all()
+
+    # Cada configuração deve coincidir com uma análise completa com os mesmos parâmetros
+    rfm = analysis.pyramid_score_table[['customer_id', 'recency', 'frequency', 'monetary_value']]
+    for weights_id, percentiles_id in [(0, 0), (1, 1), (2, 0)]:
+        configuration = weights_id * len(schedules) + percentiles_id
+        expected = PyramidScoreAnalysis.from_rfm_dataset(rfm, 'customer_id', weights=weights[weights_id],
+                                                         percentiles=schedules[percentiles_id])
+        codes = pd.Categorical(expected.pyramid_score_table['segment'], categories=TIER_LABELS).codes
+        np.testing.assert_array_equal(tiers[:, configuration], codes)